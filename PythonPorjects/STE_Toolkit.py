@@ -32,17 +32,19 @@
 # METADATA & IMPORTS
 # =============================================================================
 
+# Must come first so ``--profile-startup`` can time every import below
+from startup_profiler import get_profiler
+_prof = get_profiler()
+
 import tkinter as tk
 from tkinter import ttk
 from tkinter import filedialog, simpledialog, messagebox
-from PIL import Image, ImageTk
 import os
 import subprocess
 import shutil
 from datetime import datetime
 import webbrowser
 import urllib.request
-import configparser
 import winreg
 import sys
 import functools
@@ -50,7 +52,7 @@ import json
 import re
 import socket
 import threading
-import shlex
+import asyncio
 import itertools
 from queue import Queue, Empty
 import io
@@ -76,33 +78,51 @@ from photomesh_launcher import (
     launch_wizard_new_project,
     install_pmpreset,
     probe_best_mesh_share,
+    probe_mesh_shares,
+    share_available,
+    queue_alive,
+    make_queue_monitor,
+    QUEUE_CLIENT,
+    ensure_photomesh_queue_running,
+    submit_queue_batch,
     map_drive,
     unmap_drive,
     build_unc_from_cfg,
     RM_LNK_NAME,
     RM_INSTALL_SUBDIRS,
 )
+from exe_index import get_exe_index
+from exe_search import ParallelExeSearch, fixed_drive_roots
+from pe_version import file_version, format_version
+from config_store import get_config_store
+from image_cache import cached_photo
+from unc_probe import get_unc_prober
+from name_resolver import get_name_resolver, is_ip
+from command_server import DEFAULT_PORT as DEFAULT_COMMAND_PORT, CommandServer
+from fuser_fanout import FuserJob, fan_out, format_results
+from fuser_telemetry import get_fuser_sampler
+from fuser_autoscaler import ROLE_FUSER, ROLE_HOST, ROLE_NONE, get_fuser_autoscaler, parse_override
+from fuser_registry import get_fuser_registry
+from queue_batch import ProjectSpec, cluster_capacity
+from progress_agg import ProgressFollower, parse_progress_line
+from fs_watch import SETTLE_SECS, BuildOutputWatcher
+from process_watch import get_process_watch
+from lan_discovery import auto_fuser_name, discover, load_node_inventory, merge_into_fuser_config, subnet_for
 from collections import OrderedDict
 import time
 import glob
 import tempfile
 import msvcrt
 import atexit
-import win32api, ctypes
+import ctypes
 import win32con
 import win32gui
 import win32net
 import win32netcon
 import ctypes.wintypes
 import logging
-from pathlib import Path
 from typing import Callable
 
-try:  # Optional atomic write helper
-    from steup.utils import write_config_atomic  # type: ignore
-except Exception:  # pragma: no cover - helper may not exist
-    write_config_atomic = None
-
 # --- Resource path resolver -------------------------------------------------
 def _resource_path(name: str) -> str:
     """Return absolute path to bundled resource *name*.
@@ -228,58 +248,30 @@ def run_in_thread(target, *args, **kwargs):
     thread.start()
 
 
-def _iter_build_outputs(build_root: str):
-    """Yield outputBuild_* directories under Build_* (newest first)."""
-    for bdir in sorted(
-        (os.path.join(build_root, d) for d in os.listdir(build_root) if d.lower().startswith("build_")),
-        key=os.path.getmtime,
-        reverse=True,
-    ):
-        try:
-            for odir in sorted(
-                (os.path.join(bdir, d) for d in os.listdir(bdir) if d.lower().startswith("outputbuild_")),
-                key=os.path.getmtime,
-                reverse=True,
-            ):
-                yield odir
-        except Exception:
-            continue
-
-
 def wait_for_obj(build_root: str, timeout_sec: int = 8*3600, poll_sec: int = 10, log=print) -> str | None:
-    """Block until an OBJ export exists. Return the folder that holds it."""
-    start = time.time()
-    while time.time() - start < timeout_sec:
-        for odir in _iter_build_outputs(build_root):
-            obj_dir = os.path.join(odir, "OBJ")
-            if os.path.isdir(obj_dir):
-                for _root, _dirs, files in os.walk(obj_dir):
-                    if any(fn.lower().endswith(".obj") for fn in files):
-                        log(f"[watch] OBJ found: {obj_dir}")
-                        return obj_dir
-        time.sleep(poll_sec)
-    return None
+    """Block until an OBJ export exists. Return the folder that holds it.
+
+    Event-driven (see fs_watch); *poll_sec* only paces the polling fallback
+    used when the OS watcher cannot be opened.
+    """
+    found = threading.Event()
+    watcher = BuildOutputWatcher(
+        build_root, on_first_obj=lambda _d: found.set(), poll_interval=poll_sec
+    ).start()
+    try:
+        if found.wait(timeout_sec):
+            log(f"[watch] OBJ found: {watcher.obj_dir}")
+            return watcher.obj_dir
+        return None
+    finally:
+        watcher.stop()
 
 
-def wait_for_terraexplorer_start(timeout_sec: int = 8*3600, poll_sec: int = 5, log=print) -> bool:
+def wait_for_terraexplorer_start(timeout_sec: int = 8*3600, log=print) -> bool:
     """Return True when TerraExplorer.exe is observed."""
-    want = "terraexplorer.exe"
-    start = time.time()
-    while time.time() - start < timeout_sec:
-        try:
-            if psutil:
-                for p in psutil.process_iter(["name"]):
-                    if (p.info.get("name") or "").lower() == want:
-                        log("[watch] TerraExplorer.exe detected")
-                        return True
-            else:
-                out = subprocess.check_output(["tasklist"], text=True, stderr=subprocess.DEVNULL)
-                if any(want in line.lower() for line in out.splitlines()):
-                    log("[watch] TerraExplorer.exe detected (tasklist)")
-                    return True
-        except Exception:
-            pass
-        time.sleep(poll_sec)
+    if get_process_watch().wait_started("TerraExplorer.exe", timeout_sec):
+        log("[watch] TerraExplorer.exe detected")
+        return True
     return False
 
 
@@ -287,22 +279,10 @@ def wait_for_terraexplorer_start(timeout_sec: int = 8*3600, poll_sec: int = 5, l
 # PHOTOMESH PROGRESS PARSING
 # =============================================================================
 
-_PROGRESS_RE = re.compile(r"Progress:\s*(\d+)%")
-_TILE_RE = re.compile(r"Tile\s+(\d+)\s+of\s+(\d+)")
-
-
 def extract_progress(line: str) -> int | None:
     """Return progress percent from a log line if present."""
-    if "Progress:" in line:
-        m = _PROGRESS_RE.search(line)
-        if m:
-            return int(m.group(1))
-    m = _TILE_RE.search(line)
-    if m:
-        done, total = map(int, m.groups())
-        if total:
-            return int(done / total * 100)
-    return None
+    sample = parse_progress_line(line)
+    return sample.percent if sample else None
 
 
 # =============================================================================
@@ -338,13 +318,7 @@ def clean_path(path: str) -> str:
 
 def _exe_version_tuple(exe: str) -> tuple[int, ...] | None:
     """Return the file version of *exe* as a tuple or ``None`` on failure."""
-    try:
-        info = win32api.GetFileVersionInfo(exe, "\\")
-        ms = info["FileVersionMS"]
-        ls = info["FileVersionLS"]
-        return ms >> 16, ms & 0xFFFF, ls >> 16, ls & 0xFFFF
-    except Exception:
-        return None
+    return file_version(exe)
 
 
 def get_vbs4_install_path() -> str:
@@ -369,35 +343,17 @@ def get_vbs4_install_path() -> str:
     best_path = ""
     best_key: tuple[int, tuple[int, ...], float] = (0, (), 0.0)
 
-    for root in roots:
-        try:
-            os.makedirs(root, exist_ok=True)
-        except Exception:
-            continue
-        if not os.path.isdir(root):
-            continue
-        for dirpath, _dirnames, filenames in os.walk(root):
-            for name in filenames:
-                if name.lower() != "vbs4.exe":
-                    continue
-                exe_path = os.path.join(dirpath, name)
-                ver = _exe_version_tuple(exe_path)
-                mtime = os.path.getmtime(exe_path)
-                key = (1 if ver else 0, ver or (), mtime)
-                if key > best_key:
-                    best_key = key
-                    best_path = exe_path
+    index = get_exe_index()
+    for rec in index.find("VBS4.exe", under=roots):
+        ver = index.version_of(rec)
+        key = (1 if ver else 0, ver or (), rec.mtime)
+        if key > best_key:
+            best_key = key
+            best_path = rec.path
 
     if best_path:
         config['General']['vbs4_path'] = best_path
-        try:
-            if write_config_atomic:
-                write_config_atomic(Path(CONFIG_PATH), config)
-            else:
-                with open(CONFIG_PATH, 'w', encoding='utf-8') as fh:
-                    config.write(fh)
-        except Exception:
-            logging.exception("Failed to write VBS4 path to config")
+        _save_config()
         return best_path
 
     logging.warning("VBS4 path not found")
@@ -418,25 +374,30 @@ def get_vbs4_launcher_path():
         r"C:\Bohemia Interactive Simulations"
     ]
 
+    launchers = get_exe_index().find("VBSLauncher.exe", under=possible_paths)
     for base_path in possible_paths:
         if os.path.isdir(base_path):
             # Look for VBS4 directories. Some installations may place the
             # version number directly under the VBS4 folder.  Allow
             # numeric names as well as those prefixed with "VBS4".
-            vbs4_dirs = [
-                d for d in os.listdir(base_path)
-                if d.startswith("VBS4") or re.match(r"^[0-9]", d)
-            ]
-            vbs4_dirs.sort(reverse=True)  # Sort in descending order to get the latest version first
-            
+            base_norm = os.path.normcase(os.path.normpath(base_path))
+            by_dir = {}
+            for rec in launchers:
+                parent = os.path.dirname(rec.path)
+                if os.path.normcase(os.path.dirname(parent)) != base_norm:
+                    continue
+                d = os.path.basename(parent)
+                if d.startswith("VBS4") or re.match(r"^[0-9]", d):
+                    by_dir[d] = rec.path
+            vbs4_dirs = sorted(by_dir, reverse=True)  # Sort in descending order to get the latest version first
+
             for vbs4_dir in vbs4_dirs:
-                full_path = os.path.join(base_path, vbs4_dir, "VBSLauncher.exe")
+                full_path = by_dir[vbs4_dir]
                 if os.path.isfile(full_path):
                     logging.info("VBS4 Launcher path found: %s", full_path)
                     # Save the found path to config
                     config['General']['vbs4_setup_path'] = full_path
-                    with open(CONFIG_PATH, 'w') as f:
-                        config.write(f)
+                    _save_config()
                     return full_path
 
     # If not found in the usual locations, try to find it relative to VBS4.exe
@@ -447,8 +408,7 @@ def get_vbs4_launcher_path():
         if os.path.isfile(launcher_path):
             logging.info("VBS4 Launcher path found relative to VBS4.exe: %s", launcher_path)
             config['General']['vbs4_setup_path'] = launcher_path
-            with open(CONFIG_PATH, 'w') as f:
-                config.write(f)
+            _save_config()
             return launcher_path
 
     logging.warning("VBS4 Launcher path not found")
@@ -461,8 +421,7 @@ def get_blueig_install_path() -> str:
         path = find_executable('BlueIG.exe')
         if path:
             config['General']['blueig_path'] = path
-            with open(CONFIG_PATH, 'w') as f:
-                config.write(f)
+            _save_config()
     return path or ''
 
 
@@ -480,13 +439,7 @@ def get_ares_manager_path() -> str:
 
 def get_exe_file_version(exe_path: str) -> str:
     """Return the FileVersion field from an executable, if available."""
-    try:
-        info = win32api.GetFileVersionInfo(exe_path, '\\')
-        ms = info['FileVersionMS']
-        ls = info['FileVersionLS']
-        return f"{ms >> 16}.{ms & 0xFFFF}.{ls >> 16}.{ls & 0xFFFF}"
-    except Exception:
-        return "Unknown"
+    return format_version(file_version(exe_path))
 
 def get_vbs4_version(file_path: str) -> str:
     """Extract VBS4 version from the file or its path."""
@@ -542,32 +495,8 @@ def find_executable(name, additional_paths=[]):
         r"C:\Bohemia Interactive Simulations"
     ] + additional_paths
 
-    best_path = None
-    best_mtime = -1.0
-
-    # First, check the exact paths
-    for path in possible_paths:
-        for cand in candidates:
-            full_path = os.path.join(path, cand)
-            if os.path.isfile(full_path):
-                mtime = os.path.getmtime(full_path)
-                if mtime > best_mtime:
-                    best_mtime = mtime
-                    best_path = os.path.normpath(full_path)
-
-    # If not found, search subdirectories
-    for path in possible_paths:
-        if os.path.isdir(path):
-            for root, dirs, files in os.walk(path):
-                for cand in candidates:
-                    if cand in files:
-                        full_path = os.path.join(root, cand)
-                        mtime = os.path.getmtime(full_path)
-                        if mtime > best_mtime:
-                            best_mtime = mtime
-                            best_path = os.path.normpath(full_path)
-
-    return best_path
+    # The shared index covers the exact paths and all their subdirectories
+    return get_exe_index().newest(*candidates, under=possible_paths) or None
 
 # =============================================================================
 # REALITY MESH LINK & UNC RESOLUTION
@@ -589,8 +518,7 @@ def get_rm_template_from_config() -> str:
             # parts: ["", "", "HOST", "SharedMeshDrive", ...]
             raw = "\\\\{host}\\" + "\\".join(parts[3:])
             config["General"]["reality_mesh_to_vbs4"] = raw
-            with open(CONFIG_PATH, "w") as f:
-                config.write(f)
+            _save_config()
     return raw
 
 
@@ -700,8 +628,7 @@ def set_rm_local_root(path: str) -> None:
         config['General'] = {}
     norm = os.path.abspath(path) if path else ''
     config['General']['reality_mesh_local_root'] = norm
-    with open(CONFIG_PATH, 'w') as f:
-        config.write(f)
+    _save_config()
 
 
 def is_valid_rm_local_root(root: str) -> bool:
@@ -1140,13 +1067,10 @@ def create_realitymesh_dataset(project_name: str, source_obj_folder: str,
     with open(settings_path, 'w', encoding='utf-8') as f:
         f.write('\n'.join(lines))
 
-    cfg = configparser.ConfigParser()
-    cfg.read(config_path)
-    if 'BiSimOneClickPath' not in cfg:
-        cfg['BiSimOneClickPath'] = {}
-    cfg['BiSimOneClickPath']['path'] = dataset_folder
-    with open(config_path, 'w') as cfg_file:
-        cfg.write(cfg_file)
+    with get_config_store(config_path).transaction() as cfg:
+        if 'BiSimOneClickPath' not in cfg:
+            cfg['BiSimOneClickPath'] = {}
+        cfg['BiSimOneClickPath']['path'] = dataset_folder
 
     return dataset_folder
 
@@ -1159,13 +1083,23 @@ BASE_DIR    = os.path.dirname(os.path.abspath(__file__))
 CONFIG_PATH = os.path.join(BASE_DIR, 'config.ini')
 ICON_NAME   = 'icon.ico'
 
-config      = configparser.ConfigParser()
-config.read(CONFIG_PATH)
+# One shared ConfigStore owns config.ini for this process (photomesh_launcher
+# uses the same instance), so writes are serialized, coalesced and atomic.
+_config_store = get_config_store(CONFIG_PATH)
+config      = _config_store.config
+
+
+# How often the UI checks config.ini for edits made by other tools
+CONFIG_POLL_MS = 2000
+# How often the VBS4 panel refreshes its live fuser telemetry line
+FUSER_TELEMETRY_REFRESH_MS = 2000
+# How often the local fuser count is re-evaluated by the autoscaler
+AUTOSCALE_INTERVAL_MS = 30000
 
 
 def _save_config():
-    with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-        config.write(f)
+    """Schedule a debounced, atomic write of ``config`` to disk."""
+    _config_store.save()
 
 
 def get_projects_root() -> str:
@@ -1206,8 +1140,7 @@ def set_host(host: str) -> None:
     config["Network"]["host"] = host
     config["Fusers"]["working_folder_host"] = host  # so fuser toggle doesn't prompt again
 
-    with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-        config.write(f)
+    _save_config()
 
 
 def resolve_unc(template: str) -> str:
@@ -1250,21 +1183,16 @@ def _toplevel_init_with_icon(self, *args, **kwargs):
 
 tk.Toplevel.__init__ = _toplevel_init_with_icon
 
-if 'General' not in config:
-    config['General'] = {}
-if 'close_on_launch' not in config['General']:
-    config['General']['close_on_launch'] = 'False'
-with open(CONFIG_PATH, 'w') as f:
-    config.write(f)
+with _config_store.transaction():
+    if 'General' not in config:
+        config['General'] = {}
+    if 'close_on_launch' not in config['General']:
+        config['General']['close_on_launch'] = 'False'
 def load_image(path, size=None):
-    img = Image.open(path)
-    if size:
-        img = img.resize(size, Image.Resampling.LANCZOS)
-    return ImageTk.PhotoImage(img)
+    return cached_photo(path, size)
 if 'fullscreen' not in config['General']:
     config['General']['fullscreen'] = 'False'  # Set a default value
-    with open(CONFIG_PATH, 'w') as f:
-        config.write(f)
+    _save_config()
        
 
 # =============================================================================
@@ -1278,8 +1206,7 @@ if 'Auto-Launch' not in config:
         'program_path': '',
         'arguments': ''
     }
-    with open(CONFIG_PATH, 'w') as f:
-        config.write(f)
+    _save_config()
 
 
 def is_auto_launch_enabled() -> bool:
@@ -1297,24 +1224,22 @@ def get_auto_launch_cmd() -> tuple[str, list[str]]:
 # =============================================================================
 # Manage PhotoMesh Fuser executable settings and scaling.
 
-if 'Fusers' not in config:
-    config['Fusers'] = {
-        'config_path': 'fuser_config.json',
-        'local_fuser_exe': r'C:\\Program Files\\Skyline\\PhotoMesh\\Fuser\\PhotoMeshFuser.exe',
-        'remote_fuser_exe': r'C:\\Program Files\\Skyline\\PhotoMesh\\Fuser\\PhotoMeshFuser.exe',
-        'fuser_computer': 'False',
-        'working_folder_host': ''
-    }
-    with open(CONFIG_PATH, 'w') as f:
-        config.write(f)
-elif 'fuser_computer' not in config['Fusers']:
-    config['Fusers']['fuser_computer'] = 'False'
-    with open(CONFIG_PATH, 'w') as f:
-        config.write(f)
-if 'working_folder_host' not in config['Fusers']:
-    config['Fusers']['working_folder_host'] = ''
-    with open(CONFIG_PATH, 'w') as f:
-        config.write(f)
+with _config_store.transaction():
+    if 'Fusers' not in config:
+        config['Fusers'] = {
+            'config_path': 'fuser_config.json',
+            'local_fuser_exe': r'C:\\Program Files\\Skyline\\PhotoMesh\\Fuser\\PhotoMeshFuser.exe',
+            'remote_fuser_exe': r'C:\\Program Files\\Skyline\\PhotoMesh\\Fuser\\PhotoMeshFuser.exe',
+            'fuser_computer': 'False',
+            'working_folder_host': '',
+            'fuser_count_override': ''
+        }
+    elif 'fuser_computer' not in config['Fusers']:
+        config['Fusers']['fuser_computer'] = 'False'
+    if 'working_folder_host' not in config['Fusers']:
+        config['Fusers']['working_folder_host'] = ''
+    if 'fuser_count_override' not in config['Fusers']:
+        config['Fusers']['fuser_count_override'] = ''
 
 
 # --- Fuser helpers ---
@@ -1333,7 +1258,7 @@ def is_host_machine() -> bool:
 
 def find_fuser_exe() -> str:
     """
-    Try common install paths; fall back to walking PhotoMesh install folder.
+    Try common install paths; fall back to the shared executable index.
     Adjust paths if your install differs.
     """
     candidates = [
@@ -1346,68 +1271,51 @@ def find_fuser_exe() -> str:
             return c
 
     root = r"C:\\Program Files\\Skyline\\PhotoMesh"
-    for dp, dn, fn in os.walk(root):
-        if "PhotoMeshFuser.exe" in fn:
-            return os.path.join(dp, "PhotoMeshFuser.exe")
-    return ""
+    return get_exe_index().newest("PhotoMeshFuser.exe", under=[root])
 
 
 def list_local_fusers() -> list:
-    """Return list of psutil.Process for local PhotoMeshFuser.exe."""
-    procs = []
-    if psutil:
-        try:
-            for p in psutil.process_iter(['name', 'exe']):
-                nm = (p.info.get('name') or '').lower()
-                if nm == 'photomeshfuser.exe':
-                    procs.append(p)
-        except Exception:
-            pass
-    else:  # fallback to tasklist parsing
-        try:
-            out = subprocess.check_output(
-                ['tasklist', '/FI', 'IMAGENAME eq PhotoMeshFuser.exe'],
-                text=True, stderr=subprocess.DEVNULL
-            )
-            for line in out.splitlines():
-                if 'PhotoMeshFuser.exe' in line:
-                    procs.append(line)
-        except Exception:
-            pass
-    return procs
+    """Return ProcessInfo entries for local PhotoMeshFuser.exe (shared process index)."""
+    return get_process_watch().processes("PhotoMeshFuser.exe")
 
 
 def count_local_fusers() -> int:
-    return len(list_local_fusers())
+    return get_process_watch().count("PhotoMeshFuser.exe")
 
 
-def start_fuser_instance(idx: int) -> bool:
-    """Start *idx*-th fuser via its own shortcut/command."""
-    o = get_offline_cfg()
-    if o["enabled"]:
-        unc = resolve_network_working_folder_from_cfg(o)
-        if not can_access_unc(unc):
-            messagebox.showerror("Offline Mode", OFFLINE_ACCESS_HINT)
-            return False
+def _fuser_error(title: str, message: str, interactive: bool) -> None:
+    """Show a fuser start failure, or only log it for unattended re-checks."""
+    if interactive:
+        messagebox.showerror(title, message)
+    else:
+        # The first paragraph says what failed; the rest is setup advice
+        logging.warning("%s: %s", title, " ".join(message.split("\n\n")[0].split()))
+
 
+def start_fuser_instance(idx: int, interactive: bool = True) -> bool:
+    """Start *idx*-th fuser via its own shortcut/command.
+
+    The offline share is not checked here; ensure_fuser_instances probes it
+    once, off the Tk thread, before starting any.  With *interactive* False
+    failures are logged instead of shown.
+    """
     exe = find_fuser_exe()
     if not exe:
-        messagebox.showerror("Fuser", "PhotoMeshFuser.exe not found. Check PhotoMesh installation.")
+        _fuser_error("Fuser", "PhotoMeshFuser.exe not found. Check PhotoMesh installation.", interactive)
         return False
 
     name = f"LocalFuser{idx}"
     shared = working_fuser_unc()
     bat = os.path.join(os.path.dirname(exe), f"{name}.bat")
+    argv = [bat] if os.path.isfile(bat) else [exe, name, shared, "0", "true"]
 
     try:
-        if os.path.isfile(bat):
-            cmd = f'start "" "{bat}"'
-        else:
-            cmd = f'start "" "{exe}" "{name}" "{shared}" 0 true'
-        subprocess.run(cmd, shell=True, check=True)
+        # Popen (not `start`) so the registry knows the PID for scale-down
+        rec = get_fuser_registry().spawn(name, argv, cwd=os.path.dirname(exe))
+        get_fuser_sampler().track(rec.pid)
         return True
     except Exception as e:
-        messagebox.showerror("Fuser", f"Failed to start {name}:\n{e}")
+        _fuser_error("Fuser", f"Failed to start {name}:\n{e}", interactive)
         return False
 
 
@@ -1419,44 +1327,98 @@ def kill_fusers() -> None:
     except Exception:
         for p in list_local_fusers():
             try:
-                if psutil and isinstance(p, psutil.Process):
-                    p.terminate()
+                if psutil:
+                    psutil.Process(p.pid).terminate()
             except Exception:
                 pass
+    get_fuser_registry().forget_all()
 
 
-def ensure_fuser_instances(desired: int):
+def ensure_fuser_instances(desired: int, interactive: bool = True):
     """
-    Scale local PhotoMeshFuser.exe processes to exactly 'desired'.
-    If too few → spawn more; if too many → kill extras.
+    Start local PhotoMeshFuser.exe processes up to 'desired'.
+    Missing ones start under unused LocalFuserN names; fusers that are
+    already running are never restarted (see fuser_registry).  Surplus
+    fusers are stopped by enforce_local_fuser_policy off the Tk thread,
+    never here.  In offline mode the working share is probed asynchronously
+    before starting.
     """
-    current = count_local_fusers()
-    if current == desired:
+    registry = get_fuser_registry()
+    # Adoption reads the shared process index, so a full pass is cheap
+    if len(registry.reconcile(full=True)) >= desired:
         return
 
-    if current > desired:
-        kill_fusers()
-        current = 0
+    o = get_offline_cfg()
+    if not o["enabled"]:
+        _start_missing_fusers(desired, interactive)
+        return
+
+    def _probed(ok):
+        if ok:
+            _start_missing_fusers(desired, interactive)
+        else:
+            _fuser_error("Offline Mode", OFFLINE_ACCESS_HINT, interactive)
+
+    unc = resolve_network_working_folder_from_cfg(o)
+    get_unc_prober().probe(unc, lambda ok: post_ui(_probed, ok))
+
+
+def _start_missing_fusers(desired: int, interactive: bool) -> None:
+    registry = get_fuser_registry()
+    # Recount: fusers may have been started while the share was probed
+    current = len(registry.reconcile(full=True))
+    for idx in registry.free_indices(max(0, desired - current)):
+        if not start_fuser_instance(idx, interactive):
+            break
+
 
-    to_start = max(0, desired - current)
-    for idx in range(current + 1, current + 1 + to_start):
-        start_fuser_instance(idx)
+def _local_fuser_role() -> str:
+    if is_host_machine():
+        return ROLE_HOST
+    return ROLE_FUSER if config['Fusers'].getboolean('fuser_computer', fallback=False) else ROLE_NONE
 
 
-def enforce_local_fuser_policy():
+def _queue_activity() -> bool | None:
+    """Project Queue state for the autoscaler (only known on the host)."""
+    return queue_alive(timeout=1.0) if is_host_machine() else None
+
+
+def enforce_local_fuser_policy(interactive: bool = True):
     """
-    Host machine: always 1 fuser.
-    Non-host:
-      - if 'fuser_computer' checked: 3 fusers
-      - else: 0 fusers
-    Works whether Offline Mode is enabled or not.
+    Scale local fusers to the autoscaler's target.
+
+    The target follows cores, free RAM, disk queue and Project Queue activity
+    (see fuser_autoscaler), drops to 0 while VBS4/BlueIG runs on this PC and
+    is 0 on PCs that are neither the host nor a fuser computer.  A number in
+    Fusers.fuser_count_override (Settings) replaces the automatic target.
+    Signals are gathered and surplus fusers stopped off the Tk thread;
+    missing fusers are started on it.  Periodic re-checks pass
+    *interactive* False so start failures are logged, not shown as dialogs.
     """
-    try:
-        is_fuser = config['Fusers'].getboolean('fuser_computer', fallback=False)
-        desired = 1 if is_host_machine() else (3 if is_fuser else 0)
-        ensure_fuser_instances(desired)
-    except Exception as e:
-        print(f"[fuser-policy] {e}")
+    role = _local_fuser_role()
+    override = parse_override(config['Fusers'].get('fuser_count_override', ''))
+
+    def _apply(decision):
+        try:
+            ensure_fuser_instances(decision.target, interactive)
+        except Exception as e:
+            print(f"[fuser-policy] {e}")
+
+    def _work():
+        try:
+            decision = get_fuser_autoscaler(_queue_activity).evaluate(role, override)
+        except Exception as e:
+            print(f"[fuser-policy] {e}")
+            return
+        logging.debug("Fuser autoscaler (%s): %s", role, decision.describe())
+        try:
+            for rec in get_fuser_registry().scale_down(decision.target):
+                logging.info("Stopped fuser %s (PID %s) to reach %d", rec.name, rec.pid, decision.target)
+        except Exception as e:
+            print(f"[fuser-policy] {e}")
+        post_ui(_apply, decision)
+
+    run_in_thread(_work)
 
 # Update the shared fuser path in the JSON config. If *project_path* is a UNC
 # path, derive the host from it; otherwise fall back to the local machine name.
@@ -1500,8 +1462,49 @@ def update_fuser_shared_path(project_path: str | None = None) -> None:
 
     if stored_host != host and host:
         config['Fusers']['working_folder_host'] = host
-        with open(CONFIG_PATH, 'w') as f:
-            config.write(f)
+        _save_config()
+
+# (config generation, fuser_config path, its mtime) the resolver was seeded
+# from, and the IPs pinned then
+_name_seed_key = None
+_name_seeded_ips: set = set()
+_name_seed_lock = threading.Lock()
+
+
+def seed_name_resolver():
+    """Return the shared name resolver with config-known host names pinned.
+
+    Only explicitly configured Offline keys count (get_offline_cfg fills in
+    placeholder defaults).  fuser_config.json is re-read only when it or
+    config.ini changed; pins from the previous version are dropped.
+    """
+    global _name_seed_key, _name_seeded_ips
+    resolver = get_name_resolver()
+    snap = _config_store.snapshot()
+    config_file = snap.get('Fusers', 'config_path', 'fuser_config.json')
+    cfg_path = os.path.join(BASE_DIR, config_file) if not os.path.isabs(config_file) else config_file
+    try:
+        mtime = os.stat(cfg_path).st_mtime_ns
+    except OSError:
+        mtime = None
+    key = (snap.generation, cfg_path, mtime)
+    with _name_seed_lock:
+        if key == _name_seed_key:
+            return resolver
+        pins = {}
+        host_ip = snap.get('Offline', 'host_ip').strip()
+        host = snap.get('Fusers', 'working_folder_host').strip()
+        host_name = snap.get('Offline', 'host_name').strip() or (host if not is_ip(host) else "")
+        if host_ip and host_name:
+            pins[host_ip] = host_name
+        for ip, node in load_node_inventory(cfg_path).items():
+            if node.get('name'):
+                pins[ip] = node['name']
+        for ip in _name_seeded_ips - set(pins):
+            resolver.invalidate(ip)
+        resolver.seed_many(pins)
+        _name_seed_key, _name_seeded_ips = key, set(pins)
+    return resolver
 
 def apply_offline_settings() -> None:
     """Apply offline configuration changes and refresh dependent systems."""
@@ -1558,8 +1561,7 @@ def toggle_close_on_launch():
     """Toggle whether the main window closes when you launch a tool."""
     enabled = not is_close_on_launch_enabled()
     config['General']['close_on_launch'] = str(enabled)
-    with open(CONFIG_PATH, 'w') as f:
-        config.write(f)
+    _save_config()
     status = "Enabled" if enabled else "Disabled"
     messagebox.showinfo("Settings", f"Close on Software Launch? ▶ {status}")
 
@@ -1708,8 +1710,7 @@ def prompt_for_exe(app_name, config_key):
     )
     if path and os.path.exists(path):
         config['General'][config_key] = clean_path(path)
-        with open(CONFIG_PATH, 'w') as f:
-            config.write(f)
+        _save_config()
         messagebox.showinfo("Success", f"{app_name} path set to:\n{path}")
         return True
     else:
@@ -1744,8 +1745,7 @@ def ensure_executable(config_key: str, exe_name: str, prompt_title: str) -> str:
         # store it for next time unless it's the VBS4 path
         if config_key != 'vbs4_path':
             config['General'][config_key] = clean_path(path)
-            with open(CONFIG_PATH, 'w') as f:
-                config.write(f)
+            _save_config()
         return path
 
       # 3) Fallback: prompt the user (must pass BOTH arguments!)
@@ -1814,8 +1814,7 @@ def launch_blueig():
 
         # Save the new path in config.ini
         config['General']['blueig_path'] = exe
-        with open(CONFIG_PATH, 'w') as cfg:
-            config.write(cfg)
+        _save_config()
 
     # Determine the folder where BlueIG.exe lives:
     blueig_dir = os.path.dirname(exe)
@@ -1892,9 +1891,7 @@ def set_background(window, widget=None):
 
     # wallpaper
     if os.path.exists(background_image_path):
-        img = Image.open(background_image_path)
-        img = img.resize((screen_width, screen_height), Image.Resampling.LANCZOS)
-        ph  = ImageTk.PhotoImage(img)
+        ph  = cached_photo(background_image_path, (screen_width, screen_height))
         lbl = tk.Label(widget or window, image=ph)
         lbl.image = ph
         lbl.place(x=0, y=0, relwidth=1, relheight=1)
@@ -1913,8 +1910,7 @@ def set_background(window, widget=None):
         ]
         for x,y,path,(w,h) in coords:
             if os.path.exists(path):
-                img   = Image.open(path).convert("RGBA").resize((w,h), Image.Resampling.LANCZOS)
-                ph    = ImageTk.PhotoImage(img)
+                ph    = cached_photo(path, (w, h), "RGBA")
                 lbl2  = tk.Label(window, image=ph, bg="black")
                 lbl2.image = ph
                 lbl2.place(x=x, y=y)
@@ -1930,8 +1926,7 @@ def set_wallpaper(window):
     w = window.winfo_width()
     h = window.winfo_height()
 
-    img = Image.open(background_image_path).resize((w, h), Image.Resampling.LANCZOS)
-    ph  = ImageTk.PhotoImage(img)
+    ph  = cached_photo(background_image_path, (w, h))
     lbl = tk.Label(window, image=ph)
     lbl.image = ph
     lbl.place(relwidth=1, relheight=1)
@@ -2041,8 +2036,7 @@ def open_bvi_quickstart():
     if user_path:
         # Save the path for future use
         config['General']['bvi_quickstart_path'] = user_path
-        with open(CONFIG_PATH, 'w') as f:
-            config.write(f)
+        _save_config()
         
         try:
             subprocess.Popen([user_path], shell=True)
@@ -2081,8 +2075,7 @@ def open_bvi_documentation():
     if user_path:
         # Save the path for future use
         config['General']['bvi_documentation_path'] = user_path
-        with open(CONFIG_PATH, 'w') as f:
-            config.write(f)
+        _save_config()
         
         try:
             subprocess.Popen([user_path], shell=True)
@@ -2150,8 +2143,7 @@ def set_blueig_install_path():
     )
     if path and os.path.exists(path):
         config['General']['blueig_path'] = path
-        with open(CONFIG_PATH, 'w') as f:
-            config.write(f)
+        _save_config()
         messagebox.showinfo("Settings", f"BlueIG path set to:\n{path}")
     else:
         messagebox.showerror("Settings", "Invalid BlueIG path selected.")
@@ -2170,8 +2162,7 @@ def set_default_browser():
     )
     if path and os.path.exists(path):
         config['General']['default_browser'] = path
-        with open(CONFIG_PATH, 'w') as f:
-            config.write(f)
+        _save_config()
         messagebox.showinfo("Settings", f"Default browser set to:\n{path}")
     else:
         messagebox.showerror("Settings", "Invalid browser path selected.")
@@ -2187,8 +2178,7 @@ def set_oneclick_output_path(path: str) -> None:
     if 'BiSimOneClickPath' not in config:
         config['BiSimOneClickPath'] = {}
     config['BiSimOneClickPath']['path'] = path
-    with open(CONFIG_PATH, 'w') as f:
-        config.write(f)
+    _save_config()
 
 # =============================================================================
 # FILE DIALOG / EXE SELECTION HELPERS
@@ -2206,8 +2196,7 @@ def set_vbs4_install_path():
     if path and os.path.exists(path):
         path = os.path.normpath(path)
         config['General']['vbs4_path'] = path
-        with open(CONFIG_PATH, 'w') as f:
-            config.write(f)
+        _save_config()
         messagebox.showinfo("Settings", f"VBS4 path set to:\n{path}")
     else:
         messagebox.showerror("Settings", "Invalid VBS4 path selected.")
@@ -2216,25 +2205,82 @@ def set_ares_manager_path():
     path = filedialog.askopenfilename(title="Select ARES Manager.exe", filetypes=[("Executable", "*.exe")])
     if path:
         config['General']['bvi_manager_path'] = path
-        with open(CONFIG_PATH, 'w') as f: config.write(f)
+        _save_config()
         messagebox.showinfo("Settings", f"ARES Manager path set to:\n{path}")
 
 # ─── One Click Terrain SETUP ──────────────────────────────────────────────────────
-def find_terra_explorer() -> str:
-    """Search for TerraExplorer.exe and return its path or an empty string."""
+TERRA_EXPLORER_EXE = "TerraExplorer.exe"
+TERRA_EXPLORER_REG_KEYS = [
+    (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Windows\CurrentVersion\App Paths\TerraExplorer.exe"),
+    (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Skyline\TerraExplorer Pro"),
+    (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\WOW6432Node\Skyline\TerraExplorer Pro"),
+    (winreg.HKEY_CURRENT_USER, r"SOFTWARE\Skyline\TerraExplorer Pro"),
+]
+
+
+def _terra_explorer_from_registry() -> str:
+    """Look up TerraExplorer via App Paths, Skyline keys and uninstall entries."""
+    for hive, sub in TERRA_EXPLORER_REG_KEYS:
+        try:
+            with winreg.OpenKey(hive, sub) as key:
+                for value in ("", "Path", "InstallDir", "InstallPath"):
+                    try:
+                        data, _ = winreg.QueryValueEx(key, value)
+                    except OSError:
+                        continue
+                    data = str(data).strip().strip('"')
+                    if not data:
+                        continue
+                    exe = data if data.lower().endswith(".exe") else os.path.join(data, TERRA_EXPLORER_EXE)
+                    if os.path.isfile(exe):
+                        return exe
+        except OSError:
+            continue
+    for name, location in get_exe_index().uninstall_entries():
+        if "terraexplorer" in name.replace(" ", "").lower():
+            exe = os.path.join(location, TERRA_EXPLORER_EXE)
+            if os.path.isfile(exe):
+                return exe
+    return ""
+
+
+def find_terra_explorer(progress=None, cancel_event=None) -> str:
+    """Search for TerraExplorer.exe and return its path or an empty string.
+
+    Cheap sources are tried first (cached config value, known install paths,
+    registry, executable index).  Only then is a bounded parallel scan of the
+    local fixed drives run; *progress* and *cancel_event* are passed through
+    to :class:`exe_search.ParallelExeSearch`.  A hit is cached in config.
+    """
+    cached = config['General'].get('terra_explorer_path', '').strip()
+    if cached and os.path.isfile(cached):
+        return cached
+
     possible_paths = [
         r"C:\Program Files\Skyline\TerraExplorer Pro\TerraExplorer.exe",
         r"C:\Program Files (x86)\Skyline\TerraExplorer Pro\TerraExplorer.exe",
         r"C:\Program Files\Skyline\TerraExplorer\TerraExplorer.exe",
         r"C:\Program Files (x86)\Skyline\TerraExplorer\TerraExplorer.exe",
     ]
-    for path in possible_paths:
-        if os.path.exists(path):
-            return path
-    for root, dirs, files in os.walk(r"C:\\"):
-        if "TerraExplorer.exe" in files:
-            return os.path.join(root, "TerraExplorer.exe")
-    return ""
+    found = next((p for p in possible_paths if os.path.exists(p)), "")
+    if not found:
+        found = _terra_explorer_from_registry()
+    if not found:
+        found = get_exe_index().newest(TERRA_EXPLORER_EXE)
+    if not found:
+        # The work queue is FIFO, so shallow folders such as Program Files
+        # are visited before anything deep.
+        found = ParallelExeSearch(
+            [TERRA_EXPLORER_EXE],
+            fixed_drive_roots(),
+            progress=progress,
+            cancel_event=cancel_event,
+        ).run()
+
+    if found:
+        config['General']['terra_explorer_path'] = found
+        _save_config()
+    return found
 
 # ─── helper for "External Map" ────────────────────────────────────────────
 def select_vbs_map_profile():
@@ -2250,8 +2296,7 @@ def select_vbs_map_profile():
     # you can also set defaults if you want:
     cfg.setdefault('vbs_map_server', 'localhost')
     cfg.setdefault('vbs_map_port',   '4080')
-    with open(CONFIG_PATH, 'w') as f:
-        config.write(f)
+    _save_config()
     messagebox.showinfo("Settings", f"VBS Map loginName set to:\n{profile}")
 
 def open_external_map():
@@ -2310,8 +2355,7 @@ def prompt_hostname(parent, initial=""):
     top.grab_set()
 
     if os.path.exists(prompt_box_image_path):
-        img = Image.open(prompt_box_image_path).resize((801, 506), Image.Resampling.LANCZOS)
-        ph = ImageTk.PhotoImage(img)
+        ph = cached_photo(prompt_box_image_path, (801, 506))
         lbl = tk.Label(top, image=ph)
         lbl.image = ph
         lbl.place(relwidth=1, relheight=1)
@@ -2359,8 +2403,7 @@ def prompt_project_name(parent):
     top.grab_set()
 
     if os.path.exists(prompt_box_image_path):
-        img = Image.open(prompt_box_image_path).resize((801, 506), Image.Resampling.LANCZOS)
-        ph = ImageTk.PhotoImage(img)
+        ph = cached_photo(prompt_box_image_path, (801, 506))
         lbl = tk.Label(top, image=ph)
         lbl.image = ph
         lbl.place(relwidth=1, relheight=1)
@@ -2403,9 +2446,100 @@ def prompt_project_name(parent):
     parent.wait_window(top)
     return result["value"]
 
+# ─── LAZY PANEL REGISTRY ───────────────────────────────────
+# Panels likely to be opened next; built during idle time after startup
+PREFETCH_PANELS = ('VBS4',)
+PREFETCH_DELAY_MS = 500
+# --profile-startup: how long after launch the report is written
+PROFILE_SETTLE_MS = 3000
+
+
+class PanelRegistry:
+    """Build panels on first use instead of all at once in ``MainApp``.
+
+    Panels are registered as factories.  ``registry[name]`` and
+    ``registry.get(name)`` build on demand (so existing
+    ``controller.panels['VBS4']`` calls keep working); :meth:`peek` returns
+    a panel only if it already exists, for callers that merely want to
+    refresh one.  Build times are recorded for the startup report.
+    """
+
+    def __init__(self, container, controller):
+        self.container = container
+        self.controller = controller
+        self._factories = OrderedDict()
+        self._panels = {}
+        self.build_times = {}
+        # Panels built after the window became interactive (time kept off startup)
+        self.deferred_ms = 0.0
+        self.startup_done = False
+
+    def register(self, name, factory):
+        self._factories[name] = factory
+
+    def __contains__(self, name):
+        return name in self._factories
+
+    def __iter__(self):
+        return iter(self._factories)
+
+    def __getitem__(self, name):
+        panel = self._panels.get(name)
+        if panel is None:
+            if name not in self._factories:
+                raise KeyError(name)
+            panel = self._build(name)
+        return panel
+
+    def get(self, name, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def peek(self, name):
+        """Return the panel if it has been built, else ``None``."""
+        return self._panels.get(name)
+
+    def built(self):
+        """Return the panels constructed so far."""
+        return list(self._panels.values())
+
+    def prefetch(self, name):
+        if name in self._factories and name not in self._panels:
+            self._build(name)
+
+    def _build(self, name):
+        t0 = time.perf_counter()
+        with _prof.span(f"panel {name}", "panels"):
+            panel = self._factories[name](self.container, self.controller)
+        # Stack all panels in the same location; show() raises the active one
+        panel.place(relx=0, rely=0, relwidth=1, relheight=1)
+        panel.lower()
+        self._panels[name] = panel
+        ms = (time.perf_counter() - t0) * 1000.0
+        self.build_times[name] = ms
+        if self.startup_done:
+            self.deferred_ms += ms
+            logging.info(
+                "Panel %s built lazily in %.0f ms (startup time saved so far: %.0f ms)",
+                name, ms, self.deferred_ms,
+            )
+        return panel
+
+    def startup_report(self, interactive_ms):
+        built = ", ".join(f"{n} {ms:.0f} ms" for n, ms in self.build_times.items())
+        pending = [n for n in self._factories if n not in self._panels]
+        return (
+            f"Startup: interactive after {interactive_ms:.0f} ms; "
+            f"built [{built}]; deferred {len(pending)} panels ({', '.join(pending)})"
+        )
+
+
 # ─── MAINMENU PANEL ────────────────────────────────────────
 class MainApp(tk.Tk):
     def __init__(self):
+        self._t_start = time.perf_counter()
         super().__init__()
         pump_ui_queue(self)
         apply_app_icon(self)
@@ -2491,20 +2625,19 @@ class MainApp(tk.Tk):
         self.panels_container = tk.Frame(self.content)
         self.panels_container.pack(side='right', expand=True, fill='both')
 
-        # Instantiate each panel, passing `self` as the controller
-        self.panels = {
-            'Main':      MainMenu(self.panels_container, self),
-            'VBS4':      VBS4Panel(self.panels_container, self),
-            'BVI':       BVIPanel(self.panels_container, self),
-            'Settings':  SettingsPanel(self.panels_container, self),
-            'Tutorials': TutorialsPanel(self.panels_container, self),
-            'Credits':   CreditsPanel(self.panels_container, self),
-            'Contact Us': ContactSupportPanel(self.panels_container, self),
-        }
-
-        # Stack all panels in the same location and raise the active one
-        for panel in self.panels.values():
-            panel.place(relx=0, rely=0, relwidth=1, relheight=1)
+        # Register each panel; it is built (with `self` as the controller)
+        # the first time it is shown or asked for
+        self.panels = PanelRegistry(self.panels_container, self)
+        for name, factory in (
+            ('Main',       MainMenu),
+            ('VBS4',       VBS4Panel),
+            ('BVI',        BVIPanel),
+            ('Settings',   SettingsPanel),
+            ('Tutorials',  TutorialsPanel),
+            ('Credits',    CreditsPanel),
+            ('Contact Us', ContactSupportPanel),
+        ):
+            self.panels.register(name, factory)
 
         # Build the nav buttons
         nav_tip = Tooltip(nav)
@@ -2536,6 +2669,11 @@ class MainApp(tk.Tk):
 
         enforce_local_fuser_policy()
 
+        # Follow config.ini edits (ours or another tool's) without re-parsing
+        _config_store.subscribe(lambda snap: post_ui(self._on_config_changed, snap))
+        self.after(CONFIG_POLL_MS, self._poll_config)
+        self.after(AUTOSCALE_INTERVAL_MS, self._autoscale_tick)
+
         # Start by showing "Main"
         self.current = None
         self.show('Main')
@@ -2550,6 +2688,42 @@ class MainApp(tk.Tk):
         self.bind("<Return>", self.activate_current)
         self.update_navigation()
 
+        self.after_idle(self._on_startup_idle)
+
+    def _poll_config(self):
+        """Cheap stat of config.ini; a change on disk notifies subscribers."""
+        try:
+            _config_store.snapshot()
+        except Exception:
+            logging.exception("Config poll failed")
+        self.after(CONFIG_POLL_MS, self._poll_config)
+
+    def _on_config_changed(self, snap):
+        for panel in self.panels.built():
+            handler = getattr(panel, "on_config_changed", None)
+            if handler:
+                handler(snap)
+
+    def _on_startup_idle(self):
+        """Log the startup report, then prefetch likely panels while idle."""
+        interactive_ms = (time.perf_counter() - self._t_start) * 1000.0
+        self.panels.startup_done = True
+        _prof.mark("window interactive")
+        logging.info(self.panels.startup_report(interactive_ms))
+
+        def _prefetch(names=list(PREFETCH_PANELS)):
+            if names:
+                with _prof.span(f"prefetch {names[0]}", "panels"):
+                    self.panels.prefetch(names.pop(0))
+                self.after(PREFETCH_DELAY_MS, lambda: self.after_idle(_prefetch, names))
+
+        self.after(PREFETCH_DELAY_MS, lambda: self.after_idle(_prefetch))
+
+    def _autoscale_tick(self):
+        """Re-evaluate the local fuser count; hysteresis lives in the autoscaler."""
+        enforce_local_fuser_policy(interactive=False)
+        self.after(AUTOSCALE_INTERVAL_MS, self._autoscale_tick)
+
     def apply_scale(self, scale: float) -> None:
         """Scale fonts and widgets proportionally using Tk scaling."""
         self.tk.call('tk', 'scaling', self.base_scaling * scale)
@@ -2686,16 +2860,17 @@ class MainApp(tk.Tk):
         )
         if path and os.path.exists(path):
             config['General'][config_key] = clean_path(path)
-            with open(CONFIG_PATH, 'w') as f:
-                config.write(f)
+            _save_config()
             messagebox.showinfo("Success", f"{app_name} path set to:\n{path}")
             button.config(state="normal", bg="#444444")
-            if app_name == "VBS4":
-                self.panels['VBS4'].update_vbs4_version()
-            elif app_name == "BlueIG":
-                self.panels['VBS4'].update_blueig_version()
-            elif app_name == "BVI":
-                self.panels['BVI'].update_bvi_version()
+            # Panels not built yet will read the new path when they are
+            vbs4, bvi = self.panels.peek('VBS4'), self.panels.peek('BVI')
+            if app_name == "VBS4" and vbs4:
+                vbs4.update_vbs4_version()
+            elif app_name == "BlueIG" and vbs4:
+                vbs4.update_blueig_version()
+            elif app_name == "BVI" and bvi:
+                bvi.update_bvi_version()
         else:
             messagebox.showerror("Error", f"Invalid {app_name} path selected.")
    
@@ -3004,7 +3179,25 @@ class VBS4Panel(tk.Frame):
         )
         self.progress_label.pack(side="right", padx=(5, 0))
 
-        self.progress_job = None
+        self.eta_label = tk.Label(
+            progress_frame,
+            text="",
+            font=("Helvetica", 10),
+            bg=progress_frame.cget("bg"),
+            fg="white",
+            width=12,
+            bd=0,
+            highlightthickness=0,
+        )
+        self.eta_label.pack(side="right", padx=(5, 0))
+
+        self.progress_follower = None
+        self._render_stages = []
+        self.output_watcher = None
+        self.queue_monitor = None
+        self._queue_pending = None
+        self._queue_progress = False
+        self._queue_stage = ""
         self.project_log_folder = None
         self.work_folder = None
         self.last_build_dir = None
@@ -3033,6 +3226,46 @@ class VBS4Panel(tk.Frame):
             highlightthickness=0,
         ).pack(side="right")
 
+        tk.Button(
+            button_frame,
+            text="Dump Telemetry",
+            command=self.dump_fuser_telemetry,
+            bg="#555",
+            fg="white",
+            bd=0,
+            highlightthickness=0,
+        ).pack(side="right", padx=(0, 8))
+
+        # Live fuser CPU / memory / IO view fed by the background sampler
+        self.fuser_telemetry_label = tk.Label(
+            button_frame,
+            text="",
+            font=("Helvetica", 10),
+            bg=button_frame.cget("bg"),
+            fg="#aaaaaa",
+            bd=0,
+            highlightthickness=0,
+        )
+        self.fuser_telemetry_label.pack(side="left", padx=(10, 0))
+        self.after(FUSER_TELEMETRY_REFRESH_MS, self._refresh_fuser_telemetry)
+
+    def _refresh_fuser_telemetry(self):
+        try:
+            self.fuser_telemetry_label.config(text=get_fuser_sampler().summary())
+        except tk.TclError:
+            return
+        self.after(FUSER_TELEMETRY_REFRESH_MS, self._refresh_fuser_telemetry)
+
+    def dump_fuser_telemetry(self):
+        def _work():
+            try:
+                path = get_fuser_sampler().dump_json()
+                self.log_message(f"Fuser telemetry written to {path}")
+            except Exception as e:
+                self.log_message(f"Failed to write fuser telemetry: {e}")
+
+        run_in_thread(_work)
+
     def create_blueig_button(self):
         # Clear out any existing widgets
         for widget in self.blueig_frame.winfo_children():
@@ -3117,9 +3350,9 @@ class VBS4Panel(tk.Frame):
             # don't block launch if saving fails; just continue
             pass
 
-        if hasattr(self.controller, "panels") and "VBS4" in self.controller.panels:
-            pnl = self.controller.panels["VBS4"]
-            if hasattr(pnl, "log_message"):
+        if hasattr(self.controller, "panels"):
+            pnl = self.controller.panels.peek("VBS4")
+            if pnl and hasattr(pnl, "log_message"):
                 pnl.log_message(f"Host set to: {host_name}")
 
         # Build CLI args
@@ -3261,6 +3494,8 @@ class VBS4Panel(tk.Frame):
                self._wrap_autocollapse(self.on_oneclick_convert)).pack(pady=8, ipadx=10, ipady=5)
             pb(panel, "Launch Reality Mesh to VBS4",
                self._wrap_autocollapse(self.on_launch_reality_mesh)).pack(pady=8, ipadx=10, ipady=5)
+            pb(panel, "Batch Queue Build",
+               self._wrap_autocollapse(self.on_batch_queue_build)).pack(pady=8, ipadx=10, ipady=5)
             pb(panel, "One-Click Terrain Tutorial",
                self._wrap_autocollapse(self.on_open_oct_tutorial)).pack(pady=8, ipadx=10, ipady=5)
         else:
@@ -3272,6 +3507,10 @@ class VBS4Panel(tk.Frame):
                       command=self._wrap_autocollapse(self.on_launch_reality_mesh),
                       font=("Helvetica", 20), bg="#444444", fg="white", bd=0,
                       highlightthickness=0).pack(pady=8, ipadx=10, ipady=5)
+            tk.Button(panel, text="Batch Queue Build",
+                      command=self._wrap_autocollapse(self.on_batch_queue_build),
+                      font=("Helvetica", 20), bg="#444444", fg="white", bd=0,
+                      highlightthickness=0).pack(pady=8, ipadx=10, ipady=5)
             tk.Button(panel, text="One-Click Terrain Tutorial",
                       command=self._wrap_autocollapse(self.on_open_oct_tutorial),
                       font=("Helvetica", 20), bg="#444444", fg="white", bd=0,
@@ -3318,6 +3557,79 @@ class VBS4Panel(tk.Frame):
     def on_open_oct_tutorial(self):
         self.show_terrain_tutorial()
 
+    def on_batch_queue_build(self):
+        enforce_local_fuser_policy()
+        self.batch_queue_build()
+
+    def batch_queue_build(self):
+        """Submit every imagery set under one folder to the Project Queue.
+
+        Each subfolder that holds images becomes its own project under the
+        Projects root.  They go to the queue in one add call, ordered by the
+        optional priority list and then smallest set first, with per-project
+        fuser caps from the cluster's configured fusers.
+        """
+        day_dir = filedialog.askdirectory(
+            title="Select the folder holding one subfolder per imagery set", parent=self
+        )
+        if not day_dir:
+            return
+        projects_root = get_projects_root()
+        if not projects_root or not os.path.isdir(projects_root):
+            projects_root = filedialog.askdirectory(title="Select the Projects root", parent=self)
+            if not projects_root:
+                return
+            set_projects_root(projects_root)
+
+        sets = sorted(
+            e.path for e in os.scandir(day_dir) if e.is_dir() and not e.name.startswith(".")
+        )
+        if not sets:
+            sets = [day_dir]
+        order = simpledialog.askstring(
+            "Batch Priority",
+            "Imagery sets build smallest first.\n"
+            "To build some first, list their folder names (comma separated, "
+            "highest priority first); leave blank for none:",
+            parent=self,
+        )
+        if order is None:
+            return
+        ranked = [n.strip().lower() for n in order.split(",") if n.strip()]
+
+        config_file = config['Fusers'].get('config_path', 'fuser_config.json')
+        cfg_path = os.path.join(BASE_DIR, config_file) if not os.path.isabs(config_file) else config_file
+        decision = get_fuser_autoscaler(_queue_activity).last
+        capacity = cluster_capacity(cfg_path, decision.target if decision else None)
+
+        def _work():
+            specs = []
+            for folder in sets:
+                name = os.path.basename(folder.rstrip("\\/"))
+                rank = ranked.index(name.lower()) if name.lower() in ranked else None
+                specs.append(ProjectSpec(
+                    name,
+                    os.path.join(projects_root, name),
+                    (folder,),
+                    len(ranked) - rank if rank is not None else 0,
+                ))
+            log = lambda msg: post_ui(self.log_message, msg)
+            try:
+                ensure_photomesh_queue_running(log=log)
+                items = submit_queue_batch(specs, capacity, log=log)
+            except Exception as e:
+                post_ui(messagebox.showerror, "Batch Queue Build", str(e), parent=self)
+                return
+            planned = {it.spec.name for it in items}
+            for spec in specs:
+                if spec.name not in planned:
+                    log(f"[Queue] Skipped {spec.name}: no images.")
+            if items:
+                post_ui(self.start_queue_monitor, [it.spec.name for it in items])
+
+        self.log_message(f"[Queue] Planning batch from {day_dir} ({len(sets)} folder(s))...")
+        run_in_thread(_work)
+
     def update_vbs4_button_state(self):
         def _work():
             path = get_vbs4_install_path()
@@ -3349,8 +3661,14 @@ class VBS4Panel(tk.Frame):
 
         run_in_thread(_work)
 
+    def on_config_changed(self, snap):
+        """Re-apply the fuser role only if ``fuser_computer`` actually changed."""
+        if snap.getboolean('Fusers', 'fuser_computer', False) != getattr(self, '_fuser_flag', None):
+            self.update_fuser_state()
+
     def update_fuser_state(self):
         is_fuser = config['Fusers'].getboolean('fuser_computer', fallback=False)
+        self._fuser_flag = is_fuser
         tip = "This pc is being used as a fuser" if is_fuser else "Show or hide terrain tools"
         state = "disabled" if is_fuser else "normal"
         bg = "#888888" if is_fuser else "#444444"
@@ -3371,8 +3689,7 @@ class VBS4Panel(tk.Frame):
         )
         if path and os.path.exists(path):
             config['General'][config_key] = clean_path(path)
-            with open(CONFIG_PATH, 'w') as f:
-                config.write(f)
+            _save_config()
             messagebox.showinfo("Success", f"{app_name} path set to:\n{path}")
             button.config(state="normal", bg="#444444")
             if app_name == "VBS4":
@@ -3399,10 +3716,7 @@ class VBS4Panel(tk.Frame):
 
         # Optional wallpaper
         if os.path.exists(prompt_box_image_path):
-            img = Image.open(prompt_box_image_path).resize(
-                (801, 506), Image.Resampling.LANCZOS
-            )
-            ph = ImageTk.PhotoImage(img)
+            ph = cached_photo(prompt_box_image_path, (801, 506))
             bg_label = tk.Label(folder_window, image=ph, borderwidth=0)
             bg_label.image = ph
             bg_label.place(relwidth=1, relheight=1)
@@ -3541,11 +3855,9 @@ class VBS4Panel(tk.Frame):
 
     def resolve_machine_name(self, ip: str) -> str | None:
         """Try to get the machine name for an IP or prompt the user."""
-        try:
-            host, _, _ = socket.gethostbyaddr(ip)
-            return host.split('.')[0]
-        except Exception:
-            pass
+        name = seed_name_resolver().resolve(ip)
+        if name:
+            return name
 
         return simpledialog.askstring("Machine Name", f"Enter machine name for {ip}:", parent=self)
 
@@ -3556,6 +3868,36 @@ class VBS4Panel(tk.Frame):
             r'C:\\Program Files\\Skyline\\PhotoMesh\\Fuser\\PhotoMeshFuser.exe'
         )
 
+        def load_fuser_config(file_path):
+            full_path = os.path.join(BASE_DIR, file_path) if not os.path.isabs(file_path) else file_path
+            try:
+                with open(full_path, 'r') as f:
+                    data = json.load(f)
+                    return data.get('fusers', {}), data.get('shared_path')
+            except Exception as e:
+                self.log_message(f"Failed to load fuser config: {e}")
+                return {}, None
+
+        fuser_settings, default_path = load_fuser_config(config_file)
+        o = get_offline_cfg()
+        if not o["enabled"]:
+            self._launch_fusers_on(ip_list, fuser_settings, default_path, fuser_exe)
+            return
+
+        # Ask the shared share inventory off the Tk thread; a dead host must
+        # not freeze the UI
+        default_path = resolve_network_working_folder_from_cfg(o)
+
+        def _probed(ok):
+            if ok:
+                self._launch_fusers_on(ip_list, fuser_settings, default_path, fuser_exe)
+            else:
+                messagebox.showerror("Offline Mode", OFFLINE_ACCESS_HINT)
+
+        run_in_thread(lambda: post_ui(_probed, share_available(default_path)))
+
+    def _launch_fusers_on(self, ip_list, fuser_settings, default_path, fuser_exe):
+        """Second half of :meth:`launch_fusers`, once the share is known good."""
         def discover_fusers_from_shared_path(shared_path):
             """Scan *shared_path* for folders named like MACHINE(IP)_Fuser."""
             discovered = {}
@@ -3575,24 +3917,6 @@ class VBS4Panel(tk.Frame):
                         })
             return discovered
 
-        def load_fuser_config(file_path):
-            full_path = os.path.join(BASE_DIR, file_path) if not os.path.isabs(file_path) else file_path
-            try:
-                with open(full_path, 'r') as f:
-                    data = json.load(f)
-                    return data.get('fusers', {}), data.get('shared_path')
-            except Exception as e:
-                self.log_message(f"Failed to load fuser config: {e}")
-                return {}, None
-
-        fuser_settings, default_path = load_fuser_config(config_file)
-        o = get_offline_cfg()
-        if o["enabled"]:
-            default_path = resolve_network_working_folder_from_cfg(o)
-            if not can_access_unc(default_path):
-                messagebox.showerror("Offline Mode", OFFLINE_ACCESS_HINT)
-                return
-
         # Auto-discover fuser directories if a shared path is provided
         discovered = discover_fusers_from_shared_path(default_path)
         for ip, info in discovered.items():
@@ -3602,8 +3926,25 @@ class VBS4Panel(tk.Frame):
         if not ip_list:
             ip_list = list(fuser_settings.keys())
 
+        config_file = config['Fusers'].get('config_path', 'fuser_config.json')
+        nodes = load_node_inventory(
+            os.path.join(BASE_DIR, config_file) if not os.path.isabs(config_file) else config_file
+        )
+
+        # One bounded, parallel lookup instead of a resolver timeout per IP
+        names = seed_name_resolver().resolve_many(ip for ip in ip_list if is_ip(ip))
+        remote_exe = config['Fusers'].get('remote_fuser_exe', fuser_exe)
+        jobs = []
+        # (ip, name, machine) of fusers whose share is looked up per machine
+        unresolved = []
+
         for ip in ip_list:
             fusers = fuser_settings.get(ip, [])
+            if not fusers and default_path:
+                # Known from LAN discovery (or at least a shared path): no prompt
+                machine = (nodes.get(ip) or {}).get('name') or names.get(ip)
+                fusers = [{'name': auto_fuser_name(ip, machine), 'machine_name': machine or ''}]
+                self.log_message(f"No fuser configuration for {ip}; using {fusers[0]['name']}")
             if not fusers:
                 self.log_message(f"No fuser configuration found for {ip}")
                 remote_path, fuser_name = self.prompt_remote_fuser_details(ip)
@@ -3619,28 +3960,43 @@ class VBS4Panel(tk.Frame):
             for fuser in fusers:
                 name = fuser.get('name')
                 path = fuser.get('shared_path') or default_path
-                machine_name = fuser.get('machine_name') or self.resolve_machine_name(ip)
+                machine_name = (
+                    fuser.get('machine_name')
+                    or (nodes.get(ip) or {}).get('name')
+                    or names.get(ip)
+                    or self.resolve_machine_name(ip)
+                )
                 if not path and machine_name:
-                    path = rf'\\{machine_name}\\SharedMeshDrive\\WorkingFuser'
+                    unresolved.append((ip, name, machine_name))
+                    continue
                 if not path:
                     self.log_message(f"No shared path for {name} on {ip}")
                     continue
+                jobs.append(FuserJob(ip, name, path, remote_exe, machine_name or ''))
 
-                bat_path = rf'\\{ip}\\C$\\Program Files\\Skyline\\PhotoMesh\\Fuser\\{name}.bat'
-                if os.path.isfile(bat_path):
-                    cmd = f'start "" "{bat_path}"'
-                else:
-                    cmd = f'start "" "{fuser_exe}" "{name}" "{path}" 0 true'
+        def _report(results):
+            for line in format_results(results).splitlines():
+                self.log_message(line)
+            # Launch local fusers on this machine
+            self.launch_local_fuser(default_path)
 
-                try:
-                    subprocess.run(cmd, shell=True, check=True)
-                    host = machine_name or ip
-                    self.log_message(f"Launched {name} on {host} at {path}")
-                except subprocess.CalledProcessError as e:
-                    self.log_message(f"Failed to launch {name} on {ip}: {e}")
-
-        # Launch local fusers on this machine
-        self.launch_local_fuser(default_path)
+        def _work():
+            if unresolved:
+                # One parallel, cached inventory lookup for every machine
+                shares = probe_mesh_shares({m for _ip, _n, m in unresolved})
+                for ip, name, machine in unresolved:
+                    best = shares.get(machine)
+                    root = best[1] if best else rf'\\{machine}\SharedMeshDrive'
+                    jobs.append(FuserJob(ip, name, os.path.join(root, 'WorkingFuser'), remote_exe, machine))
+            # Every node's agent is asked at once; total time ~ slowest node
+            post_ui(_report, fan_out(jobs))
+
+        if jobs or unresolved:
+            nodes_n = len({j.ip for j in jobs} | {ip for ip, _n, _m in unresolved})
+            self.log_message(f"Starting {len(jobs) + len(unresolved)} fuser(s) on {nodes_n} node(s)…")
+            run_in_thread(_work)
+        else:
+            self.launch_local_fuser(default_path)
 
     def launch_local_fuser(self, shared_path=None):
         config_file = config['Fusers'].get('config_path', 'fuser_config.json')
@@ -3662,28 +4018,37 @@ class VBS4Panel(tk.Frame):
         o = get_offline_cfg()
         if o["enabled"]:
             default_path = resolve_network_working_folder_from_cfg(o)
-            if not can_access_unc(default_path):
-                messagebox.showerror("Offline Mode", OFFLINE_ACCESS_HINT)
-                return
-        else:
-            default_path = shared_path
-            if default_path is None:
-                default_path = load_fuser_config(config_file)
 
-        fuser_path = default_path or working_fuser_unc()
+            def _probed(ok):
+                if ok:
+                    self._start_local_fusers(default_path, fuser_exe)
+                else:
+                    messagebox.showerror("Offline Mode", OFFLINE_ACCESS_HINT)
+
+            run_in_thread(lambda: post_ui(_probed, share_available(default_path)))
+            return
+
+        default_path = shared_path
+        if default_path is None:
+            default_path = load_fuser_config(config_file)
+        self._start_local_fusers(default_path or working_fuser_unc(), fuser_exe)
 
+    def _start_local_fusers(self, fuser_path, fuser_exe):
+        registry = get_fuser_registry()
+        running = {rec.name.lower() for rec in registry.reconcile()}
         for idx in range(1, 4):
             name = f"LocalFuser{idx}"
+            if name.lower() in running:
+                self.log_message(f"{name} already running.")
+                continue
             bat = rf'C:\\Program Files\\Skyline\\PhotoMesh\\Fuser\\{name}.bat'
-            if os.path.isfile(bat):
-                cmd = f'start "" "{bat}"'
-            else:
-                cmd = f'start "" "{fuser_exe}" "{name}" "{fuser_path}" 0 true'
+            argv = [bat] if os.path.isfile(bat) else [fuser_exe, name, fuser_path, "0", "true"]
 
             try:
-                subprocess.run(cmd, shell=True, check=True)
-                self.log_message(f"Launched {name}.")
-            except subprocess.CalledProcessError as e:
+                rec = registry.spawn(name, argv, cwd=os.path.dirname(fuser_exe) or None)
+                get_fuser_sampler().track(rec.pid)
+                self.log_message(f"Launched {name} (PID {rec.pid}).")
+            except OSError as e:
                 self.log_message(f"Failed to start {name}: {e}")
 
     def create_mesh(self):
@@ -3766,21 +4131,45 @@ class VBS4Panel(tk.Frame):
             except Exception as e:
                 messagebox.showerror("Error", f"Could not launch TerraExplorer:\n{e}", parent=self)
 
+        cached = config['General'].get('terra_explorer_path', '').strip()
         if os.path.exists(terra_explorer_path):
             start_explorer(terra_explorer_path)
+        elif cached and os.path.isfile(cached):
+            start_explorer(cached)
         else:
+            cancel = threading.Event()
+            working = tk.Toplevel(self)
+            working.title("Searching…")
+            status = tk.Label(working, text="Looking for TerraExplorer…", padx=20, pady=10,
+                              width=60, anchor="w")
+            status.pack()
+            tk.Button(working, text="Cancel", command=cancel.set).pack(pady=(0, 10))
+            working.protocol("WM_DELETE_WINDOW", cancel.set)
+
+            def _progress(scanned, current):
+                text = f"Scanned {scanned} folders…"
+                if current:
+                    text += f"\n{current[-70:]}"
+                post_ui(lambda: working.winfo_exists() and status.config(text=text))
+
             def _search_and_launch():
-                found_path = find_terra_explorer()
-                if found_path:
-                    post_ui(start_explorer, found_path)
-                else:
-                    post_ui(
-                        lambda: messagebox.showwarning(
+                found_path = find_terra_explorer(progress=_progress, cancel_event=cancel)
+
+                def _done():
+                    if working.winfo_exists():
+                        working.destroy()
+                    if found_path:
+                        start_explorer(found_path)
+                    elif cancel.is_set():
+                        self.log_message("TerraExplorer search cancelled.")
+                    else:
+                        messagebox.showwarning(
                             "TerraExplorer Not Found",
                             "TerraExplorer is not installed or could not be found.",
                             parent=self,
                         )
-                    )
+
+                post_ui(_done)
 
             run_in_thread(_search_and_launch)
 
@@ -3958,45 +4347,123 @@ class VBS4Panel(tk.Frame):
         self.project_root = project_path
         self.last_build_dir = project_path  # used later only as a hint/path; no checks
 
-        # Optional log/work paths only if they exist (don't require them)
+        # Log/work paths; they usually appear only once the build starts
         _out = os.path.join(project_path, "Build_1", "out")
-        self.project_log_folder = os.path.join(_out, "Log") if os.path.isdir(os.path.join(_out, "Log")) else None
-        self.work_folder = os.path.join(_out, "Work") if os.path.isdir(os.path.join(_out, "Work")) else None
+        self.project_log_folder = os.path.join(_out, "Log")
+        self.work_folder = os.path.join(_out, "Work")
         # Reset progress indicators
         self.progress_var.set(0)
         self.progress_label.config(text="0%")
-        if self.progress_job:
-            self.after_cancel(self.progress_job)
-        self.progress_job = self.after(2000, self.update_render_progress)
-
-    def update_render_progress(self):
+        self.eta_label.config(text="")
+        self._render_stages = []
+        if self.progress_follower:
+            self.progress_follower.stop()
+        # Every active log/fuser output is tailed off the Tk thread and
+        # folded into one percentage + ETA; only changes come back
+        self.progress_follower = ProgressFollower(
+            self._render_log_paths,
+            lambda snap: post_ui(self._on_render_progress, snap),
+        ).start()
+        # First OBJ / finished output arrive as filesystem events.  The
+        # project folder may hold a previous run's output, which must not
+        # count as this build's.
+        if self.output_watcher:
+            self.output_watcher.stop()
+        self.output_watcher = BuildOutputWatcher(
+            project_path,
+            on_first_obj=lambda d: post_ui(self._on_first_obj, d),
+            on_complete=lambda d: post_ui(self._on_output_complete, d),
+            since=time.time(),
+        ).start()
+        self.start_queue_monitor()
+
+    def start_queue_monitor(self, projects=None):
+        """Follow the Project Queue event stream and drive the progress bar.
+
+        *projects* (a batch's project names) keeps the monitor running until
+        every one of them has finished, not just the first.
+        """
+        if self.queue_monitor is not None:
+            self.queue_monitor.stop()
+        self._queue_progress = False
+        self._queue_stage = ""
+        self._queue_pending = {p.lower() for p in projects} if projects else None
+        self.queue_monitor = make_queue_monitor(
+            lambda update: post_ui(self._on_queue_update, update), projects=projects
+        ).start(timeout=120 * 60 * max(1, len(projects or ())))
+
+    def _on_queue_update(self, update):
+        if update.kind == "connection":
+            self.log_message(f"[Queue] {update.message}")
+            return
+        if self.output_watcher:
+            # The queue reports this build; its terminal event, not a pause
+            # in file writes, decides when the output is complete
+            self.output_watcher.defer_completion()
+        if update.stage and update.stage != self._queue_stage:
+            self._queue_stage = update.stage
+            self.log_message(f"[Queue] Stage: {update.stage}")
+        if update.percent is not None:
+            # Queue progress is authoritative; log scraping stays the fallback
+            self._queue_progress = True
+            self.set_progress(update.percent)
+        if update.finished:
+            self.log_message(f"[Queue] Build {update.state}: {update.describe()}")
+            if self._queue_pending is not None:
+                self._queue_pending.discard(update.project.lower())
+                if self._queue_pending:
+                    self.log_message(f"[Queue] {len(self._queue_pending)} batch project(s) still to build")
+                    return
+            self.queue_monitor = None
+            # Per-endpoint latency/retry counts of this run's REST calls
+            summary = QUEUE_CLIENT.summary()
+            logging.info("Project Queue API:\n%s", summary)
+            self.log_message("[Queue] API: " + summary.replace("\n", "; "))
+            if self._queue_progress and self.progress_follower:
+                self.progress_follower.stop()
+                self.progress_follower = None
+            watcher = self.output_watcher
+            if watcher and update.failed:
+                watcher.stop()
+                self.output_watcher = None
+            elif watcher and not watcher.complete():
+                # No marker yet: fall back to marker + quiet period
+                watcher.settle = SETTLE_SECS
+
+    def _render_log_paths(self) -> list:
+        """Candidate render logs (runs on the watcher thread)."""
         paths = []
         if self.project_log_folder and os.path.isdir(self.project_log_folder):
             paths += glob.glob(os.path.join(self.project_log_folder, "Out*.log"))
             paths += glob.glob(os.path.join(self.project_log_folder, "Run*.log"))
         if self.work_folder and os.path.isdir(self.work_folder):
             paths += glob.glob(os.path.join(self.work_folder, "*.out"))
-
-        latest = max(paths, key=os.path.getmtime) if paths else None
-        percent = None
-        if latest:
-            try:
-                with open(latest, "r", errors="ignore") as f:
-                    for line in reversed(f.readlines()):
-                        percent = extract_progress(line)
-                        if percent is not None:
-                            break
-            except Exception:
-                pass
-
-        if percent is not None:
-            self.progress_var.set(percent)
-            self.progress_label.config(text=f"{percent}%")
-            if percent >= 100:
-                self.progress_job = None
-                return
-
-        self.progress_job = self.after(2000, self.update_render_progress)
+        return paths
+
+    def _on_first_obj(self, obj_dir: str):
+        self.log_message(f"[watch] First OBJ written: {obj_dir}")
+
+    def _on_output_complete(self, output_dir: str):
+        """PhotoMesh output finished: hand the build to post-processing."""
+        self.output_watcher = None
+        self.log_message(f"[watch] Output complete: {output_dir}")
+        if self.progress_follower:
+            self.progress_follower.stop()
+            self.progress_follower = None
+        self.set_progress(100)
+        self.eta_label.config(text="done")
+        self.post_process_last_build(output_dir)
+
+    def _on_render_progress(self, snap):
+        if not self._queue_progress:
+            self.set_progress(snap.percent)
+        self.eta_label.config(text=snap.eta_text())
+        # The follower runs until the output watcher or the queue reports
+        # completion; a finished stage is not a finished build
+        for name in list(snap.stages)[len(self._render_stages):]:
+            done, total = snap.stages[name]
+            self.log_message(f"[Progress] {name}: {done}/{total} tiles")
+        self._render_stages = list(snap.stages)
 
 class BVIPanel(tk.Frame):
     def __init__(self, parent, controller):
@@ -4054,8 +4521,7 @@ class BVIPanel(tk.Frame):
         )
         if path and os.path.exists(path):
             config['General'][config_key] = clean_path(path)
-            with open(CONFIG_PATH, 'w') as f:
-                config.write(f)
+            _save_config()
             messagebox.showinfo("Success", f"{app_name} path set to:\n{path}")
             button.config(state="normal", bg="#444444")
             if app_name == "VBS4":
@@ -4101,16 +4567,16 @@ class SettingsPanel(tk.Frame):
 
         def _on_fuser_toggle():
             config["Fusers"]["fuser_computer"] = str(self.fuser_var.get())
-            with open(CONFIG_PATH, "w") as f:
-                config.write(f)
+            _save_config()
             if self.fuser_var.get():
                 # Ensure Fusers host matches the single Host PC Name
                 config["Fusers"]["working_folder_host"] = get_host().strip()
-                with open(CONFIG_PATH, "w") as f:
-                    config.write(f)
+                _save_config()
             update_fuser_shared_path()
             enforce_local_fuser_policy()
-            self.controller.panels["VBS4"].update_fuser_state()
+            pnl = self.controller.panels.peek("VBS4")
+            if pnl:
+                pnl.update_fuser_state()
 
         toggle_specs = [
             ("Fullscreen Mode", self.fullscreen_var, self._on_fullscreen_toggle),
@@ -4142,6 +4608,27 @@ class SettingsPanel(tk.Frame):
             )
             chk.grid(row=r, column=c, padx=6, pady=6, sticky="ew")
 
+        count_row = tk.Frame(toggles, bg="black")
+        count_row.grid(row=(len(toggle_specs) + 1) // 2, column=0, columnspan=2, sticky="w", padx=6, pady=6)
+        tk.Label(count_row, text="Local Fusers:", font=("Helvetica", 14), bg="black", fg="white").pack(side="left")
+        self.fuser_count_var = tk.StringVar(
+            value=config["Fusers"].get("fuser_count_override", "").strip() or "Auto"
+        )
+        count_box = tk.Spinbox(
+            count_row,
+            values=("Auto",) + tuple(str(n) for n in range(0, 9)),
+            textvariable=self.fuser_count_var,
+            width=5,
+            font=("Helvetica", 14),
+            command=self._on_fuser_count_change,
+        )
+        count_box.pack(side="left", padx=8)
+        count_box.bind("<Return>", lambda e: self._on_fuser_count_change())
+        count_box.bind("<FocusOut>", lambda e: self._on_fuser_count_change())
+        self.fuser_target_label = tk.Label(count_row, text="", font=("Helvetica", 12), bg="black", fg="#aaaaaa")
+        self.fuser_target_label.pack(side="left", padx=8)
+        self._refresh_fuser_target()
+
         # --- Network Host -----------------------------------------------
         net_frame = tk.Frame(self, bg="black")
         net_frame.grid(row=2, column=0, sticky="ew", padx=10, pady=(0, 6))
@@ -4291,6 +4778,7 @@ class SettingsPanel(tk.Frame):
             selectcolor="black",
         ).pack(side="left")
         tk.Button(row7, text="Auto-Find Share", bg="#444", fg="white", command=self._auto_find_share).pack(side="left", padx=8)
+        tk.Button(row7, text="Discover Fuser Nodes", bg="#444", fg="white", command=self._discover_fuser_nodes).pack(side="left")
 
         row8 = tk.Frame(grp, bg="black")
         row8.pack(fill="x", pady=6)
@@ -4454,8 +4942,7 @@ class SettingsPanel(tk.Frame):
         sd["drive_letter"] = self.shared_letter.get().strip() or "M:"
         sd["auto_map_on_save"] = str(bool(self.shared_auto_map.get()))
 
-        with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-            config.write(f)
+        _save_config()
 
         new_share = o["share_name"]
         if new_share and new_share.lower() != old_share.lower():
@@ -4474,8 +4961,7 @@ class SettingsPanel(tk.Frame):
                         def _apply_map():
                             self.shared_mode.set("DRIVE")
                             sd["preferred_mode"] = "DRIVE"
-                            with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-                                config.write(f)
+                            _save_config()
 
                         post_ui(_apply_map)
 
@@ -4500,6 +4986,8 @@ class SettingsPanel(tk.Frame):
         tk.Label(working, text="Working…", padx=20, pady=20).pack()
 
         def _work():
+            # An explicit test should not be answered from the cache
+            get_unc_prober().invalidate(path)
             ok = can_access_unc(path)
 
             def _done():
@@ -4524,30 +5012,111 @@ class SettingsPanel(tk.Frame):
 
     def _open_working_folder(self):
         path = resolve_shared_access_path()
-        if can_access_unc(path):
-            open_in_explorer(path)
-        else:
-            messagebox.showerror("Open Working Folder", f"Cannot access:\n{path}\nUse Test Access to diagnose.")
+
+        def _probed(ok):
+            if ok:
+                open_in_explorer(path)
+            else:
+                messagebox.showerror("Open Working Folder", f"Cannot access:\n{path}\nUse Test Access to diagnose.")
+
+        get_unc_prober().probe(path, lambda ok: post_ui(_probed, ok))
+
+    def _on_fuser_count_change(self):
+        raw = self.fuser_count_var.get().strip()
+        value = "" if parse_override(raw) is None else str(parse_override(raw))
+        self.fuser_count_var.set(value or "Auto")
+        if config["Fusers"].get("fuser_count_override", "") == value:
+            return
+        config["Fusers"]["fuser_count_override"] = value
+        _save_config()
+        # Back to "Auto": start from the computed target, not the old override
+        get_fuser_autoscaler(_queue_activity).reset()
+        enforce_local_fuser_policy()
+
+    def _refresh_fuser_target(self):
+        decision = get_fuser_autoscaler(_queue_activity).last
+        text = f"Target: {decision.describe()}" if decision else "Target: evaluating…"
+        try:
+            self.fuser_target_label.config(text=text)
+        except tk.TclError:
+            return
+        self.after(FUSER_TELEMETRY_REFRESH_MS, self._refresh_fuser_target)
 
     def _auto_find_share(self):
         host = get_host().strip()
-        res = probe_best_mesh_share(host)
-        if not res:
-            messagebox.showerror("Auto-Find Share", f"No share found on {host}")
-            return
-        share, unc = res
-        old = self.off_share_name.get().strip()
-        self.off_share_name.set(share)
-        if "Offline" not in config:
-            config["Offline"] = {}
-        config["Offline"]["share_name"] = share
-        with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-            config.write(f)
-        if share.lower() != old.lower():
-            propagate_share_rename_in_config(old, share)
-        update_fuser_shared_path()
-        logging.info(f"Auto-Find Share -> {unc}")
-        messagebox.showinfo("Auto-Find Share", f"Using share:\n{unc}")
+        working = tk.Toplevel(self)
+        working.title("Working…")
+        tk.Label(working, text=f"Probing shares on {host}…", padx=20, pady=20).pack()
+
+        def _apply(res):
+            working.destroy()
+            if not res:
+                messagebox.showerror("Auto-Find Share", f"No share found on {host}")
+                return
+            share, unc = res
+            old = self.off_share_name.get().strip()
+            self.off_share_name.set(share)
+            if "Offline" not in config:
+                config["Offline"] = {}
+            config["Offline"]["share_name"] = share
+            _save_config()
+            if share.lower() != old.lower():
+                propagate_share_rename_in_config(old, share)
+            update_fuser_shared_path()
+            logging.info(f"Auto-Find Share -> {unc}")
+            messagebox.showinfo("Auto-Find Share", f"Using share:\n{unc}")
+
+        def _work():
+            try:
+                res = probe_best_mesh_share(host)
+            except Exception:
+                logging.exception("Auto-Find Share failed")
+                res = None
+            post_ui(_apply, res)
+
+        run_in_thread(_work)
+
+    def _discover_fuser_nodes(self):
+        subnet = subnet_for(get_offline_cfg()["host_ip"])
+        working = tk.Toplevel(self)
+        working.title("Working…")
+        tk.Label(working, text=f"Scanning {subnet}…", padx=20, pady=20).pack()
+
+        def _work():
+            try:
+                nodes = discover(subnet)
+                config_file = config['Fusers'].get('config_path', 'fuser_config.json')
+                cfg_path = os.path.join(BASE_DIR, config_file) if not os.path.isabs(config_file) else config_file
+                added = merge_into_fuser_config(nodes, cfg_path)
+                get_name_resolver().seed_many({n.ip: n.name for n in nodes if n.name})
+            except Exception as exc:
+                logging.exception("Fuser node discovery failed")
+                # exc is unbound once the except block ends; _err runs later
+                msg = str(exc)
+
+                def _err():
+                    working.destroy()
+                    messagebox.showerror("Discover Fuser Nodes", msg)
+
+                post_ui(_err)
+                return
+
+            def _done():
+                working.destroy()
+                lines = [
+                    f"{n.ip}  {n.label}" + ("  (toolkit)" if n.agent else "") + ("  (this PC)" if n.is_local else "")
+                    for n in nodes
+                ]
+                logging.info("Discovered %d node(s) on %s; added %s", len(nodes), subnet, added)
+                messagebox.showinfo(
+                    "Discover Fuser Nodes",
+                    f"{len(nodes)} node(s) on {subnet}, {len(added)} new fuser entr"
+                    f"{'y' if len(added) == 1 else 'ies'}.\n\n" + "\n".join(lines[:30]),
+                )
+
+            post_ui(_done)
+
+        run_in_thread(_work)
 
     def _map_drive(self):
         o = get_offline_cfg()
@@ -4558,8 +5127,7 @@ class SettingsPanel(tk.Frame):
             sd = config.setdefault("SharedDrive", {})
             sd["preferred_mode"] = "DRIVE"
             sd["drive_letter"] = letter
-            with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-                config.write(f)
+            _save_config()
             update_fuser_shared_path()
             logging.info(f"Mapped {letter} to {unc}")
             messagebox.showinfo("Map Drive", f"Mapped {letter} to {unc}")
@@ -4571,8 +5139,7 @@ class SettingsPanel(tk.Frame):
         unmap_drive(letter)
         sd = config.setdefault("SharedDrive", {})
         sd["preferred_mode"] = "UNC"
-        with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-            config.write(f)
+        _save_config()
         self.shared_mode.set("UNC")
         logging.info(f"Unmapped {letter}")
         messagebox.showinfo("Map Drive", f"Unmapped {letter}")
@@ -4583,11 +5150,10 @@ class SettingsPanel(tk.Frame):
             return
         set_host(h)  # writes Offline.host_name, Fusers.working_folder_host, Network.host
         config['Fusers']['working_folder_host'] = h.strip()
-        with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-            config.write(f)
+        _save_config()
         enforce_local_fuser_policy()  # re-apply counts in case this box is the Host
         apply_offline_settings()  # propagate host change
-        pnl = self.controller.panels.get('VBS4')
+        pnl = self.controller.panels.peek('VBS4')
         if pnl and hasattr(pnl, "log_message"):
             pnl.log_message(f"Host set to: {h}")
         if pnl and hasattr(pnl, "_update_rm_status"):
@@ -4616,7 +5182,7 @@ class SettingsPanel(tk.Frame):
             )
             return
         set_rm_local_root(path)
-        pnl = self.controller.panels.get('VBS4')
+        pnl = self.controller.panels.peek('VBS4')
         if pnl and hasattr(pnl, '_update_rm_status'):
             pnl._update_rm_status()
         messagebox.showinfo(
@@ -4662,10 +5228,11 @@ class SettingsPanel(tk.Frame):
      if path and os.path.exists(path):
         path = os.path.normpath(path)
         config['General']['vbs4_path'] = path
-        with open(CONFIG_PATH, 'w') as f:
-            config.write(f)
+        _save_config()
         self.lbl_vbs4.config(text=path)
-        self.controller.panels['VBS4'].update_vbs4_button_state()
+        pnl = self.controller.panels.peek('VBS4')
+        if pnl:
+            pnl.update_vbs4_button_state()
 
     def _on_set_vbs4_setup(self):
      path = filedialog.askopenfilename(
@@ -4675,10 +5242,11 @@ class SettingsPanel(tk.Frame):
      if path and os.path.exists(path):
         path = os.path.normpath(path)
         config['General']['vbs4_setup_path'] = path
-        with open(CONFIG_PATH, 'w') as f:
-            config.write(f)
+        _save_config()
         self.lbl_vbs4_setup.config(text=path)
-        self.controller.panels['VBS4'].update_vbs4_launcher_button_state()
+        pnl = self.controller.panels.peek('VBS4')
+        if pnl:
+            pnl.update_vbs4_launcher_button_state()
 
     def _on_set_blueig(self):
         set_blueig_install_path()
@@ -4699,8 +5267,7 @@ class SettingsPanel(tk.Frame):
         )
         if path and os.path.exists(path):
             config['General']['vbs_license_manager_path'] = path
-            with open(CONFIG_PATH, 'w') as f:
-                config.write(f)
+            _save_config()
             self.lbl_vbs_license.config(text=path)
             messagebox.showinfo("Settings", f"VBS License Manager path set to:\n{path}")
         else:
@@ -4898,8 +5465,7 @@ class CreditsPanel(tk.Frame):
             .pack(pady=(0, 20))
 
         if os.path.exists(logo_STE_path):
-            img = Image.open(logo_STE_path).resize((90, 90), Image.Resampling.LANCZOS)
-            ph = ImageTk.PhotoImage(img)
+            ph = cached_photo(logo_STE_path, (90, 90))
             tk.Label(card, image=ph, bg="#222222", borderwidth=0, highlightthickness=0)\
                 .pack(pady=(0, 20))
             self.logo_image = ph
@@ -5025,38 +5591,37 @@ class Tooltip:
             self.tw.destroy()
             self.tw = None
 
-def run_command_server(host: str = "", port: int = 9100) -> None:
-    """Listen for incoming command strings and execute them."""
-    srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-    srv.bind((host, port))
-    srv.listen(1)
-    while True:
-        conn, _ = srv.accept()
-        with conn:
-            data = conn.recv(4096).decode().strip()
-            if not data:
-                continue
-            try:
-                args = shlex.split(data)
-                subprocess.Popen(args, creationflags=subprocess.CREATE_NO_WINDOW)
-                conn.sendall(b"OK")
-            except Exception as e:
-                conn.sendall(f"ERROR: {e}".encode())
+_command_server: CommandServer | None = None
 
-def start_command_server(port: int = 9100) -> None:
-    thread = threading.Thread(target=run_command_server, args=("", port), daemon=True)
-    thread.start()
+def run_command_server(host: str = "", port: int = DEFAULT_COMMAND_PORT) -> None:
+    """Serve command requests on *host*:*port* until the process exits."""
+    asyncio.run(CommandServer(host, port).serve())
+
+def start_command_server(port: int = DEFAULT_COMMAND_PORT) -> None:
+    global _command_server
+    try:
+        _command_server = CommandServer("", port).start()
+    except Exception as e:
+        logging.error("Failed to start command server: %s", e)
 
 if __name__ == "__main__":
-    if not acquire_singleton():
-        print("STE Toolkit is already running.")
-        sys.exit(0)
-    start_command_server()
-    app = MainApp()
-    app.after(50, apply_minimal_wizard_defaults)
+    with _prof.span("acquire_singleton"):
+        if not acquire_singleton():
+            print("STE Toolkit is already running.")
+            sys.exit(0)
+    with _prof.span("start_command_server"):
+        start_command_server()
+    with _prof.span("MainApp.__init__", "ui"):
+        app = MainApp()
+    app.after(50, _prof.wrap(apply_minimal_wizard_defaults))
     if config['Fusers'].getboolean('fuser_computer', False):
-        app.after(50, update_fuser_shared_path)
-    app.after(50, app.panels['VBS4'].update_fuser_state)
-    app.after(50, enforce_local_fuser_policy)
+        app.after(50, _prof.wrap(update_fuser_shared_path))
+    # VBS4Panel applies the fuser state itself when it is (lazily) built
+    vbs4_panel = app.panels.peek('VBS4')
+    if vbs4_panel:
+        app.after(50, _prof.wrap(vbs4_panel.update_fuser_state))
+    app.after(50, _prof.wrap(enforce_local_fuser_policy))
+    if _prof.enabled:
+        # Let scheduled tasks and the idle prefetch run before reporting
+        app.after(PROFILE_SETTLE_MS, lambda: app.after_idle(_prof.finish))
     app.mainloop()
@@ -0,0 +1,128 @@
+# =============================================================================
+# Project: VBS4Project
+# File: command_bench.py
+# Purpose: Load benchmark for the command server (local or against a kit PC)
+# =============================================================================
+# Table of Contents
+#   1) Imports
+#   2) Benchmark
+#   3) CLI
+# =============================================================================
+#
+# Usage:
+#   python command_bench.py                       # in-process server, fake spawns
+#   python command_bench.py --clients 32 --requests 200 --batch 4
+#   python command_bench.py --host 192.168.50.11 --op ps
+
+# region Imports
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+
+from command_client import CommandClient
+from command_server import CommandServer, ProcessTable
+# endregion
+
+# region Benchmark
+class _FakeProc:
+    """Stand-in for ``Popen`` so the benchmark measures the server, not spawning."""
+
+    _pids = iter(range(100000, 10**9))
+
+    def __init__(self, argv: list[str]) -> None:
+        self.pid = next(self._pids)
+
+    def poll(self) -> int:
+        return 0
+
+    def wait(self, timeout=None) -> int:
+        return 0
+
+
+def run_bench(host: str, port: int, clients: int, requests: int, batch: int, op: str) -> dict:
+    latencies: list[float] = []
+    errors: list[str] = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(clients)
+
+    def _client() -> None:
+        local: list[float] = []
+        with CommandClient(host, port, timeout=10.0) as client:
+            barrier.wait()
+            for _ in range(requests):
+                t0 = time.perf_counter()
+                try:
+                    if op == "run":
+                        client.run(*(["bench.exe", str(i)] for i in range(batch)))
+                    else:
+                        client.request(op)
+                except Exception as exc:
+                    with lock:
+                        errors.append(str(exc))
+                    continue
+                local.append(time.perf_counter() - t0)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=_client, daemon=True) for _ in range(clients)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    latencies.sort()
+    pct = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1e3 if latencies else 0.0
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "seconds": elapsed,
+        "req_per_s": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "mean_ms": statistics.fmean(latencies) * 1e3 if latencies else 0.0,
+    }
+# endregion
+
+# region CLI
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Command server load benchmark")
+    ap.add_argument("--host", help="benchmark a running server instead of an in-process one")
+    ap.add_argument("--port", type=int, default=0)
+    ap.add_argument("--clients", type=int, default=16)
+    ap.add_argument("--requests", type=int, default=100, help="requests per client")
+    ap.add_argument("--batch", type=int, default=4, help="commands per run request")
+    ap.add_argument("--op", choices=("run", "ps", "ping"), default="run")
+    args = ap.parse_args(argv)
+
+    server = None
+    host, port = args.host, args.port
+    if not host:
+        server = CommandServer("127.0.0.1", args.port, table=ProcessTable(spawn=_FakeProc)).start()
+        host, port = "127.0.0.1", server.port
+    elif not port:
+        port = 9100
+
+    res = run_bench(host, port, args.clients, args.requests, args.batch, args.op)
+    print(
+        f"{args.op}: {res['requests']} requests ({res['errors']} errors) from {args.clients} clients "
+        f"in {res['seconds']:.2f} s -> {res['req_per_s']:.0f} req/s; "
+        f"p50 {res['p50_ms']:.2f} ms  p95 {res['p95_ms']:.2f} ms  p99 {res['p99_ms']:.2f} ms"
+    )
+    if server is not None:
+        server.stop()
+    return 0 if not res["errors"] else 1
+# endregion
+
+__all__ = [
+    "run_bench",
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
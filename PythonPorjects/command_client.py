@@ -0,0 +1,128 @@
+# =============================================================================
+# Project: VBS4Project
+# File: command_client.py
+# Purpose: Client for the toolkit command server (see command_server.py)
+# =============================================================================
+# Table of Contents
+#   1) Imports
+#   2) Errors
+#   3) Client
+#   4) Legacy helper
+# =============================================================================
+
+# region Imports
+from __future__ import annotations
+
+import itertools
+import json
+import socket
+import threading
+
+from command_server import DEFAULT_PORT
+# endregion
+
+# region Errors
+class CommandError(RuntimeError):
+    """The server rejected a request (``"ok": false``)."""
+# endregion
+
+# region Client
+class CommandClient:
+    """Persistent NDJSON connection to one kit PC's command server.
+
+    Thread-safe: requests on one client are serialized.  Use one client per
+    host; the server handles many clients concurrently.
+    """
+
+    def __init__(self, host: str, port: int = DEFAULT_PORT, timeout: float = 5.0) -> None:
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._sock: socket.socket | None = None
+        self._file = None
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _connect(self) -> None:
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._file = self._sock.makefile("rb")
+
+    def close(self) -> None:
+        with self._lock:
+            self._close()
+
+    def _close(self) -> None:
+        for obj in (self._file, self._sock):
+            try:
+                if obj is not None:
+                    obj.close()
+            except OSError:
+                pass
+        self._sock = self._file = None
+
+    def __enter__(self) -> "CommandClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def request(self, op: str, io_timeout: float | None = None, **fields) -> dict:
+        """Send one request and return the reply (raises :class:`CommandError`)."""
+        msg = {"id": next(self._ids), "op": op, **fields}
+        data = json.dumps(msg).encode("utf-8") + b"\n"
+        with self._lock:
+            while True:
+                reused = self._sock is not None
+                try:
+                    if not reused:
+                        self._connect()
+                    self._sock.settimeout(self.timeout if io_timeout is None else io_timeout)
+                    self._sock.sendall(data)
+                    line = self._file.readline()
+                    if not line:
+                        raise ConnectionError("connection closed by server")
+                    break
+                except OSError as exc:
+                    self._close()
+                    # A kept-alive connection the server dropped gets one
+                    # reconnect; a timeout may mean the request ran, so no retry
+                    if not reused or isinstance(exc, socket.timeout):
+                        raise
+        reply = json.loads(line)
+        if not reply.get("ok"):
+            raise CommandError(reply.get("error", "unknown error"))
+        return reply
+
+    def run(self, *commands, wait: bool = False, timeout: float = 30.0) -> list[dict]:
+        """Start *commands* (strings or argv lists) as one batch.
+
+        Returns ``[{"pid", "returncode", "error"}, ...]`` in order; with
+        *wait* the server waits (up to *timeout*) and fills in exit codes.
+        """
+        io_timeout = (timeout + self.timeout) if wait else None
+        reply = self.request("run", io_timeout, commands=list(commands), wait=wait, timeout=timeout)
+        return reply["results"]
+
+    def ps(self) -> list[dict]:
+        return self.request("ps")["processes"]
+
+    def wait(self, pid: int, timeout: float = 30.0) -> dict:
+        return self.request("wait", timeout + self.timeout, pid=pid, timeout=timeout)["process"]
+
+    def ping(self) -> float:
+        return self.request("ping")["time"]
+# endregion
+
+# region Legacy helper
+def send_legacy(host: str, command: str, port: int = DEFAULT_PORT, timeout: float = 5.0) -> str:
+    """Send one plain-text command the way older toolkit builds did."""
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        sock.sendall(command.encode())
+        return sock.recv(4096).decode(errors="replace")
+# endregion
+
+__all__ = [
+    "CommandClient",
+    "CommandError",
+    "send_legacy",
+]
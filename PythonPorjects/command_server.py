@@ -0,0 +1,334 @@
+# =============================================================================
+# Project: VBS4Project
+# File: command_server.py
+# Purpose: Concurrent asyncio command server (NDJSON framing, batches, ps)
+# =============================================================================
+# Table of Contents
+#   1) Imports
+#   2) Constants & Configuration
+#   3) Process table
+#   4) Server
+# =============================================================================
+#
+# Protocol (one JSON object per line, replies in request order):
+#   -> {"id": 1, "op": "run", "commands": [["app.exe", "arg"], "other.exe --x"],
+#       "wait": false, "timeout": 30}
+#   <- {"id": 1, "ok": true, "results": [{"pid": 4242, "returncode": null}, ...]}
+#   A command may also be {"argv": [...], "prefer": [...]}; "prefer" runs when
+#   its program exists on the serving machine.
+#   -> {"id": 2, "op": "ps"}            <- {"id": 2, "ok": true, "processes": [...]}
+#   -> {"id": 3, "op": "wait", "pid": 4242, "timeout": 10}
+#   -> {"id": 4, "op": "ping"}
+# A connection whose first bytes are not "{" is served with the legacy
+# protocol: the raw text is one shlex-split command, answered "OK"/"ERROR: ..".
+
+# region Imports
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+# endregion
+
+# region Constants & Configuration
+DEFAULT_PORT = 9100
+MAX_LINE = 1024 * 1024
+# Commands per request; larger batches are rejected rather than truncated
+MAX_BATCH = 256
+# Finished processes kept for "ps" / "wait"
+MAX_FINISHED = 256
+REAP_INTERVAL = 0.5
+# Threads serving "wait"; extra waits queue instead of starving Popen calls
+MAX_WAITERS = 8
+LEGACY_READ = 4096
+
+_NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+# endregion
+
+# region Process table
+def _default_spawn(argv: list[str]) -> subprocess.Popen:
+    return subprocess.Popen(argv, creationflags=_NO_WINDOW)
+
+
+def _argv(command) -> list[str]:
+    if isinstance(command, dict):
+        # {"argv": [...], "prefer": [...]}: run "prefer" if its program exists
+        # on this machine (e.g. a per-fuser .bat), otherwise "argv"
+        prefer = command.get("prefer")
+        if prefer and os.path.isfile(_argv(prefer)[0]):
+            return _argv(prefer)
+        return _argv(command.get("argv"))
+    if isinstance(command, str):
+        argv = shlex.split(command)
+    elif isinstance(command, (list, tuple)) and all(isinstance(a, str) for a in command):
+        argv = list(command)
+    else:
+        raise ValueError("command must be a string, a list of strings or an argv/prefer object")
+    if not argv:
+        raise ValueError("empty command")
+    return argv
+
+
+class ProcessTable:
+    """Track processes started by the server and reap their exit codes."""
+
+    def __init__(self, spawn: Callable[[list[str]], subprocess.Popen] = _default_spawn) -> None:
+        self.spawn = spawn
+        self._lock = threading.Lock()
+        self._running: dict[int, tuple[subprocess.Popen, list[str], float]] = {}
+        self._finished: OrderedDict[int, dict] = OrderedDict()
+
+    def start(self, command) -> dict:
+        try:
+            argv = _argv(command)
+            proc = self.spawn(argv)
+        except Exception as exc:
+            return {"pid": None, "returncode": None, "error": str(exc)}
+        with self._lock:
+            self._running[proc.pid] = (proc, argv, time.time())
+        return {"pid": proc.pid, "returncode": None, "error": None}
+
+    def reap(self) -> None:
+        with self._lock:
+            done = [(pid, entry) for pid, entry in self._running.items() if entry[0].poll() is not None]
+            for pid, (proc, argv, started) in done:
+                del self._running[pid]
+                self._finished[pid] = self._info(pid, proc, argv, started)
+            while len(self._finished) > MAX_FINISHED:
+                self._finished.popitem(last=False)
+
+    @staticmethod
+    def _info(pid: int, proc: subprocess.Popen, argv: list[str], started: float) -> dict:
+        rc = proc.poll()
+        return {
+            "pid": pid,
+            "argv": argv,
+            "started": started,
+            "running": rc is None,
+            "returncode": rc,
+            "runtime": round(time.time() - started, 3),
+        }
+
+    def status(self, pid: int) -> dict | None:
+        self.reap()
+        with self._lock:
+            entry = self._running.get(pid)
+            if entry is not None:
+                return self._info(pid, *entry)
+            return self._finished.get(pid)
+
+    def list(self) -> list[dict]:
+        self.reap()
+        with self._lock:
+            running = [self._info(pid, *entry) for pid, entry in self._running.items()]
+            return running + list(self._finished.values())
+
+    def wait(self, pid: int, timeout: float) -> dict | None:
+        with self._lock:
+            entry = self._running.get(pid)
+        if entry is not None:
+            try:
+                entry[0].wait(timeout)
+            except subprocess.TimeoutExpired:
+                pass
+        return self.status(pid)
+# endregion
+
+# region Server
+class CommandServer:
+    """Serve command requests from many kit PCs at once.
+
+    Runs its own event loop; :meth:`start` puts it on a daemon thread so the
+    Tk main loop is unaffected.  Blocking work (``Popen``, ``wait``) is moved
+    to the loop's executor; waits get their own bounded pool so long
+    timeouts cannot starve ``Popen`` calls.
+    """
+
+    def __init__(
+        self,
+        host: str = "",
+        port: int = DEFAULT_PORT,
+        *,
+        table: ProcessTable | None = None,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.table = table or ProcessTable()
+        self.requests = 0
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self._server: asyncio.AbstractServer | None = None
+        self._ready = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._error: BaseException | None = None
+        self._waiters = ThreadPoolExecutor(MAX_WAITERS, thread_name_prefix="command-wait")
+
+    # -- request handling -----------------------------------------------
+    async def _run(self, req: dict) -> dict:
+        commands = req.get("commands")
+        if commands is None and "command" in req:
+            commands = [req["command"]]
+        if not isinstance(commands, list) or not commands:
+            raise ValueError("'commands' must be a non-empty list")
+        if len(commands) > MAX_BATCH:
+            raise ValueError(f"batch too large ({len(commands)} > {MAX_BATCH})")
+        loop = asyncio.get_running_loop()
+        results = list(await asyncio.gather(*(loop.run_in_executor(None, self.table.start, c) for c in commands)))
+        if req.get("wait"):
+            timeout = float(req.get("timeout", 30))
+            end = time.monotonic() + timeout
+            for res in results:
+                if res["pid"] is not None:
+                    info = await loop.run_in_executor(
+                        self._waiters, self.table.wait, res["pid"], max(0.0, end - time.monotonic())
+                    )
+                    res["returncode"] = info.get("returncode") if info else None
+        return {"results": results}
+
+    async def _dispatch(self, req: dict) -> dict:
+        op = req.get("op", "run")
+        if op == "run":
+            return await self._run(req)
+        if op == "ps":
+            return {"processes": self.table.list()}
+        if op == "wait":
+            pid = int(req["pid"])
+            loop = asyncio.get_running_loop()
+            info = await loop.run_in_executor(self._waiters, self.table.wait, pid, float(req.get("timeout", 30)))
+            if info is None:
+                raise ValueError(f"unknown pid {pid}")
+            return {"process": info}
+        if op == "ping":
+            return {"time": time.time()}
+        raise ValueError(f"unknown op {op!r}")
+
+    async def _reply(self, line: bytes) -> bytes:
+        self.requests += 1
+        req_id = None
+        try:
+            req = json.loads(line)
+            if not isinstance(req, dict):
+                raise ValueError("request must be a JSON object")
+            req_id = req.get("id")
+            reply = {"id": req_id, "ok": True}
+            reply.update(await self._dispatch(req))
+        except Exception as exc:
+            reply = {"id": req_id, "ok": False, "error": str(exc)}
+        return json.dumps(reply).encode("utf-8") + b"\n"
+
+    async def _legacy(self, data: bytes, writer: asyncio.StreamWriter) -> None:
+        res = self.table.start(data.decode(errors="replace").strip())
+        writer.write(b"OK" if res["error"] is None else f"ERROR: {res['error']}".encode())
+        await writer.drain()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            first = await reader.read(LEGACY_READ)
+            if not first.strip():
+                return
+            if not first.lstrip().startswith(b"{"):
+                await self._legacy(first, writer)
+                return
+            buf = first
+            while True:
+                while b"\n" in buf:
+                    line, buf = buf.split(b"\n", 1)
+                    if line.strip():
+                        writer.write(await self._reply(line))
+                        await writer.drain()
+                if len(buf) > MAX_LINE:
+                    writer.write(b'{"id": null, "ok": false, "error": "line too long"}\n')
+                    await writer.drain()
+                    return
+                chunk = await reader.read(65536)
+                if not chunk:
+                    if buf.strip():
+                        writer.write(await self._reply(buf))
+                        await writer.drain()
+                    return
+                buf += chunk
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        except Exception:
+            logging.exception("command server: connection failed")
+        finally:
+            writer.close()
+
+    async def _reaper(self) -> None:
+        while True:
+            await asyncio.sleep(REAP_INTERVAL)
+            self.table.reap()
+
+    # -- lifecycle ------------------------------------------------------
+    async def serve(self) -> None:
+        self.loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(
+            self._handle, self.host or None, self.port, reuse_address=True, limit=MAX_LINE
+        )
+        if not self.port:
+            self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        reaper = asyncio.ensure_future(self._reaper())
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            reaper.cancel()
+
+    def _thread_main(self) -> None:
+        try:
+            asyncio.run(self.serve())
+        except asyncio.CancelledError:
+            pass
+        except Exception as exc:
+            self._error = exc
+            logging.exception("command server stopped")
+        finally:
+            self._waiters.shutdown(wait=False)
+            self._ready.set()
+
+    def start(self, wait: float = 5.0) -> "CommandServer":
+        """Start serving on a daemon thread; return once listening.
+
+        Raises the bind error (e.g. port already in use) if the server
+        failed to come up.
+        """
+        self._thread = threading.Thread(target=self._thread_main, name="command-server", daemon=True)
+        self._thread.start()
+        self._ready.wait(wait)
+        if self._error is not None:
+            raise self._error
+        return self
+
+    def stop(self) -> None:
+        if self.loop is not None and self._server is not None:
+            self.loop.call_soon_threadsafe(self._server.close)
+            self.loop.call_soon_threadsafe(lambda: [t.cancel() for t in asyncio.all_tasks(self.loop)])
+        if self._thread is not None:
+            self._thread.join(2.0)
+# endregion
+
+__all__ = [
+    "CommandServer",
+    "DEFAULT_PORT",
+    "ProcessTable",
+]
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PORT
+    server = CommandServer("", port).start()
+    print(f"command server listening on {server.port}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,347 @@
+# =============================================================================
+# Project: VBS4Project
+# File: config_store.py
+# Purpose: Shared, transactional, write-coalescing owner of config.ini
+# =============================================================================
+# Table of Contents
+#   1) Imports
+#   2) Constants & Configuration
+#   3) ConfigSnapshot
+#   4) ConfigStore
+#   5) Shared instances
+# =============================================================================
+
+# region Imports
+from __future__ import annotations
+
+import atexit
+import configparser
+import io
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import Callable, Iterator, Mapping
+
+from startup_profiler import get_profiler
+# endregion
+
+# region Constants & Configuration
+# Quiet period before a burst of save() calls is written out
+DEFAULT_DEBOUNCE_SECS = 0.5
+# os.replace can briefly fail on Windows while another process reads the file
+REPLACE_RETRIES = 5
+REPLACE_RETRY_DELAY = 0.05
+# endregion
+
+# region ConfigSnapshot
+_EMPTY_SECTION: Mapping[str, str] = MappingProxyType({})
+
+
+class ConfigSnapshot:
+    """Immutable, parsed view of config.ini at one store generation.
+
+    Values are stored raw (no interpolation).  Typed getters mirror the
+    ``ConfigParser`` ones but never raise for a missing section or option.
+    """
+
+    __slots__ = ("generation", "_data")
+
+    def __init__(self, generation: int, data: Mapping[str, Mapping[str, str]]) -> None:
+        self.generation = generation
+        self._data = MappingProxyType(
+            {name: MappingProxyType(dict(values)) for name, values in data.items()}
+        )
+
+    @classmethod
+    def from_parser(cls, generation: int, parser: configparser.ConfigParser) -> "ConfigSnapshot":
+        return cls(generation, {s: dict(parser.items(s, raw=True)) for s in parser.sections()})
+
+    def sections(self) -> tuple[str, ...]:
+        return tuple(self._data)
+
+    def has_section(self, section: str) -> bool:
+        return section in self._data
+
+    def has_option(self, section: str, option: str) -> bool:
+        return option.lower() in self._data.get(section, _EMPTY_SECTION)
+
+    def section(self, section: str) -> Mapping[str, str]:
+        """Return a read-only mapping of *section* (empty if missing)."""
+        return self._data.get(section, _EMPTY_SECTION)
+
+    def get(self, section: str, option: str, fallback: str = "") -> str:
+        return self._data.get(section, _EMPTY_SECTION).get(option.lower(), fallback)
+
+    def getboolean(self, section: str, option: str, fallback: bool = False) -> bool:
+        raw = self.get(section, option, "").strip().lower()
+        return configparser.ConfigParser.BOOLEAN_STATES.get(raw, fallback)
+
+    def getint(self, section: str, option: str, fallback: int = 0) -> int:
+        try:
+            return int(self.get(section, option, "").strip())
+        except ValueError:
+            return fallback
+
+    def getfloat(self, section: str, option: str, fallback: float = 0.0) -> float:
+        try:
+            return float(self.get(section, option, "").strip())
+        except ValueError:
+            return fallback
+# endregion
+
+# region ConfigStore
+class ConfigStore:
+    """Own one ``ConfigParser`` for *path* and serialize all writes to it.
+
+    * :meth:`save` marks the config dirty and schedules a debounced flush, so
+      a burst of setters costs one write.
+    * :meth:`transaction` groups mutations; the outermost block flushes once
+      on normal exit (and rolls back if the block raises) and nested ``save()`` calls are
+      folded into it.
+    * :meth:`flush` writes through a temp file + ``os.replace`` and skips the
+      write entirely when the serialized text is unchanged.
+
+    All operations hold a re-entrant lock so the UI thread and worker threads
+    can never interleave a write.
+
+    Readers that only need values should use :meth:`snapshot`, which costs a
+    single ``stat`` unless the file or the in-memory config changed.
+    """
+
+    def __init__(self, path: str, *, debounce: float = DEFAULT_DEBOUNCE_SECS) -> None:
+        self.path = path
+        self.debounce = debounce
+        self.config = configparser.ConfigParser()
+        self.lock = threading.RLock()
+        self.writes = 0
+        self.skipped_writes = 0
+        self._depth = 0
+        self._dirty = False
+        self._timer: threading.Timer | None = None
+        self._written_text = ""
+        self._disk_stamp: tuple[int, int] | None = None
+        self.generation = 0
+        self._snapshot: ConfigSnapshot | None = None
+        self._subscribers: list[Callable[[ConfigSnapshot], None]] = []
+        self._read()
+
+    # -- helpers ----------------------------------------------------------
+    def _serialize(self) -> str:
+        buf = io.StringIO()
+        self.config.write(buf)
+        return buf.getvalue()
+
+    def _stat(self) -> tuple[int, int] | None:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _read(self) -> None:
+        """Replace the in-memory config with the file's contents.
+
+        The file is parsed into a fresh parser first, so keys deleted on disk
+        disappear and a parse error leaves the current config untouched.  The
+        result is copied into ``self.config`` because callers keep a reference
+        to it.
+        """
+        fresh = configparser.ConfigParser()
+        with get_profiler().span("config read", "config"):
+            try:
+                fresh.read(self.path, encoding="utf-8")
+            except UnicodeDecodeError:
+                # Older builds wrote config.ini in the locale code page
+                fresh = configparser.ConfigParser()
+                fresh.read(self.path)
+            buf = io.StringIO()
+            fresh.write(buf)
+            self._load(buf.getvalue())
+        self._disk_stamp = self._stat()
+        self._written_text = self._serialize()
+        self._invalidate()
+
+    def _load(self, text: str) -> None:
+        self.config.clear()
+        self.config.defaults().clear()
+        self.config.read_string(text, source=self.path)
+
+    def _invalidate(self) -> None:
+        self.generation += 1
+        self._snapshot = None
+
+    def _notify(self) -> None:
+        if not self._subscribers:
+            return
+        snap = self.snapshot()
+        for callback in list(self._subscribers):
+            try:
+                callback(snap)
+            except Exception:
+                pass
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    # -- public API -------------------------------------------------------
+    @contextmanager
+    def transaction(self) -> Iterator[configparser.ConfigParser]:
+        """Batch mutations; the outermost block flushes once on normal exit.
+
+        If the block raises, nothing is written: the outermost block restores
+        the config as it was when the block began, then re-raises.
+        """
+        with self.lock:
+            if self._depth == 0:
+                before, was_dirty = self._serialize(), self._dirty
+            self._depth += 1
+            try:
+                yield self.config
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._load(before)
+                    self._dirty = was_dirty
+                    self._invalidate()
+                raise
+            self._depth -= 1
+            if self._depth == 0:
+                self._dirty = True
+                self._invalidate()
+                self.flush()
+
+    def save(self) -> None:
+        """Mark the config dirty and schedule a debounced flush."""
+        with self.lock:
+            self._dirty = True
+            self._invalidate()
+            if self._depth:
+                return
+            self._cancel_timer()
+            if self.debounce <= 0:
+                self.flush()
+                return
+            self._timer = threading.Timer(self.debounce, self._flush_later)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_later(self) -> None:
+        try:
+            self.flush()
+        except Exception:
+            # Still dirty: the next save(), flush() or exit retries the write
+            logging.exception("Failed to write %s", self.path)
+
+    def flush(self) -> bool:
+        """Write pending changes now; return ``True`` if the file was written.
+
+        Raises if the write fails; the changes then stay pending.
+        """
+        with self.lock:
+            self._cancel_timer()
+            if not self._dirty:
+                return False
+            text = self._serialize()
+            if text == self._written_text and self._stat() == self._disk_stamp:
+                self._dirty = False
+                self.skipped_writes += 1
+                return False
+            with get_profiler().span("config write", "config"):
+                tmp = self.path + ".tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    f.write(text)
+                for attempt in range(REPLACE_RETRIES):
+                    try:
+                        os.replace(tmp, self.path)
+                        break
+                    except PermissionError:
+                        if attempt == REPLACE_RETRIES - 1:
+                            raise
+                        time.sleep(REPLACE_RETRY_DELAY)
+            self._dirty = False
+            self._written_text = text
+            self._disk_stamp = self._stat()
+            self.writes += 1
+        self._notify()
+        return True
+
+    def reload(self) -> bool:
+        """Re-read the file if another process changed it on disk.
+
+        Pending local edits win: while a flush is outstanding the file is not
+        re-read (doing so would merge stale values over them).  Returns
+        ``True`` if the file was re-read.
+        """
+        with self.lock:
+            if self._dirty or self._stat() == self._disk_stamp:
+                return False
+            self._read()
+        self._notify()
+        return True
+
+    def snapshot(self) -> ConfigSnapshot:
+        """Return an immutable view, re-parsing only if the file changed."""
+        self.reload()
+        with self.lock:
+            if self._snapshot is None or self._snapshot.generation != self.generation:
+                self._snapshot = ConfigSnapshot.from_parser(self.generation, self.config)
+            return self._snapshot
+
+    def subscribe(self, callback: Callable[[ConfigSnapshot], None]) -> Callable[[], None]:
+        """Call *callback(snapshot)* whenever config.ini is written or re-read.
+
+        Callbacks run on the thread that wrote or noticed the change.
+        Returns a function that removes the subscription.
+        """
+        with self.lock:
+            self._subscribers.append(callback)
+
+        def _unsubscribe() -> None:
+            with self.lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return _unsubscribe
+# endregion
+
+# region Shared instances
+_STORES: dict[str, ConfigStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_config_store(path: str) -> ConfigStore:
+    """Return the process-wide :class:`ConfigStore` for *path*."""
+    key = os.path.normcase(os.path.abspath(path))
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = _STORES[key] = ConfigStore(path)
+        return store
+
+
+def flush_all() -> None:
+    """Flush every shared store (registered to run at interpreter exit)."""
+    with _STORES_LOCK:
+        stores = list(_STORES.values())
+    for store in stores:
+        try:
+            store.flush()
+        except Exception:
+            logging.exception("Failed to write %s", store.path)
+
+
+atexit.register(flush_all)
+# endregion
+
+__all__ = [
+    "ConfigSnapshot",
+    "ConfigStore",
+    "DEFAULT_DEBOUNCE_SECS",
+    "flush_all",
+    "get_config_store",
+]
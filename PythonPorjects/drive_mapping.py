@@ -0,0 +1,320 @@
+# =============================================================================
+# Project: VBS4Project
+# File: drive_mapping.py
+# Purpose: In-memory drive-letter -> UNC table backed by WNet APIs, not net use
+# =============================================================================
+# Table of Contents
+#   1) Imports
+#   2) Constants & Configuration
+#   3) Utilities
+#   4) Backends
+#   5) Mapping service
+#   6) Shared instance
+#   7) CLI
+# =============================================================================
+
+# region Imports
+from __future__ import annotations
+
+import ctypes
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from typing import Protocol
+# endregion
+
+# region Constants & Configuration
+# Even without a detected change the table is re-queried this often, to pick
+# up a share re-pointed to another UNC under the same letter.
+DEFAULT_TTL = 15.0
+NET_USE_TIMEOUT = 10.0
+
+_NET_USE_RE = re.compile(r"^\s*(?:\S+\s+)?([A-Z]:)\s+(\\\\\S+)", re.MULTILINE | re.IGNORECASE)
+
+# WNet constants (winnetwk.h)
+_NO_ERROR = 0
+_ERROR_MORE_DATA = 234
+_RESOURCETYPE_DISK = 0x1
+_CONNECT_UPDATE_PROFILE = 0x1
+# endregion
+
+# region Utilities
+def norm_letter(letter: str) -> str:
+    """Return ``"M:"`` for ``"m"``, ``"M:"`` or ``"M:\\"``."""
+    letter = (letter or "").strip().rstrip("\\/").upper()
+    return letter if letter.endswith(":") else letter + ":"
+# endregion
+
+# region Backends
+class MappingBackend(Protocol):
+    """Source of truth for drive mappings."""
+
+    def query(self) -> dict[str, str]:
+        """Return ``{"M:": r"\\\\host\\share", ...}`` for mapped network drives."""
+
+    def stamp(self) -> object:
+        """Return a cheap value that changes when drives are added or removed."""
+
+    def add(self, letter: str, unc: str, persistent: bool = True) -> bool: ...
+
+    def cancel(self, letter: str) -> bool: ...
+
+
+if os.name == "nt":
+    class _NETRESOURCEW(ctypes.Structure):
+        _fields_ = [
+            ("dwScope", ctypes.c_uint32),
+            ("dwType", ctypes.c_uint32),
+            ("dwDisplayType", ctypes.c_uint32),
+            ("dwUsage", ctypes.c_uint32),
+            ("lpLocalName", ctypes.c_wchar_p),
+            ("lpRemoteName", ctypes.c_wchar_p),
+            ("lpComment", ctypes.c_wchar_p),
+            ("lpProvider", ctypes.c_wchar_p),
+        ]
+
+
+class Win32Backend:
+    """``GetLogicalDrives`` + ``WNetGetConnectionW`` via ctypes (no console)."""
+
+    def __init__(self) -> None:
+        self._k32 = ctypes.WinDLL("kernel32")
+        self._mpr = ctypes.WinDLL("mpr")
+
+    def stamp(self) -> object:
+        return self._k32.GetLogicalDrives()
+
+    def _connection(self, letter: str) -> str | None:
+        size = ctypes.c_uint32(260)
+        while True:
+            buf = ctypes.create_unicode_buffer(size.value)
+            rc = self._mpr.WNetGetConnectionW(letter, buf, ctypes.byref(size))
+            if rc == _NO_ERROR:
+                return buf.value or None
+            if rc != _ERROR_MORE_DATA:
+                return None
+
+    def query(self) -> dict[str, str]:
+        mask = self._k32.GetLogicalDrives()
+        table: dict[str, str] = {}
+        for i in range(26):
+            if mask & (1 << i):
+                letter = f"{chr(ord('A') + i)}:"
+                unc = self._connection(letter)
+                if unc:
+                    table[letter] = unc
+        return table
+
+    def add(self, letter: str, unc: str, persistent: bool = True) -> bool:
+        res = _NETRESOURCEW()
+        res.dwType = _RESOURCETYPE_DISK
+        res.lpLocalName = letter
+        res.lpRemoteName = unc
+        flags = _CONNECT_UPDATE_PROFILE if persistent else 0
+        return self._mpr.WNetAddConnection2W(ctypes.byref(res), None, None, flags) == _NO_ERROR
+
+    def cancel(self, letter: str) -> bool:
+        return self._mpr.WNetCancelConnection2W(letter, _CONNECT_UPDATE_PROFILE, True) == _NO_ERROR
+
+
+class NetUseBackend:
+    """Fallback that parses ``net use`` (one console process per query)."""
+
+    def stamp(self) -> object:
+        return None
+
+    def query(self) -> dict[str, str]:
+        try:
+            out = subprocess.run(
+                ["net", "use"], capture_output=True, text=True, check=False, timeout=NET_USE_TIMEOUT
+            ).stdout
+        except Exception:
+            return {}
+        return {m.group(1).upper(): m.group(2) for m in _NET_USE_RE.finditer(out)}
+
+    def add(self, letter: str, unc: str, persistent: bool = True) -> bool:
+        flag = "/persistent:yes" if persistent else "/persistent:no"
+        try:
+            rc = subprocess.run(["net", "use", letter, unc, flag], check=False, timeout=NET_USE_TIMEOUT).returncode
+        except Exception:
+            return False
+        return rc == 0
+
+    def cancel(self, letter: str) -> bool:
+        try:
+            rc = subprocess.run(
+                ["net", "use", letter, "/delete", "/yes"], check=False, timeout=NET_USE_TIMEOUT
+            ).returncode
+        except Exception:
+            return False
+        return rc == 0
+
+
+class StaticBackend:
+    """In-memory stand-in for Linux development and benchmarking.
+
+    *latency* simulates the cost of one backend query in seconds.
+    """
+
+    def __init__(self, mappings: dict[str, str] | None = None, latency: float = 0.0) -> None:
+        self.mappings = {norm_letter(k): v for k, v in (mappings or {}).items()}
+        self.latency = latency
+        self.queries = 0
+        self._version = 0
+
+    def stamp(self) -> object:
+        return self._version
+
+    def query(self) -> dict[str, str]:
+        self.queries += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return dict(self.mappings)
+
+    def add(self, letter: str, unc: str, persistent: bool = True) -> bool:
+        self.mappings[norm_letter(letter)] = unc
+        self._version += 1
+        return True
+
+    def cancel(self, letter: str) -> bool:
+        self._version += 1
+        return self.mappings.pop(norm_letter(letter), None) is not None
+
+
+def default_backend() -> MappingBackend:
+    """Pick the WNet backend on Windows, ``net use`` if ctypes fails, else static."""
+    if os.name == "nt":
+        try:
+            return Win32Backend()
+        except Exception:
+            pass
+        if shutil.which("net"):
+            return NetUseBackend()
+    return StaticBackend()
+# endregion
+
+# region Mapping service
+class DriveMappingService:
+    """Serve drive mappings from an in-memory table.
+
+    The table is rebuilt only when the backend's change stamp moves (a
+    ``GetLogicalDrives`` bitmask on Windows), when it is older than *ttl*, or
+    after :meth:`map` / :meth:`unmap` went through this service.
+    """
+
+    def __init__(self, backend: MappingBackend | None = None, ttl: float = DEFAULT_TTL) -> None:
+        self.backend = backend or default_backend()
+        self.ttl = ttl
+        self.refreshes = 0
+        self._lock = threading.Lock()
+        self._table: dict[str, str] = {}
+        self._stamp: object = object()
+        self._loaded_at = float("-inf")
+
+    def _refresh_locked(self, force: bool) -> None:
+        stamp = self.backend.stamp()
+        stale = time.monotonic() - self._loaded_at >= self.ttl
+        if force or stale or stamp != self._stamp:
+            self._table = self.backend.query()
+            self._stamp = stamp
+            self._loaded_at = time.monotonic()
+            self.refreshes += 1
+
+    def table(self, refresh: bool = False) -> dict[str, str]:
+        """Return a copy of the whole ``letter -> UNC`` table."""
+        with self._lock:
+            self._refresh_locked(refresh)
+            return dict(self._table)
+
+    def get(self, letter: str, refresh: bool = False) -> str | None:
+        """Return the UNC mapped to *letter*, if any."""
+        with self._lock:
+            self._refresh_locked(refresh)
+            return self._table.get(norm_letter(letter))
+
+    def map(self, letter: str, unc: str, persistent: bool = True) -> bool:
+        """Map *unc* to *letter*, replacing a different existing mapping."""
+        letter = norm_letter(letter)
+        with self._lock:
+            self._refresh_locked(True)
+            current = self._table.get(letter)
+            if current and current.lower() == unc.lower():
+                return True
+            if current:
+                self.backend.cancel(letter)
+            ok = self.backend.add(letter, unc, persistent)
+            self._refresh_locked(True)
+            return ok and (self._table.get(letter) or "").lower() == unc.lower()
+
+    def unmap(self, letter: str) -> bool:
+        with self._lock:
+            ok = self.backend.cancel(norm_letter(letter))
+            self._refresh_locked(True)
+            return ok
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = float("-inf")
+# endregion
+
+# region Shared instance
+_SERVICE: DriveMappingService | None = None
+_SERVICE_LOCK = threading.Lock()
+
+
+def get_drive_mappings() -> DriveMappingService:
+    """Return the process-wide :class:`DriveMappingService`."""
+    global _SERVICE
+    with _SERVICE_LOCK:
+        if _SERVICE is None:
+            _SERVICE = DriveMappingService()
+        return _SERVICE
+# endregion
+
+# region CLI
+def main(argv: list[str] | None = None) -> int:
+    """``python drive_mapping.py [--repeat N] [--static]`` prints the table and timings."""
+    args = list(sys.argv[1:] if argv is None else argv)
+    repeat = 1000
+    if len(args) >= 2 and args[0] == "--repeat":
+        repeat = max(1, int(args[1]))
+        args = args[2:]
+    if "--static" in args:
+        backend: MappingBackend = StaticBackend({"M:": r"\\host\SharedMeshDrive"}, latency=0.05)
+    else:
+        backend = default_backend()
+    service = DriveMappingService(backend)
+    t0 = time.perf_counter()
+    table = service.table()
+    cold = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        service.get("M:")
+    warm = (time.perf_counter() - t0) / repeat
+    for letter, unc in sorted(table.items()):
+        print(f"{letter} -> {unc}")
+    print(
+        f"{type(backend).__name__}: query={cold * 1e3:.3f} ms  "
+        f"cached={warm * 1e6:.1f} us  refreshes={service.refreshes}"
+    )
+    return 0
+# endregion
+
+__all__ = [
+    "DriveMappingService",
+    "MappingBackend",
+    "NetUseBackend",
+    "StaticBackend",
+    "Win32Backend",
+    "default_backend",
+    "get_drive_mappings",
+    "norm_letter",
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
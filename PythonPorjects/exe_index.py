@@ -0,0 +1,473 @@
+# =============================================================================
+# Project: VBS4Project
+# File: exe_index.py
+# Purpose: Persistent executable discovery index shared by all path resolvers
+# =============================================================================
+# Table of Contents
+#   1) Imports
+#   2) Constants & Configuration
+#   3) Data Models / Types
+#   4) Registry (Uninstall entries)
+#   5) Directory scanning
+#   6) Index
+#   7) Shared instance
+# =============================================================================
+
+# region Imports
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Iterable
+
+try:  # pragma: no cover - Windows only
+    import winreg  # type: ignore
+except Exception:  # pragma: no cover - non-Windows benchmarking
+    winreg = None  # type: ignore
+
+from pe_version import read_pe_version
+from startup_profiler import get_profiler
+# endregion
+
+# region Constants & Configuration
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+INDEX_PATH = os.path.join(BASE_DIR, "exe_index.json")
+INDEX_FORMAT = 1
+
+# Roots scanned for VBS4/BlueIG/ARES builds (nested roots are de-duplicated)
+BUILD_ROOTS = (
+    r"C:\BISIM\VBS4",
+    r"C:\Builds\VBS4",
+    r"C:\Builds",
+    r"C:\Bohemia Interactive Simulations",
+)
+
+# Vendor folders under Program Files that hold the tools we launch
+PROGRAM_FILES_SUBDIRS = ("Skyline",)
+
+# Uninstall DisplayName fragments whose InstallLocation becomes a scan root
+UNINSTALL_ROOT_HINTS = (
+    "photomesh",
+    "photo mesh",
+    "skyline",
+    "terraexplorer",
+    "vbs4",
+    "blue ig",
+    "blueig",
+)
+
+INDEXED_EXTENSIONS = (".exe", ".bat")
+MAX_DEPTH = 12
+
+# Minimum seconds between two revalidation passes in the same process
+REVALIDATE_SECS = 30.0
+
+_UNINSTALL_KEYS = (
+    r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall",
+    r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall",
+)
+# endregion
+
+# region Data Models / Types
+@dataclass
+class ExeRecord:
+    """A single indexed executable."""
+
+    path: str
+    size: int
+    mtime: float
+    version: list[int] | None = None
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+    @property
+    def version_tuple(self) -> tuple[int, ...] | None:
+        return tuple(self.version) if self.version else None
+# endregion
+
+# region Registry (Uninstall entries)
+def _uninstall_stamp() -> list[int]:
+    """Return the last-write times of the Uninstall keys (cheap to query)."""
+    stamps: list[int] = []
+    if winreg is None:
+        return stamps
+    for hive in (winreg.HKEY_LOCAL_MACHINE, winreg.HKEY_CURRENT_USER):
+        for key in _UNINSTALL_KEYS:
+            try:
+                with winreg.OpenKey(hive, key) as root:
+                    stamps.append(int(winreg.QueryInfoKey(root)[2]))
+            except OSError:
+                stamps.append(0)
+    return stamps
+
+
+def _enumerate_uninstall_entries() -> list[tuple[str, str]]:
+    """Return ``(DisplayName, InstallLocation)`` pairs from the Uninstall keys."""
+    entries: list[tuple[str, str]] = []
+    if winreg is None:
+        return entries
+    for hive in (winreg.HKEY_LOCAL_MACHINE, winreg.HKEY_CURRENT_USER):
+        for key in _UNINSTALL_KEYS:
+            try:
+                with winreg.OpenKey(hive, key) as root:
+                    subcount = winreg.QueryInfoKey(root)[0]
+                    for i in range(subcount):
+                        try:
+                            subname = winreg.EnumKey(root, i)
+                            with winreg.OpenKey(root, subname) as sub:
+                                disp = ""
+                                loc = ""
+                                try:
+                                    disp, _ = winreg.QueryValueEx(sub, "DisplayName")
+                                except OSError:
+                                    pass
+                                try:
+                                    loc, _ = winreg.QueryValueEx(sub, "InstallLocation")
+                                except OSError:
+                                    pass
+                                if disp or loc:
+                                    entries.append((str(disp or ""), str(loc or "")))
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+    return entries
+# endregion
+
+# region Directory scanning
+def _norm(path: str) -> str:
+    return os.path.normcase(os.path.normpath(path))
+
+
+def _is_under(path: str, root: str) -> bool:
+    """Return True if normalized *path* equals or lies beneath normalized *root*."""
+    if path == root:
+        return True
+    return path.startswith(root.rstrip("\\/") + os.sep)
+# endregion
+
+# region Index
+class ExeIndex:
+    """Scan install roots once and answer executable lookups from memory.
+
+    The index records every ``.exe``/``.bat`` under the configured roots along
+    with its size, mtime and (lazily) its file version.  It is persisted to
+    *index_path*; on later runs only directory mtimes are compared, and only
+    directories whose mtime changed are re-listed.
+    """
+
+    def __init__(
+        self,
+        index_path: str = INDEX_PATH,
+        roots: Iterable[str] = (),
+        *,
+        extensions: Iterable[str] = INDEXED_EXTENSIONS,
+        max_depth: int = MAX_DEPTH,
+        version_reader: Callable[[str], tuple[int, ...] | None] | None = None,
+    ) -> None:
+        self.index_path = index_path
+        self.extensions = tuple(e.lower() for e in extensions)
+        self.max_depth = max_depth
+        self.version_reader = version_reader or read_pe_version
+        self._lock = threading.RLock()
+        self._roots: list[str] = []
+        # normalized dir -> [display path, mtime_ns, depth below its root]
+        self._dirs: dict[str, list] = {}
+        # normalized dir -> records of indexed files directly inside it
+        self._files: dict[str, list[ExeRecord]] = {}
+        # lowercase file name -> records
+        self._by_name: dict[str, list[ExeRecord]] = {}
+        self._uninstall: list[tuple[str, str]] = []
+        self._uninstall_stamp: list[int] = []
+        self._last_validated = 0.0
+        self._loaded = False
+        self._dirty = False
+        self.add_roots(roots)
+
+    # -- roots --------------------------------------------------------------
+    def add_roots(self, roots: Iterable[str]) -> None:
+        """Register additional scan roots (nested roots are collapsed)."""
+        with self._lock:
+            changed = False
+            for root in roots:
+                if not root:
+                    continue
+                display = os.path.normpath(root)
+                norm = _norm(display)
+                if any(_is_under(norm, _norm(r)) for r in self._roots):
+                    continue
+                self._roots = [r for r in self._roots if not _is_under(_norm(r), norm)]
+                self._roots.append(display)
+                changed = True
+            if changed:
+                self._last_validated = 0.0
+
+    @property
+    def roots(self) -> list[str]:
+        with self._lock:
+            return list(self._roots)
+
+    # -- persistence --------------------------------------------------------
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            return
+        if data.get("format") != INDEX_FORMAT:
+            return
+        self._dirs = {k: list(v) for k, v in data.get("dirs", {}).items()}
+        self._files = {
+            d: [ExeRecord(**rec) for rec in recs]
+            for d, recs in data.get("files", {}).items()
+        }
+        self._uninstall = [tuple(e) for e in data.get("uninstall", [])]
+        self._uninstall_stamp = list(data.get("uninstall_stamp", []))
+        self._rebuild_name_map()
+
+    def save(self) -> None:
+        """Persist the index atomically if it changed since the last save."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {
+                "format": INDEX_FORMAT,
+                "saved": time.time(),
+                "dirs": self._dirs,
+                "files": {
+                    d: [asdict(r) for r in recs] for d, recs in self._files.items() if recs
+                },
+                "uninstall": self._uninstall,
+                "uninstall_stamp": self._uninstall_stamp,
+            }
+            tmp = self.index_path + ".tmp"
+            try:
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                os.replace(tmp, self.index_path)
+                self._dirty = False
+            except OSError:
+                pass
+
+    def _rebuild_name_map(self) -> None:
+        by_name: dict[str, list[ExeRecord]] = {}
+        for recs in self._files.values():
+            for rec in recs:
+                by_name.setdefault(rec.name.lower(), []).append(rec)
+        self._by_name = by_name
+
+    # -- scanning -----------------------------------------------------------
+    def _list_dir(self, display: str, depth: int, pending: list[tuple[str, int]]) -> None:
+        """Index the files directly inside *display* and queue unknown subdirs."""
+        norm = _norm(display)
+        try:
+            st = os.stat(display)
+            it = os.scandir(display)
+        except OSError:
+            self._drop_tree(norm)
+            return
+        records: list[ExeRecord] = []
+        subdirs: list[str] = []
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.name.lower().endswith(self.extensions):
+                        est = entry.stat()
+                        records.append(ExeRecord(entry.path, est.st_size, est.st_mtime))
+                except OSError:
+                    continue
+        rescan = norm in self._dirs
+        old = {r.path: r for r in self._files.get(norm, [])}
+        for rec in records:
+            prev = old.get(rec.path)
+            if prev and prev.size == rec.size and prev.mtime == rec.mtime:
+                rec.version = prev.version
+        self._files[norm] = records
+        self._dirs[norm] = [display, st.st_mtime_ns, depth]
+        self._dirty = True
+
+        if rescan:
+            # Only a changed directory can have lost subfolders.
+            live = {_norm(p) for p in subdirs}
+            prefix = norm.rstrip("\\/") + os.sep
+            for known in [d for d in self._dirs if d.startswith(prefix)]:
+                if os.path.dirname(known) == norm and known not in live:
+                    self._drop_tree(known)
+        if depth < self.max_depth:
+            for sub in subdirs:
+                if _norm(sub) not in self._dirs:
+                    pending.append((sub, depth + 1))
+
+    def _scan_tree(self, display: str, depth: int = 0) -> None:
+        pending = [(display, depth)]
+        while pending:
+            path, d = pending.pop()
+            self._list_dir(path, d, pending)
+
+    def _drop_tree(self, norm: str) -> None:
+        prefix = norm.rstrip("\\/") + os.sep
+        for d in [d for d in self._dirs if d == norm or d.startswith(prefix)]:
+            self._dirs.pop(d, None)
+            self._files.pop(d, None)
+        for d in [d for d in self._files if d == norm or d.startswith(prefix)]:
+            self._files.pop(d, None)
+        self._dirty = True
+
+    def _refresh_uninstall(self) -> None:
+        stamp = _uninstall_stamp()
+        if stamp and stamp == self._uninstall_stamp and self._uninstall:
+            return
+        self._uninstall = _enumerate_uninstall_entries()
+        self._uninstall_stamp = stamp
+        self._dirty = True
+
+    def _uninstall_roots(self) -> list[str]:
+        roots = []
+        for disp, loc in self._uninstall:
+            dlow = disp.lower()
+            if loc and any(h in dlow for h in UNINSTALL_ROOT_HINTS) and os.path.isdir(loc):
+                roots.append(loc)
+        return roots
+
+    def refresh(self, force: bool = False) -> None:
+        """Revalidate the index against directory mtimes.
+
+        Known directories are ``stat``-ed; only those whose mtime changed are
+        re-listed.  Unknown roots are scanned in full.  Calls within
+        ``REVALIDATE_SECS`` of the previous pass return immediately unless
+        *force* is set.
+        """
+        with self._lock:
+            self._load()
+            now = time.monotonic()
+            if not force and self._last_validated and now - self._last_validated < REVALIDATE_SECS:
+                return
+            with get_profiler().span("exe index refresh", "discovery"):
+                self._refresh_uninstall()
+                self.add_roots(self._uninstall_roots())
+
+                root_norms = [_norm(r) for r in self._roots]
+                for d in list(self._dirs):
+                    if not any(_is_under(d, r) for r in root_norms):
+                        self._drop_tree(d)
+
+                pending: list[tuple[str, int]] = []
+                for norm, (display, mtime_ns, depth) in list(self._dirs.items()):
+                    if norm not in self._dirs:
+                        continue
+                    try:
+                        st = os.stat(display)
+                    except OSError:
+                        self._drop_tree(norm)
+                        continue
+                    if force or st.st_mtime_ns != mtime_ns:
+                        self._list_dir(display, depth, pending)
+                for root in self._roots:
+                    if _norm(root) not in self._dirs and os.path.isdir(root):
+                        pending.append((root, 0))
+                while pending:
+                    path, d = pending.pop()
+                    self._list_dir(path, d, pending)
+
+                self._rebuild_name_map()
+            self._last_validated = time.monotonic()
+            self.save()
+
+    # -- queries ------------------------------------------------------------
+    def find(self, *names: str, under: Iterable[str] | None = None) -> list[ExeRecord]:
+        """Return live records whose file name matches any of *names*.
+
+        When *under* is given, only records beneath one of those folders are
+        returned; the folders are added as scan roots first so a lookup never
+        misses a location it was asked about.
+        """
+        under_list = [u for u in (under or ()) if u]
+        if under_list:
+            self.add_roots(u for u in under_list if os.path.isdir(u))
+        self.refresh()
+        under_norms = [_norm(u) for u in under_list]
+        hits: list[ExeRecord] = []
+        with self._lock:
+            for name in names:
+                for rec in self._by_name.get(name.lower(), []):
+                    if under_norms and not any(_is_under(_norm(rec.path), u) for u in under_norms):
+                        continue
+                    hits.append(rec)
+        return [rec for rec in hits if self._still_valid(rec)]
+
+    def newest(self, *names: str, under: Iterable[str] | None = None) -> str:
+        """Return the most recently modified match for *names* or ``""``."""
+        hits = self.find(*names, under=under)
+        if not hits:
+            return ""
+        return os.path.normpath(max(hits, key=lambda r: r.mtime).path)
+
+    def version_of(self, rec: ExeRecord) -> tuple[int, ...] | None:
+        """Return (and remember) the file version of *rec*."""
+        if rec.version is None:
+            ver = self.version_reader(rec.path)
+            with self._lock:
+                rec.version = list(ver) if ver else []
+                self._dirty = True
+        return rec.version_tuple
+
+    def uninstall_entries(self) -> list[tuple[str, str]]:
+        """Return cached ``(DisplayName, InstallLocation)`` pairs."""
+        with self._lock:
+            self._load()
+            self._refresh_uninstall()
+            return list(self._uninstall)
+
+    def _still_valid(self, rec: ExeRecord) -> bool:
+        """Re-stat a hit so an in-place upgrade or removal is not missed."""
+        try:
+            st = os.stat(rec.path)
+        except OSError:
+            return False
+        if st.st_size != rec.size or st.st_mtime != rec.mtime:
+            with self._lock:
+                rec.size, rec.mtime, rec.version = st.st_size, st.st_mtime, None
+                self._dirty = True
+        return True
+# endregion
+
+# region Shared instance
+_INDEX: ExeIndex | None = None
+_INDEX_LOCK = threading.Lock()
+
+
+def default_roots() -> list[str]:
+    """Return the standard build roots plus vendor folders under Program Files."""
+    roots = list(BUILD_ROOTS)
+    for env in ("ProgramFiles", "ProgramFiles(x86)"):
+        base = os.environ.get(env, "").strip()
+        if base:
+            roots.extend(os.path.join(base, sub) for sub in PROGRAM_FILES_SUBDIRS)
+    return roots
+
+
+def get_exe_index() -> ExeIndex:
+    """Return the process-wide :class:`ExeIndex`."""
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            _INDEX = ExeIndex(INDEX_PATH, default_roots())
+        return _INDEX
+# endregion
+
+__all__ = [
+    "ExeRecord",
+    "ExeIndex",
+    "default_roots",
+    "get_exe_index",
+]
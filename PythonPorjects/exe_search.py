@@ -0,0 +1,218 @@
+# =============================================================================
+# Project: VBS4Project
+# File: exe_search.py
+# Purpose: Bounded, cancellable, parallel filesystem search for executables
+# =============================================================================
+# Table of Contents
+#   1) Imports
+#   2) Constants & Configuration
+#   3) Utilities
+#   4) Search engine
+# =============================================================================
+
+# region Imports
+from __future__ import annotations
+
+import ctypes
+import os
+import queue
+import string
+import threading
+import time
+from typing import Callable, Iterable
+# endregion
+
+# region Constants & Configuration
+# Directory names never worth descending into when hunting for a program
+PRUNE_DIR_NAMES = frozenset(
+    name.lower()
+    for name in (
+        "Datasets",
+        "WorkingFuser",
+        "$Recycle.Bin",
+        "System Volume Information",
+        "Windows",
+        "WinSxS",
+        "ProgramData",
+        "node_modules",
+        ".git",
+        "__pycache__",
+    )
+)
+# PhotoMesh project output folders (Build_1, outputBuild_2, ...)
+PRUNE_DIR_PREFIXES = ("build_", "outputbuild_")
+
+DEFAULT_MAX_DEPTH = 6
+DEFAULT_WORKERS = 4
+PROGRESS_INTERVAL = 0.25
+
+_DRIVE_FIXED = 3
+# endregion
+
+# region Utilities
+def fixed_drive_roots() -> list[str]:
+    """Return the roots of local fixed drives (``C:\\`` first)."""
+    if os.name != "nt":
+        return [os.path.abspath(os.sep)]
+    roots: list[str] = []
+    try:
+        mask = ctypes.windll.kernel32.GetLogicalDrives()
+        for i, letter in enumerate(string.ascii_uppercase):
+            if not mask & (1 << i):
+                continue
+            root = f"{letter}:\\"
+            if ctypes.windll.kernel32.GetDriveTypeW(root) == _DRIVE_FIXED:
+                roots.append(root)
+    except Exception:
+        roots = []
+    if "C:\\" in roots:
+        roots.remove("C:\\")
+    return ["C:\\"] + roots
+
+
+def should_prune(name: str, prune_names=PRUNE_DIR_NAMES, prune_prefixes=PRUNE_DIR_PREFIXES) -> bool:
+    """Return True if a directory called *name* should not be descended."""
+    low = name.lower()
+    return low in prune_names or low.startswith(prune_prefixes)
+# endregion
+
+# region Search engine
+class ParallelExeSearch:
+    """Search *roots* for any of *names* using a pool of worker threads.
+
+    Directories are taken from a shared work queue so one deep root does not
+    starve the others.  The search stops at the first hit, on cancellation or
+    when *timeout* expires.  ``progress(dirs_scanned, current_dir)`` is called
+    at most every ``PROGRESS_INTERVAL`` seconds from a worker thread.
+    """
+
+    def __init__(
+        self,
+        names: Iterable[str],
+        roots: Iterable[str],
+        *,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        workers: int = DEFAULT_WORKERS,
+        progress: Callable[[int, str], None] | None = None,
+        cancel_event: threading.Event | None = None,
+        prune_names: Iterable[str] = PRUNE_DIR_NAMES,
+        prune_prefixes: Iterable[str] = PRUNE_DIR_PREFIXES,
+    ) -> None:
+        self.names = {n.lower() for n in names}
+        self.roots = [r for r in roots if r]
+        self.max_depth = max_depth
+        self.workers = max(1, workers)
+        self.progress = progress
+        self.cancel_event = cancel_event or threading.Event()
+        self.prune_names = frozenset(n.lower() for n in prune_names)
+        self.prune_prefixes = tuple(p.lower() for p in prune_prefixes)
+        self.dirs_scanned = 0
+        self._result = ""
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._last_progress = 0.0
+        self._queue: queue.Queue[tuple[str, int]] = queue.Queue()
+
+    def cancel(self) -> None:
+        """Request the search to stop as soon as possible."""
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def _report(self, current: str) -> None:
+        if not self.progress:
+            return
+        now = time.monotonic()
+        if now - self._last_progress < PROGRESS_INTERVAL:
+            return
+        self._last_progress = now
+        try:
+            self.progress(self.dirs_scanned, current)
+        except Exception:
+            pass
+
+    def _stop(self) -> bool:
+        return self._done.is_set() or self.cancel_event.is_set()
+
+    def _scan_one(self, path: str, depth: int) -> None:
+        try:
+            it = os.scandir(path)
+        except OSError:
+            return
+        subdirs: list[str] = []
+        with it:
+            for entry in it:
+                if self._stop():
+                    return
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if depth < self.max_depth and not should_prune(
+                            entry.name, self.prune_names, self.prune_prefixes
+                        ):
+                            subdirs.append(entry.path)
+                    elif entry.name.lower() in self.names:
+                        with self._lock:
+                            if not self._result:
+                                self._result = entry.path
+                        self._done.set()
+                        return
+                except OSError:
+                    continue
+        for sub in subdirs:
+            self._queue.put((sub, depth + 1))
+
+    def _worker(self) -> None:
+        while not self._stop():
+            try:
+                path, depth = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                # Children are queued before their parent is marked done, so
+                # no unfinished tasks means the whole tree has been walked.
+                if self._queue.unfinished_tasks == 0:
+                    self._done.set()
+                    return
+                continue
+            with self._lock:
+                self.dirs_scanned += 1
+            try:
+                self._report(path)
+                self._scan_one(path, depth)
+            finally:
+                self._queue.task_done()
+
+    def run(self, timeout: float | None = None) -> str:
+        """Run the search and return the first matching path or ``""``."""
+        for root in self.roots:
+            if os.path.isdir(root):
+                self._queue.put((root, 0))
+        threads = [
+            threading.Thread(target=self._worker, name=f"exe-search-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for t in threads:
+            t.start()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._stop():
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            self._done.wait(0.1)
+        self._done.set()
+        for t in threads:
+            t.join(timeout=1.0)
+        if self.progress:
+            try:
+                self.progress(self.dirs_scanned, "")
+            except Exception:
+                pass
+        return "" if self.cancelled else self._result
+# endregion
+
+__all__ = [
+    "ParallelExeSearch",
+    "fixed_drive_roots",
+    "should_prune",
+    "PRUNE_DIR_NAMES",
+    "PRUNE_DIR_PREFIXES",
+]
@@ -0,0 +1,518 @@
+# =============================================================================
+# Project: VBS4Project
+# File: fs_watch.py
+# Purpose: Event-driven directory watching (ReadDirectoryChangesW / inotify /
+#          polling) and PhotoMesh build-output events on top of it
+# =============================================================================
+# Table of Contents
+#   1) Imports
+#   2) Constants & Configuration
+#   3) Data Models / Types
+#   4) Backends
+#   5) Backend selection
+#   6) Build output watcher
+# =============================================================================
+
+# region Imports
+from __future__ import annotations
+
+import ctypes
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+# endregion
+
+# region Constants & Configuration
+CREATED = "created"
+MODIFIED = "modified"
+DELETED = "deleted"
+# The backend lost events (buffer overflow); consumers should re-scan
+RESCAN = "rescan"
+
+POLL_INTERVAL = 5.0
+OUTPUT_MARKER = "output-centerpivotorigin.json"
+# Without an external completion signal (the Project Queue's terminal build
+# event), output is "complete" once the marker exists and writes have been
+# quiet for this long.  Exports pause for seconds between tiles, so this
+# has to be well above a single tile's write time.
+SETTLE_SECS = 45.0
+# endregion
+
+# region Data Models / Types
+@dataclass(frozen=True)
+class FsEvent:
+    kind: str
+    path: str
+
+
+EventCallback = Callable[[FsEvent], None]
+# endregion
+
+# region Backends
+class _ThreadedWatcher:
+    """Common start/stop plumbing; subclasses implement :meth:`_run`."""
+
+    backend = "base"
+
+    def __init__(self, root: str, callback: EventCallback) -> None:
+        self.root = os.path.abspath(root)
+        self.callback = callback
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _emit(self, kind: str, path: str) -> None:
+        try:
+            self.callback(FsEvent(kind, path))
+        except Exception:
+            pass
+
+    def _run(self) -> None:  # pragma: no cover - overridden
+        raise NotImplementedError
+
+    def start(self) -> "_ThreadedWatcher":
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"fs-watch-{self.backend}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+
+class Win32Watcher(_ThreadedWatcher):
+    """``ReadDirectoryChangesW`` on the whole tree (works on SMB shares too)."""
+
+    backend = "win32"
+    _FILE_LIST_DIRECTORY = 0x0001
+    _SHARE_ALL = 0x7
+    _OPEN_EXISTING = 3
+    _FILE_FLAG_BACKUP_SEMANTICS = 0x02000000
+    _FILTER = 0x1 | 0x2 | 0x8 | 0x10  # file name, dir name, size, last write
+    _ACTIONS = {1: CREATED, 2: DELETED, 3: MODIFIED, 4: DELETED, 5: CREATED}
+
+    def __init__(self, root: str, callback: EventCallback, buffer_size: int = 64 * 1024) -> None:
+        super().__init__(root, callback)
+        from ctypes import wintypes
+
+        self._k32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        self._k32.CreateFileW.restype = wintypes.HANDLE
+        self._k32.ReadDirectoryChangesW.argtypes = [
+            wintypes.HANDLE, wintypes.LPVOID, wintypes.DWORD, wintypes.BOOL,
+            wintypes.DWORD, ctypes.POINTER(wintypes.DWORD), wintypes.LPVOID, wintypes.LPVOID,
+        ]
+        self._k32.CancelIoEx.argtypes = [wintypes.HANDLE, wintypes.LPVOID]
+        self._k32.CloseHandle.argtypes = [wintypes.HANDLE]
+        self._wintypes = wintypes
+        self._buffer_size = buffer_size
+        self._handle = None
+
+    def _open(self):
+        handle = self._k32.CreateFileW(
+            self.root, self._FILE_LIST_DIRECTORY, self._SHARE_ALL, None,
+            self._OPEN_EXISTING, self._FILE_FLAG_BACKUP_SEMANTICS, None,
+        )
+        if handle in (None, ctypes.c_void_p(-1).value):
+            raise ctypes.WinError(ctypes.get_last_error())
+        return handle
+
+    def start(self) -> "Win32Watcher":
+        self._handle = self._open()  # fail here so the caller can fall back
+        return super().start()
+
+    def _run(self) -> None:
+        buf = ctypes.create_string_buffer(self._buffer_size)
+        nbytes = self._wintypes.DWORD()
+        try:
+            while not self._stop.is_set():
+                ok = self._k32.ReadDirectoryChangesW(
+                    self._handle, buf, len(buf), True, self._FILTER, ctypes.byref(nbytes), None, None
+                )
+                if self._stop.is_set():
+                    return
+                if not ok:
+                    self._emit(RESCAN, self.root)
+                    time.sleep(1.0)
+                    continue
+                if nbytes.value == 0:
+                    self._emit(RESCAN, self.root)  # overflow
+                    continue
+                self._parse(buf.raw[: nbytes.value])
+        finally:
+            self._k32.CloseHandle(self._handle)
+
+    def _parse(self, data: bytes) -> None:
+        offset = 0
+        while True:
+            next_off, action, name_len = struct.unpack_from("<III", data, offset)
+            name = data[offset + 12: offset + 12 + name_len].decode("utf-16-le", "replace")
+            kind = self._ACTIONS.get(action)
+            if kind:
+                self._emit(kind, os.path.join(self.root, name))
+            if not next_off:
+                return
+            offset += next_off
+
+    def stop(self) -> None:
+        super().stop()
+        if self._handle is not None:
+            # Unblocks the synchronous ReadDirectoryChangesW in _run
+            self._k32.CancelIoEx(self._handle, None)
+
+
+class InotifyWatcher(_ThreadedWatcher):
+    """Linux inotify with a watch per directory (new directories are added)."""
+
+    backend = "inotify"
+    _IN_MODIFY = 0x2
+    _IN_CLOSE_WRITE = 0x8
+    _IN_MOVED_FROM = 0x40
+    _IN_MOVED_TO = 0x80
+    _IN_CREATE = 0x100
+    _IN_DELETE = 0x200
+    _IN_Q_OVERFLOW = 0x4000
+    _IN_ISDIR = 0x40000000
+    _MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+
+    def __init__(self, root: str, callback: EventCallback) -> None:
+        super().__init__(root, callback)
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self._fd = -1
+        self._wds: dict[int, str] = {}
+
+    def _add_tree(self, top: str, emit: bool) -> None:
+        for dirpath, _dirs, files in os.walk(top):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(dirpath), self._MASK)
+            if wd >= 0:
+                self._wds[wd] = dirpath
+            if emit:
+                # Files created before the watch on a new directory existed
+                for fn in files:
+                    self._emit(CREATED, os.path.join(dirpath, fn))
+
+    def start(self) -> "InotifyWatcher":
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._add_tree(self.root, emit=False)
+        return super().start()
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                ready, _, _ = select.select([self._fd], [], [], 0.5)
+                if not ready:
+                    continue
+                try:
+                    data = os.read(self._fd, 64 * 1024)
+                except BlockingIOError:
+                    continue
+                self._parse(data)
+        finally:
+            os.close(self._fd)
+
+    def _parse(self, data: bytes) -> None:
+        offset = 0
+        while offset + 16 <= len(data):
+            wd, mask, _cookie, length = struct.unpack_from("iIII", data, offset)
+            name = os.fsdecode(data[offset + 16: offset + 16 + length].rstrip(b"\0"))
+            offset += 16 + length
+            if mask & self._IN_Q_OVERFLOW:
+                self._emit(RESCAN, self.root)
+                continue
+            base = self._wds.get(wd)
+            if base is None:
+                continue
+            path = os.path.join(base, name) if name else base
+            if mask & self._IN_ISDIR:
+                if mask & (self._IN_CREATE | self._IN_MOVED_TO):
+                    self._add_tree(path, emit=True)
+                    self._emit(CREATED, path)
+                continue
+            if mask & (self._IN_CREATE | self._IN_MOVED_TO):
+                self._emit(CREATED, path)
+            elif mask & (self._IN_MODIFY | self._IN_CLOSE_WRITE):
+                self._emit(MODIFIED, path)
+            elif mask & (self._IN_DELETE | self._IN_MOVED_FROM):
+                self._emit(DELETED, path)
+
+
+class PollingWatcher(_ThreadedWatcher):
+    """Snapshot diff every *interval* seconds (last resort)."""
+
+    backend = "poll"
+
+    def __init__(self, root: str, callback: EventCallback, interval: float = POLL_INTERVAL) -> None:
+        super().__init__(root, callback)
+        self.interval = interval
+        self._snap: dict[str, tuple[float, int]] = {}
+
+    def _scan(self) -> dict[str, tuple[float, int]]:
+        snap: dict[str, tuple[float, int]] = {}
+        stack = [self.root]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for e in it:
+                        try:
+                            if e.is_dir(follow_symlinks=False):
+                                stack.append(e.path)
+                            else:
+                                st = e.stat()
+                                snap[e.path] = (st.st_mtime, st.st_size)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        return snap
+
+    def start(self) -> "PollingWatcher":
+        self._snap = self._scan()
+        return super().start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            new = self._scan()
+            for path, sig in new.items():
+                old = self._snap.get(path)
+                if old is None:
+                    self._emit(CREATED, path)
+                elif old != sig:
+                    self._emit(MODIFIED, path)
+            for path in self._snap.keys() - new.keys():
+                self._emit(DELETED, path)
+            self._snap = new
+# endregion
+
+# region Backend selection
+def create_watcher(root: str, callback: EventCallback, *, prefer: str | None = None,
+                   poll_interval: float = POLL_INTERVAL) -> _ThreadedWatcher:
+    """Start and return the best watcher for this OS, falling back to polling."""
+    if prefer == PollingWatcher.backend:
+        return PollingWatcher(root, callback, poll_interval).start()
+    order = [prefer] if prefer else []
+    if os.name == "nt":
+        order.append("win32")
+    elif sys.platform.startswith("linux"):
+        order.append("inotify")
+    for name in order:
+        try:
+            if name == "win32":
+                return Win32Watcher(root, callback).start()
+            if name == "inotify":
+                return InotifyWatcher(root, callback).start()
+        except Exception:
+            continue
+    return PollingWatcher(root, callback, poll_interval).start()
+# endregion
+
+# region Build output watcher
+def _output_dir(build_root: str, path: str) -> str | None:
+    """``<root>/Build_*/outputBuild_*`` containing *path*, if any."""
+    try:
+        rel = os.path.relpath(path, build_root)
+    except ValueError:
+        return None
+    parts = rel.replace("\\", "/").split("/")
+    if len(parts) >= 2 and parts[0].lower().startswith("build_") and parts[1].lower().startswith("outputbuild_"):
+        return os.path.join(build_root, parts[0], parts[1])
+    return None
+
+
+def _newer(path: str, since: float | None) -> bool:
+    if since is None:
+        return True
+    try:
+        return os.stat(path).st_mtime >= since
+    except OSError:
+        return False
+
+
+def _has_obj(obj_dir: str, since: float | None = None) -> bool:
+    for root, _dirs, files in os.walk(obj_dir):
+        if any(fn.lower().endswith(".obj") and _newer(os.path.join(root, fn), since) for fn in files):
+            return True
+    return False
+
+
+class BuildOutputWatcher:
+    """Report PhotoMesh output milestones under a project folder.
+
+    ``on_first_obj(obj_dir)`` fires once, when the first ``.obj`` file shows
+    up in an ``outputBuild_*/OBJ`` tree.  ``on_complete(output_dir)`` fires
+    once the ``Output-CenterPivotOrigin.json`` marker exists and the output
+    folder has been quiet for *settle* seconds, or when :meth:`complete` is
+    called (``settle=None`` waits for that alone).  Both run on a watcher
+    thread.  Output already on disk when :meth:`start` runs is reported
+    unless it is older than *since* (a ``time.time()`` value).
+    """
+
+    def __init__(
+        self,
+        build_root: str,
+        on_first_obj: Callable[[str], None] | None = None,
+        on_complete: Callable[[str], None] | None = None,
+        *,
+        settle: float | None = SETTLE_SECS,
+        since: float | None = None,
+        prefer: str | None = None,
+        poll_interval: float = POLL_INTERVAL,
+    ) -> None:
+        self.build_root = os.path.abspath(build_root)
+        self.on_first_obj = on_first_obj
+        self.on_complete = on_complete
+        self.settle = settle
+        self.since = since
+        self.prefer = prefer
+        self.poll_interval = poll_interval
+        self.obj_dir: str | None = None
+        self.output_dir: str | None = None
+        self._marker_dirs: set[str] = set()
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+        self._watcher: _ThreadedWatcher | None = None
+        self.done = threading.Event()
+
+    @property
+    def backend(self) -> str:
+        return self._watcher.backend if self._watcher else ""
+
+    # -- events -----------------------------------------------------------
+    def _first_obj(self, obj_dir: str) -> None:
+        with self._lock:
+            if self.obj_dir is not None:
+                return
+            self.obj_dir = obj_dir
+        if self.on_first_obj:
+            self.on_first_obj(obj_dir)
+
+    def _arm(self, odir: str) -> None:
+        with self._lock:
+            if self.output_dir is not None or self.settle is None:
+                return
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.settle, self._fire_complete, args=(odir,))
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _fire_complete(self, odir: str) -> None:
+        with self._lock:
+            if self.output_dir is not None:
+                return
+            self.output_dir = odir
+        if self.obj_dir is None:
+            obj_dir = os.path.join(odir, "OBJ")
+            if _has_obj(obj_dir, self.since):
+                self._first_obj(obj_dir)
+        if self.on_complete:
+            self.on_complete(odir)
+        self.done.set()
+        self.stop()
+
+    def _on_event(self, ev: FsEvent) -> None:
+        if ev.kind == RESCAN:
+            self._scan_existing()
+            return
+        if ev.kind == DELETED:
+            return
+        odir = _output_dir(self.build_root, ev.path)
+        if odir is None:
+            return
+        name = os.path.basename(ev.path).lower()
+        if name.endswith(".obj"):
+            rel = os.path.relpath(ev.path, odir).replace("\\", "/").split("/")
+            if rel[0].lower() == "obj":
+                self._first_obj(os.path.join(odir, rel[0]))
+        if name == OUTPUT_MARKER:
+            self._marker_dirs.add(odir)
+        if odir in self._marker_dirs:
+            # Any write in a marked output restarts the quiet period
+            self._arm(odir)
+
+    def _scan_existing(self) -> None:
+        try:
+            builds = [e.path for e in os.scandir(self.build_root) if e.is_dir() and e.name.lower().startswith("build_")]
+        except OSError:
+            return
+        for bdir in builds:
+            try:
+                outs = [e.path for e in os.scandir(bdir) if e.is_dir() and e.name.lower().startswith("outputbuild_")]
+            except OSError:
+                continue
+            for odir in outs:
+                obj_dir = os.path.join(odir, "OBJ")
+                if self.obj_dir is None and os.path.isdir(obj_dir) and _has_obj(obj_dir, self.since):
+                    self._first_obj(obj_dir)
+                for root, _dirs, files in os.walk(odir):
+                    if any(fn.lower() == OUTPUT_MARKER and _newer(os.path.join(root, fn), self.since) for fn in files):
+                        self._marker_dirs.add(odir)
+                        self._arm(odir)
+                        break
+
+    # -- external completion ----------------------------------------------
+    def defer_completion(self) -> None:
+        """Stop using the quiet-period guess; only :meth:`complete` finishes."""
+        with self._lock:
+            self.settle = None
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def complete(self, output_dir: str | None = None) -> bool:
+        """Finish now (e.g. the queue reported the build done).
+
+        Uses *output_dir*, else the newest output folder with a marker.
+        Returns False when there is no such folder yet.
+        """
+        if output_dir is None:
+            if not self._marker_dirs:
+                self._scan_existing()
+            dirs = sorted(self._marker_dirs, key=lambda d: os.stat(d).st_mtime if os.path.isdir(d) else 0.0)
+            if not dirs:
+                return False
+            output_dir = dirs[-1]
+        self._fire_complete(output_dir)
+        return True
+
+    # -- lifecycle --------------------------------------------------------
+    def start(self) -> "BuildOutputWatcher":
+        self._watcher = create_watcher(
+            self.build_root, self._on_event, prefer=self.prefer, poll_interval=self.poll_interval
+        )
+        # After the watcher exists, so nothing falls between scan and watch
+        threading.Thread(target=self._scan_existing, name="build-output-scan", daemon=True).start()
+        return self
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self.done.wait(timeout)
+
+    def stop(self) -> None:
+        if self._watcher is not None:
+            self._watcher.stop()
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+# endregion
+
+__all__ = [
+    "BuildOutputWatcher",
+    "CREATED",
+    "DELETED",
+    "FsEvent",
+    "InotifyWatcher",
+    "MODIFIED",
+    "PollingWatcher",
+    "RESCAN",
+    "SETTLE_SECS",
+    "Win32Watcher",
+    "create_watcher",
+]
@@ -0,0 +1,269 @@
+# =============================================================================
+# Project: VBS4Project
+# File: fuser_autoscaler.py
+# Purpose: Choose the local fuser count from cores, RAM, disk load and queue
+# =============================================================================
+# Table of Contents
+#   1) Imports
+#   2) Constants & Configuration
+#   3) Data Models / Types
+#   4) Signals
+#   5) Policy
+#   6) Autoscaler (hysteresis)
+#   7) Shared instance
+# =============================================================================
+
+# region Imports
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+try:
+    import psutil
+except Exception:  # pragma: no cover - psutil may not be installed
+    psutil = None
+
+from process_watch import ProcessWatch, get_process_watch
+# endregion
+
+# region Constants & Configuration
+MAX_FUSERS = 8
+# A PhotoMesh fuser saturates roughly this many physical cores ...
+CORES_PER_FUSER = 4
+# ... and wants about this much RAM; the rest of the box keeps a reserve
+GB = 1024 ** 3
+RAM_PER_FUSER = 8 * GB
+RAM_RESERVE = 6 * GB
+# Average disk queue (sum of IO time / wall time) above which we back off
+DISK_QUEUE_HIGH = 2.0
+# Processes that mean "this box is running a simulator right now"
+SIMULATOR_IMAGES = ("vbs4.exe", "blueig.exe", "vbs4_x64.exe")
+
+# Hysteresis: a new target must be seen this many evaluations in a row ...
+CONFIRM_UP = 3
+CONFIRM_DOWN = 2
+# ... and targets change at most once per cooldown (simulators excepted)
+COOLDOWN_SECS = 120.0
+
+ROLE_HOST = "host"
+ROLE_FUSER = "fuser"
+ROLE_NONE = "none"
+# endregion
+
+# region Data Models / Types
+@dataclass(frozen=True)
+class HostSignals:
+    cores: int
+    mem_total: int
+    mem_available: int
+    disk_queue: float
+    # None when the Project Queue cannot be asked (e.g. not on this box)
+    queue_active: bool | None
+    simulator: str | None = None
+    fuser_rss: int = 0
+
+
+@dataclass(frozen=True)
+class Decision:
+    """What the autoscaler wants now and why."""
+
+    target: int
+    computed: int
+    reason: str
+    override: int | None = None
+    signals: HostSignals | None = None
+
+    def describe(self) -> str:
+        if self.override is not None:
+            return f"{self.target} (override; auto would be {self.computed})"
+        return f"{self.target} ({self.reason})"
+# endregion
+
+# region Signals
+class SignalCollector:
+    """Gather host signals; disk queue is measured between two calls."""
+
+    def __init__(
+        self,
+        queue_active: Callable[[], bool | None] | None = None,
+        simulators: tuple[str, ...] = SIMULATOR_IMAGES,
+        fuser_image: str = "photomeshfuser.exe",
+        watch: ProcessWatch | None = None,
+    ) -> None:
+        self.queue_active = queue_active or (lambda: None)
+        self.simulators = tuple(s.lower() for s in simulators)
+        self.fuser_image = fuser_image.lower()
+        self._watch = watch
+        self._last_disk: tuple[float, float] | None = None
+
+    def _disk_queue(self) -> float:
+        try:
+            io = psutil.disk_io_counters()
+            busy_ms = float(getattr(io, "busy_time", 0) or (io.read_time + io.write_time))
+        except Exception:
+            return 0.0
+        now = time.monotonic()
+        last, self._last_disk = self._last_disk, (now, busy_ms)
+        if last is None or now <= last[0]:
+            return 0.0
+        return max(0.0, (busy_ms - last[1]) / ((now - last[0]) * 1000.0))
+
+    def collect(self) -> HostSignals:
+        watch = self._watch or get_process_watch()
+        sim = watch.first_running(self.simulators)
+        simulator = sim.name if sim else None
+        cores = os.cpu_count() or 1
+        if psutil is None:
+            return HostSignals(cores, 0, 0, 0.0, self._queue(), simulator)
+        cores = psutil.cpu_count(logical=False) or cores
+        vm = psutil.virtual_memory()
+        fuser_rss = 0
+        for pid in watch.pids(self.fuser_image):
+            try:
+                fuser_rss += psutil.Process(pid).memory_info().rss
+            except Exception:
+                pass
+        return HostSignals(cores, vm.total, vm.available, self._disk_queue(), self._queue(), simulator, fuser_rss)
+
+    def _queue(self) -> bool | None:
+        try:
+            return self.queue_active()
+        except Exception:
+            return None
+# endregion
+
+# region Policy
+def compute_target(sig: HostSignals, role: str) -> tuple[int, str]:
+    """Return ``(fuser_count, reason)`` for *sig* without hysteresis."""
+    if role == ROLE_NONE:
+        return 0, "not a fuser computer"
+    if sig.simulator:
+        return 0, f"{sig.simulator} running"
+    by_cpu = max(1, sig.cores // CORES_PER_FUSER)
+    if sig.mem_total:
+        # Memory already held by our fusers is theirs to keep
+        usable = sig.mem_available + sig.fuser_rss - RAM_RESERVE
+        by_mem = max(1, int(usable // RAM_PER_FUSER))
+    else:
+        by_mem = by_cpu
+    target = min(by_cpu, by_mem, MAX_FUSERS)
+    reason = f"{sig.cores} cores, {sig.mem_available / GB:.0f} GB free"
+    if sig.disk_queue > DISK_QUEUE_HIGH and target > 1:
+        target -= 1
+        reason += f", disk queue {sig.disk_queue:.1f}"
+    if role == ROLE_HOST:
+        # The host also serves the share and the Project Queue
+        target = min(target, 2 if sig.queue_active else 1)
+        reason += ", host"
+    elif sig.queue_active is False:
+        target = min(target, 1)
+        reason += ", queue idle"
+    return target, reason
+
+
+def parse_override(value: str | None) -> int | None:
+    """``""``/``"auto"`` -> ``None``; otherwise a clamped fuser count."""
+    value = (value or "").strip().lower()
+    if value in ("", "auto"):
+        return None
+    try:
+        return max(0, min(MAX_FUSERS, int(value)))
+    except ValueError:
+        return None
+# endregion
+
+# region Autoscaler (hysteresis)
+class FuserAutoscaler:
+    """Turn noisy per-evaluation targets into a stable fuser count.
+
+    A different target has to be computed :data:`CONFIRM_UP` (or
+    :data:`CONFIRM_DOWN`) evaluations in a row and the previous change must
+    be older than :data:`COOLDOWN_SECS`.  A simulator starting on the box is
+    applied immediately.
+    """
+
+    def __init__(self, collector: SignalCollector | None = None) -> None:
+        self.collector = collector or SignalCollector()
+        self._lock = threading.Lock()
+        self.current: int | None = None
+        self._pending: int | None = None
+        self._streak = 0
+        self._changed_at = float("-inf")
+        self._role: str | None = None
+        self.last: Decision | None = None
+
+    def evaluate(self, role: str, override: int | None = None) -> Decision:
+        sig = self.collector.collect()
+        computed, reason = compute_target(sig, role)
+        with self._lock:
+            if role != self._role:
+                # A role change (e.g. "Fuser Computer" toggled) applies at once
+                self._role = role
+                self._clear()
+            if override is not None:
+                self.current, self._pending, self._streak = override, None, 0
+                decision = Decision(override, computed, reason, override, sig)
+            else:
+                decision = Decision(self._settle(computed, bool(sig.simulator)), computed, reason, None, sig)
+            self.last = decision
+            return decision
+
+    def _settle(self, computed: int, urgent: bool) -> int:
+        now = time.monotonic()
+        if self.current is None or (urgent and computed < self.current):
+            self.current, self._pending, self._streak = computed, None, 0
+            self._changed_at = now
+            return computed
+        if computed == self.current:
+            self._pending, self._streak = None, 0
+            return self.current
+        if computed == self._pending:
+            self._streak += 1
+        else:
+            self._pending, self._streak = computed, 1
+        needed = CONFIRM_UP if computed > self.current else CONFIRM_DOWN
+        if self._streak >= needed and now - self._changed_at >= COOLDOWN_SECS:
+            self.current, self._pending, self._streak = computed, None, 0
+            self._changed_at = now
+        return self.current
+
+    def _clear(self) -> None:
+        self.current, self._pending, self._streak = None, None, 0
+        self._changed_at = float("-inf")
+
+    def reset(self) -> None:
+        """Forget the settled count and cooldown; the next evaluation applies at once."""
+        with self._lock:
+            self._clear()
+# endregion
+
+# region Shared instance
+_AUTOSCALER: FuserAutoscaler | None = None
+_AUTOSCALER_LOCK = threading.Lock()
+
+
+def get_fuser_autoscaler(queue_active: Callable[[], bool | None] | None = None) -> FuserAutoscaler:
+    """Return the process-wide :class:`FuserAutoscaler`."""
+    global _AUTOSCALER
+    with _AUTOSCALER_LOCK:
+        if _AUTOSCALER is None:
+            _AUTOSCALER = FuserAutoscaler(SignalCollector(queue_active))
+        return _AUTOSCALER
+# endregion
+
+__all__ = [
+    "Decision",
+    "FuserAutoscaler",
+    "HostSignals",
+    "ROLE_FUSER",
+    "ROLE_HOST",
+    "ROLE_NONE",
+    "SignalCollector",
+    "compute_target",
+    "get_fuser_autoscaler",
+    "parse_override",
+]
@@ -0,0 +1,170 @@
+# =============================================================================
+# Project: VBS4Project
+# File: fuser_fanout.py
+# Purpose: Start fusers on many nodes at once through their command agents
+# =============================================================================
+# Table of Contents
+#   1) Imports
+#   2) Constants & Configuration
+#   3) Data Models / Types
+#   4) Fan-out
+#   5) Reporting
+# =============================================================================
+
+# region Imports
+from __future__ import annotations
+
+import ntpath
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+from command_client import CommandClient
+from share_inventory import run_parallel
+# endregion
+
+# region Constants & Configuration
+# Whole-node budget: connect + ps + one batched run request
+NODE_TIMEOUT = 10.0
+FUSER_DIR = r"C:\Program Files\Skyline\PhotoMesh\Fuser"
+
+STARTED = "started"
+RUNNING = "already running"
+FAILED = "failed"
+# endregion
+
+# region Data Models / Types
+@dataclass(frozen=True)
+class FuserJob:
+    """One fuser to bring up on node *ip*."""
+
+    ip: str
+    name: str
+    shared_path: str
+    fuser_exe: str
+    machine_name: str = ""
+
+    def command(self) -> dict:
+        # Per-fuser .bat files on the node win, as with the old SMB check,
+        # but the node itself looks for it instead of us probing \\ip\C$
+        bat = ntpath.join(FUSER_DIR, f"{self.name}.bat")
+        return {
+            "prefer": [bat],
+            "argv": [self.fuser_exe, self.name, self.shared_path, "0", "true"],
+        }
+
+
+@dataclass(frozen=True)
+class FuserResult:
+    ip: str
+    name: str
+    status: str
+    pid: int | None = None
+    detail: str = ""
+    machine_name: str = ""
+    seconds: float = 0.0
+
+    @property
+    def node(self) -> str:
+        return self.machine_name or self.ip
+# endregion
+
+# region Fan-out
+def _is_running(proc: dict, name: str) -> bool:
+    """Whether *proc* is fuser *name*: an argument, or the stem of its ``<name>.bat``."""
+    if not proc.get("running"):
+        return False
+    want = name.lower()
+    for arg in proc.get("argv", []):
+        arg = str(arg).lower()
+        if arg == want or ntpath.splitext(ntpath.basename(arg))[0] == want:
+            return True
+    return False
+
+
+def _launch_node(
+    ip: str, jobs: list[FuserJob], client_factory: Callable[[str], CommandClient], timeout: float
+) -> list[FuserResult]:
+    start = time.monotonic()
+    elapsed = lambda: round(time.monotonic() - start, 3)
+    try:
+        with client_factory(ip) as client:
+            client.timeout = timeout
+            procs = client.ps()
+            rows: list[FuserResult] = []
+            todo: list[FuserJob] = []
+            for job in jobs:
+                running = next((p for p in procs if _is_running(p, job.name)), None)
+                if running:
+                    rows.append(FuserResult(ip, job.name, RUNNING, running.get("pid"), "", job.machine_name))
+                else:
+                    todo.append(job)
+            if todo:
+                results = client.run(*(job.command() for job in todo))
+                for job, res in zip(todo, results):
+                    if res.get("error"):
+                        rows.append(FuserResult(ip, job.name, FAILED, None, res["error"], job.machine_name))
+                    else:
+                        rows.append(FuserResult(ip, job.name, STARTED, res.get("pid"), job.shared_path, job.machine_name))
+    except Exception as exc:
+        return [FuserResult(ip, j.name, FAILED, None, f"agent: {exc}", j.machine_name, elapsed()) for j in jobs]
+    return [FuserResult(r.ip, r.name, r.status, r.pid, r.detail, r.machine_name, elapsed()) for r in rows]
+
+
+def fan_out(
+    jobs: Iterable[FuserJob],
+    *,
+    timeout: float = NODE_TIMEOUT,
+    client_factory: Callable[[str], CommandClient] = CommandClient,
+) -> list[FuserResult]:
+    """Start *jobs* on their nodes in parallel; one batched request per node.
+
+    Each node gets *timeout* seconds; a node that has not answered by then
+    is reported as failed without holding up the others.  Results keep the
+    order of *jobs*.
+    """
+    jobs = list(jobs)
+    by_node: dict[str, list[FuserJob]] = {}
+    for job in jobs:
+        by_node.setdefault(job.ip, []).append(job)
+    answers = run_parallel(
+        {ip: (lambda ip=ip, js=js: _launch_node(ip, js, client_factory, timeout)) for ip, js in by_node.items()},
+        timeout + 1.0,
+    )
+    rows: dict[tuple[str, str], FuserResult] = {}
+    for ip, node_jobs in by_node.items():
+        node_rows = answers.get(ip)
+        if node_rows is None:
+            node_rows = [FuserResult(ip, j.name, FAILED, None, "timed out", j.machine_name, timeout) for j in node_jobs]
+        for row in node_rows:
+            rows[(row.ip, row.name)] = row
+    return [rows[(j.ip, j.name)] for j in jobs]
+# endregion
+
+# region Reporting
+def format_results(results: list[FuserResult]) -> str:
+    """Return an aligned text table plus a one-line summary."""
+    header = ("Node", "Fuser", "Status", "PID", "Detail")
+    body = [(r.node, r.name, r.status, str(r.pid or ""), r.detail) for r in results]
+    widths = [max(len(row[i]) for row in [header] + body) for i in range(4)]
+    lines = []
+    for row in [header] + body:
+        lines.append("  ".join(cell.ljust(widths[i]) for i, cell in enumerate(row[:4])) + "  " + row[4])
+    counts = {s: sum(r.status == s for r in results) for s in (STARTED, RUNNING, FAILED)}
+    slowest = max((r.seconds for r in results), default=0.0)
+    lines.append(
+        f"{counts[STARTED]} started, {counts[RUNNING]} already running, {counts[FAILED]} failed "
+        f"across {len({r.ip for r in results})} node(s); slowest node {slowest:.2f} s"
+    )
+    return "\n".join(lines)
+# endregion
+
+__all__ = [
+    "FAILED",
+    "RUNNING",
+    "STARTED",
+    "FuserJob",
+    "FuserResult",
+    "fan_out",
+    "format_results",
+]
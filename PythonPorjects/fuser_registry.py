@@ -0,0 +1,317 @@
+# =============================================================================
+# Project: VBS4Project
+# File: fuser_registry.py
+# Purpose: Persisted PID registry of local fusers with surgical scale-down
+# =============================================================================
+# Table of Contents
+#   1) Imports
+#   2) Constants & Configuration
+#   3) Data Models / Types
+#   4) Process helpers
+#   5) Registry
+#   6) Shared instance
+# =============================================================================
+
+# region Imports
+from __future__ import annotations
+
+import json
+import os
+import re
+import subprocess
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable
+
+try:
+    import psutil
+except Exception:  # pragma: no cover - psutil may not be installed
+    psutil = None
+
+from process_watch import ProcessWatch, get_process_watch
+# endregion
+
+# region Constants & Configuration
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_REGISTRY_PATH = os.path.join(BASE_DIR, "fuser_registry.json")
+FUSER_IMAGE = "photomeshfuser.exe"
+NAME_PREFIX = "LocalFuser"
+# Unregistered fusers (started by hand or by an older build) are adopted from
+# the shared process index at most this often; in between, reconcile checks
+# PIDs only
+ADOPT_INTERVAL = 60.0
+TERMINATE_TIMEOUT = 10.0
+
+# Same visible console the old `start ""` gave each fuser
+_CREATION_FLAGS = getattr(subprocess, "CREATE_NEW_CONSOLE", 0)
+_NAME_RE = re.compile(rf"^{NAME_PREFIX}(\d+)$", re.IGNORECASE)
+_SCRIPT_EXTS = (".bat", ".cmd")
+# endregion
+
+# region Data Models / Types
+@dataclass
+class FuserRecord:
+    pid: int
+    name: str
+    started: float = field(default_factory=time.time)
+    # psutil create_time, used to detect a PID reused by another process
+    create_time: float | None = None
+    argv: list[str] = field(default_factory=list)
+    adopted: bool = False
+# endregion
+
+# region Process helpers
+def _create_time(pid: int) -> float | None:
+    if psutil is None:
+        return None
+    try:
+        return psutil.Process(pid).create_time()
+    except Exception:
+        return None
+
+
+def pid_alive(pid: int, create_time: float | None = None) -> bool:
+    """Return whether *pid* is running (and is the same process, if known)."""
+    if psutil is not None:
+        try:
+            proc = psutil.Process(pid)
+            if create_time is not None and abs(proc.create_time() - create_time) > 1.0:
+                return False
+            return proc.status() != psutil.STATUS_ZOMBIE
+        except Exception:
+            return False
+    if os.name == "nt":
+        import ctypes
+
+        k32 = ctypes.WinDLL("kernel32")
+        handle = k32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        try:
+            code = ctypes.c_ulong()
+            ok = k32.GetExitCodeProcess(handle, ctypes.byref(code))
+            return bool(ok) and code.value == 259  # STILL_ACTIVE
+        finally:
+            k32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except OSError:
+        return False
+    return True
+
+
+def terminate_tree(pid: int, timeout: float = TERMINATE_TIMEOUT) -> bool:
+    """Stop *pid* and its children (a .bat launch leaves cmd.exe as parent)."""
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            procs = root.children(recursive=True) + [root]
+        except Exception:
+            return False
+        for p in procs:
+            try:
+                p.terminate()
+            except Exception:
+                pass
+        _, alive = psutil.wait_procs(procs, timeout=timeout)
+        for p in alive:
+            try:
+                p.kill()
+            except Exception:
+                pass
+        return True
+    if os.name == "nt":
+        rc = subprocess.run(
+            ["taskkill", "/PID", str(pid), "/T", "/F"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        ).returncode
+        return rc == 0
+    try:
+        os.kill(pid, 15)
+    except OSError:
+        return False
+    return True
+# endregion
+
+# region Registry
+class FuserRegistry:
+    """Know exactly which fuser processes this PC runs.
+
+    * :meth:`spawn` starts a fuser with ``Popen`` (no ``cmd /c start``), so
+      its PID, name and start time are recorded and persisted.
+    * :meth:`reconcile` drops dead or PID-reused entries with one cheap
+      per-PID check; unregistered fusers are adopted from the shared
+      :mod:`process_watch` index at most every :data:`ADOPT_INTERVAL` seconds.
+    * :meth:`scale_down` terminates only the surplus, newest first, so the
+      longest-running fusers (and their in-flight work) survive.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_REGISTRY_PATH,
+        *,
+        spawn: Callable[..., subprocess.Popen] = subprocess.Popen,
+        image: str = FUSER_IMAGE,
+        watch: ProcessWatch | None = None,
+    ) -> None:
+        self.path = path
+        self._popen = spawn
+        self.image = image.lower()
+        self._watch = watch
+        self._lock = threading.RLock()
+        self._records: dict[int, FuserRecord] = {}
+        self._last_adopt = float("-inf")
+        self._load()
+
+    # -- persistence ------------------------------------------------------
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            for item in raw.get("fusers", []):
+                rec = FuserRecord(**item)
+                self._records[rec.pid] = rec
+        except Exception:
+            self._records = {}
+
+    def _save(self) -> None:
+        payload = {"fusers": [asdict(r) for r in self._records.values()]}
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(payload, f, indent=1)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    # -- reconciliation ---------------------------------------------------
+    @property
+    def watch(self) -> ProcessWatch:
+        if self._watch is None:
+            self._watch = get_process_watch()
+        return self._watch
+
+    def _launched_by_script(self) -> bool:
+        return any(
+            not r.adopted and r.argv and os.path.splitext(r.argv[0])[1].lower() in _SCRIPT_EXTS
+            for r in self._records.values()
+        )
+
+    def _adopt(self) -> bool:
+        """Record fusers nobody registered; children of registered launchers are skipped.
+
+        A ``LocalFuserN.bat`` launch registers the batch file's cmd.exe, so
+        the PhotoMeshFuser.exe below it is already counted.  Without
+        parentage (tasklist scanner) nothing is adopted while such a launch
+        is live, rather than counting it twice.
+        """
+        self._last_adopt = time.monotonic()
+        changed = False
+        for info in self.watch.processes(self.image):
+            # The index can lag an exit by one tick; confirm before adopting
+            if info.pid in self._records or not pid_alive(info.pid, info.create_time):
+                continue
+            chain = self.watch.ancestors(info.pid)
+            if chain is None:
+                if self._launched_by_script():
+                    continue
+            elif any(pid in self._records for pid in chain):
+                continue
+            cmd: list[str] = []
+            if psutil is not None:
+                try:
+                    cmd = psutil.Process(info.pid).cmdline()
+                except Exception:
+                    pass
+            name = cmd[1] if len(cmd) > 1 else f"pid{info.pid}"
+            self._records[info.pid] = FuserRecord(
+                info.pid, name, info.create_time or time.time(), info.create_time, cmd, True
+            )
+            changed = True
+        return changed
+
+    def reconcile(self, full: bool = False) -> list[FuserRecord]:
+        """Return live fusers, oldest first, after pruning dead entries."""
+        with self._lock:
+            dead = [pid for pid, r in self._records.items() if not pid_alive(pid, r.create_time)]
+            for pid in dead:
+                del self._records[pid]
+            adopted = False
+            if full or time.monotonic() - self._last_adopt >= ADOPT_INTERVAL:
+                adopted = self._adopt()
+            if dead or adopted:
+                self._save()
+            return sorted(self._records.values(), key=lambda r: r.started)
+
+    def live(self) -> list[FuserRecord]:
+        with self._lock:
+            return sorted(self._records.values(), key=lambda r: r.started)
+
+    # -- scaling ----------------------------------------------------------
+    def free_indices(self, count: int) -> list[int]:
+        """Return the *count* lowest ``LocalFuserN`` numbers not in use."""
+        with self._lock:
+            used = {int(m.group(1)) for r in self._records.values() if (m := _NAME_RE.match(r.name))}
+        out, i = [], 1
+        while len(out) < count:
+            if i not in used:
+                out.append(i)
+            i += 1
+        return out
+
+    def spawn(self, name: str, argv: list[str], cwd: str | None = None) -> FuserRecord:
+        """Start one fuser and record it; raises whatever ``Popen`` raises."""
+        proc = self._popen(argv, cwd=cwd, creationflags=_CREATION_FLAGS)
+        rec = FuserRecord(proc.pid, name, time.time(), _create_time(proc.pid), list(argv))
+        with self._lock:
+            self._records[rec.pid] = rec
+            self._save()
+        self.watch.poke()
+        return rec
+
+    def scale_down(self, desired: int) -> list[FuserRecord]:
+        """Terminate the newest fusers beyond *desired*; return those stopped."""
+        live = self.reconcile(full=True)
+        surplus = live[max(0, desired):][::-1]
+        stopped = []
+        for rec in surplus:
+            if terminate_tree(rec.pid):
+                stopped.append(rec)
+            with self._lock:
+                self._records.pop(rec.pid, None)
+        if surplus:
+            with self._lock:
+                self._save()
+            self.watch.poke()
+        return stopped
+
+    def forget_all(self) -> None:
+        """Drop every record (after an explicit kill-all)."""
+        with self._lock:
+            self._records.clear()
+            self._save()
+# endregion
+
+# region Shared instance
+_REGISTRY: FuserRegistry | None = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_fuser_registry() -> FuserRegistry:
+    """Return the process-wide :class:`FuserRegistry`."""
+    global _REGISTRY
+    with _REGISTRY_LOCK:
+        if _REGISTRY is None:
+            _REGISTRY = FuserRegistry()
+        return _REGISTRY
+# endregion
+
+__all__ = [
+    "FuserRecord",
+    "FuserRegistry",
+    "get_fuser_registry",
+    "pid_alive",
+    "terminate_tree",
+]
@@ -0,0 +1,310 @@
+# =============================================================================
+# Project: VBS4Project
+# File: fuser_telemetry.py
+# Purpose: Low-overhead per-fuser CPU/RSS/IO/handle sampler with ring buffers
+# =============================================================================
+# Table of Contents
+#   1) Imports
+#   2) Constants & Configuration
+#   3) Ring buffer
+#   4) Sampler
+#   5) Shared instance
+# =============================================================================
+
+# region Imports
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from array import array
+from typing import Iterable
+
+try:
+    import psutil
+except Exception:  # pragma: no cover - psutil may not be installed
+    psutil = None
+
+from process_watch import STARTED, ProcessEvent, get_process_watch
+# endregion
+
+# region Constants & Configuration
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DUMP_PATH = os.path.join(BASE_DIR, "fuser_telemetry.json")
+FUSER_IMAGE = "photomeshfuser.exe"
+
+SAMPLE_INTERVAL = 2.0
+# 30 minutes of history per fuser at the default interval
+HISTORY_SAMPLES = 900
+# New fusers arrive as process_watch events; the index is re-read this often
+# in case one was missed
+RESCAN_INTERVAL = 15.0
+# Histories of exited fusers kept for the JSON dump
+MAX_RETIRED = 32
+
+FIELDS = ("t", "cpu", "rss", "read_bytes", "write_bytes", "handles")
+# endregion
+
+# region Ring buffer
+class RingBuffer:
+    """Fixed-size, array-backed ring of float records (no per-sample objects)."""
+
+    __slots__ = ("capacity", "width", "_data", "_head", "_count")
+
+    def __init__(self, capacity: int, width: int = len(FIELDS)) -> None:
+        self.capacity = capacity
+        self.width = width
+        self._data = array("d", bytes(8 * capacity * width))
+        self._head = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, values: Iterable[float]) -> None:
+        base = self._head * self.width
+        for i, v in enumerate(values):
+            self._data[base + i] = v
+        self._head = (self._head + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def latest(self, back: int = 0) -> tuple[float, ...] | None:
+        """Return the newest record, or the one *back* records before it."""
+        if back >= self._count:
+            return None
+        base = ((self._head - 1 - back) % self.capacity) * self.width
+        return tuple(self._data[base:base + self.width])
+
+    def rows(self) -> list[tuple[float, ...]]:
+        """Return all records, oldest first."""
+        start = (self._head - self._count) % self.capacity
+        out = []
+        for k in range(self._count):
+            base = ((start + k) % self.capacity) * self.width
+            out.append(tuple(self._data[base:base + self.width]))
+        return out
+# endregion
+
+# region Sampler
+class _Tracked:
+    __slots__ = ("proc", "pid", "name", "created", "history")
+
+    def __init__(self, proc, capacity: int) -> None:
+        self.proc = proc
+        self.pid = proc.pid
+        self.created = proc.create_time()
+        try:
+            cmd = proc.cmdline()
+            self.name = cmd[1] if len(cmd) > 1 else proc.name()
+        except Exception:
+            self.name = str(proc.pid)
+        self.history = RingBuffer(capacity)
+        # Prime cpu_percent so the first real sample is meaningful
+        proc.cpu_percent(None)
+
+
+class FuserSampler:
+    """Sample every local fuser at a fixed interval on a daemon thread.
+
+    Process handles are kept between ticks, so a tick costs one ``oneshot``
+    read per fuser.  New fusers come from :mod:`process_watch` start events
+    (re-checked against its index every *rescan* seconds) or from
+    :meth:`track` when the toolkit itself starts a fuser.  The sampler's
+    own CPU use is measured and reported as :attr:`overhead_pct`.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval: float = SAMPLE_INTERVAL,
+        capacity: int = HISTORY_SAMPLES,
+        rescan: float = RESCAN_INTERVAL,
+        image: str = FUSER_IMAGE,
+    ) -> None:
+        self.interval = interval
+        self.capacity = capacity
+        self.rescan = rescan
+        self.image = image.lower()
+        self.available = psutil is not None
+        self._lock = threading.Lock()
+        self._tracked: dict[int, _Tracked] = {}
+        self._retired: list[_Tracked] = []
+        self._last_scan = float("-inf")
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._watch_token: int | None = None
+        self._cpu_used = 0.0
+        self._started_at = 0.0
+        self.ticks = 0
+
+    # -- tracking -------------------------------------------------------
+    def track(self, pid: int) -> bool:
+        """Start sampling *pid* now instead of waiting for the next rescan."""
+        if not self.available:
+            return False
+        with self._lock:
+            if pid in self._tracked:
+                return True
+            try:
+                self._tracked[pid] = _Tracked(psutil.Process(pid), self.capacity)
+            except Exception:
+                return False
+        return True
+
+    def _scan(self) -> None:
+        self._last_scan = time.monotonic()
+        for pid in get_process_watch().pids(self.image):
+            if pid not in self._tracked:
+                self.track(pid)
+
+    def _on_process(self, ev: ProcessEvent) -> None:
+        if ev.kind == STARTED:
+            self.track(ev.process.pid)
+
+    def _retire(self, t: _Tracked) -> None:
+        self._tracked.pop(t.pid, None)
+        self._retired.append(t)
+        del self._retired[:-MAX_RETIRED]
+
+    def _sample(self, t: _Tracked, now: float) -> bool:
+        p = t.proc
+        try:
+            with p.oneshot():
+                if p.create_time() != t.created:
+                    return False  # PID reused by another process
+                cpu = p.cpu_percent(None)
+                rss = p.memory_info().rss
+                try:
+                    io = p.io_counters()
+                    rd, wr = io.read_bytes, io.write_bytes
+                except Exception:
+                    rd = wr = 0
+                if hasattr(p, "num_handles"):
+                    handles = p.num_handles()
+                else:
+                    handles = p.num_fds()
+        except Exception:
+            return False
+        t.history.append((now, cpu, rss, rd, wr, handles))
+        return True
+
+    def tick(self) -> None:
+        """Take one sample of every tracked fuser (rescanning when due)."""
+        cpu0 = time.thread_time()
+        if time.monotonic() - self._last_scan >= self.rescan:
+            self._scan()
+        now = time.time()
+        with self._lock:
+            for t in list(self._tracked.values()):
+                if not self._sample(t, now):
+                    self._retire(t)
+            self.ticks += 1
+        self._cpu_used += time.thread_time() - cpu0
+
+    # -- lifecycle ------------------------------------------------------
+    def _run(self) -> None:
+        self.tick()
+        while not self._stop.wait(self.interval):
+            self.tick()
+
+    def start(self) -> "FuserSampler":
+        if not self.available or (self._thread and self._thread.is_alive()):
+            return self
+        self._stop.clear()
+        self._started_at = time.monotonic()
+        self._cpu_used = 0.0
+        self._thread = threading.Thread(target=self._run, name="fuser-telemetry", daemon=True)
+        self._thread.start()
+        if self._watch_token is None:
+            self._watch_token = get_process_watch().subscribe(self._on_process, [self.image])
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._watch_token is not None:
+            get_process_watch().unsubscribe(self._watch_token)
+            self._watch_token = None
+
+    @property
+    def overhead_pct(self) -> float:
+        """Sampler CPU time as a percentage of one core since :meth:`start`."""
+        wall = time.monotonic() - self._started_at
+        return 100.0 * self._cpu_used / wall if self._started_at and wall > 0 else 0.0
+
+    # -- views ----------------------------------------------------------
+    def latest(self) -> list[dict]:
+        """Return the newest sample of every live fuser.
+
+        ``io_rate`` is read + write bytes per second since the previous
+        sample (0 until a fuser has two).
+        """
+        with self._lock:
+            tracked = [(t, t.history.latest(), t.history.latest(1)) for t in self._tracked.values()]
+        out = []
+        for t, row, prev in tracked:
+            if row:
+                entry = {"pid": t.pid, "name": t.name, **dict(zip(FIELDS, row)), "io_rate": 0.0}
+                if prev and row[0] > prev[0]:
+                    # The byte counters are cumulative; clamp in case one resets
+                    moved = (row[3] + row[4]) - (prev[3] + prev[4])
+                    entry["io_rate"] = max(0.0, moved) / (row[0] - prev[0])
+                out.append(entry)
+        return out
+
+    def summary(self) -> str:
+        """One-line live view for the VBS4 panel."""
+        if not self.available:
+            return "Fuser telemetry unavailable (psutil not installed)"
+        rows = self.latest()
+        if not rows:
+            return "Fusers: none running"
+        cpu = sum(r["cpu"] for r in rows)
+        rss = sum(r["rss"] for r in rows) / (1024 * 1024)
+        io = sum(r["io_rate"] for r in rows) / (1024 * 1024)
+        handles = int(sum(r["handles"] for r in rows))
+        return (
+            f"Fusers: {len(rows)}  CPU {cpu:.0f}%  RSS {rss:,.0f} MB  "
+            f"IO {io:,.1f} MB/s  handles {handles}  (sampler {self.overhead_pct:.2f}%)"
+        )
+
+    def dump_json(self, path: str = DEFAULT_DUMP_PATH) -> str:
+        """Write every history (live and recently exited) to *path*."""
+        with self._lock:
+            entries = [(t, True) for t in self._tracked.values()] + [(t, False) for t in self._retired]
+            payload = {
+                "interval": self.interval,
+                "fields": list(FIELDS),
+                "overhead_pct": round(self.overhead_pct, 3),
+                "fusers": [
+                    {"pid": t.pid, "name": t.name, "alive": alive, "samples": t.history.rows()}
+                    for t, alive in entries
+                ],
+            }
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp, path)
+        return path
+# endregion
+
+# region Shared instance
+_SAMPLER: FuserSampler | None = None
+_SAMPLER_LOCK = threading.Lock()
+
+
+def get_fuser_sampler() -> FuserSampler:
+    """Return the process-wide :class:`FuserSampler` (started on first use)."""
+    global _SAMPLER
+    with _SAMPLER_LOCK:
+        if _SAMPLER is None:
+            _SAMPLER = FuserSampler().start()
+        return _SAMPLER
+# endregion
+
+__all__ = [
+    "FIELDS",
+    "FuserSampler",
+    "RingBuffer",
+    "get_fuser_sampler",
+]
@@ -0,0 +1,262 @@
+# =============================================================================
+# Project: VBS4Project
+# File: image_cache.py
+# Purpose: Decode-once, resize-once cache for wallpaper, logos and prompt art
+# =============================================================================
+# Table of Contents
+#   1) Imports
+#   2) Constants & Configuration
+#   3) Cache
+#   4) Shared instance
+# =============================================================================
+
+# region Imports
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from PIL import Image, ImageTk
+
+from startup_profiler import get_profiler
+# endregion
+
+# region Constants & Configuration
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DISK_CACHE_DIR = os.path.join(BASE_DIR, "image_cache")
+
+# Upper bound for decoded + resized pixels kept in memory
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+# Only variants at least this large are worth persisting (logos resize in µs)
+DISK_MIN_PIXELS = 256 * 256
+DISK_CACHE_VERSION = 2
+# Disk variants are keyed by live window sizes, so cap the directory: the
+# least recently used files go first once either limit is exceeded
+DISK_MAX_BYTES = 64 * 1024 * 1024
+DISK_MAX_AGE = 30 * 24 * 3600
+
+_RESAMPLE = Image.Resampling.LANCZOS
+_BYTES_PER_PIXEL = {"1": 1, "L": 1, "P": 1, "RGB": 3, "RGBA": 4, "CMYK": 4}
+# endregion
+
+# region Cache
+def _image_bytes(img: Image.Image) -> int:
+    w, h = img.size
+    return w * h * _BYTES_PER_PIXEL.get(img.mode, 4)
+
+
+class ImageCache:
+    """LRU of decoded and resized images keyed by ``(path, mtime, size)``.
+
+    * Each source file is decoded once; every target size is resized once.
+    * :meth:`photo` hands out one shared ``PhotoImage`` per variant, so every
+      panel and dialog showing the same art reuses the same Tk image.
+    * Entries are evicted least-recently-used once ``max_bytes`` is exceeded.
+      Widgets keep their own reference, so eviction never blanks a label.
+    * With *disk_dir* set, large resized variants are written next to the
+      toolkit so a cold start can skip the LANCZOS resize.  The directory is
+      pruned to ``DISK_MAX_BYTES`` / ``DISK_MAX_AGE`` after every write.
+
+    ``photo`` must be called from the Tk thread; ``image`` is thread-safe.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, disk_dir: str | None = None) -> None:
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self._lock = threading.RLock()
+        # key -> (PIL image, bytes)
+        self._images: OrderedDict[tuple, tuple[Image.Image, int]] = OrderedDict()
+        # key -> PhotoImage
+        self._photos: dict[tuple, ImageTk.PhotoImage] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    # -- keys & bookkeeping ---------------------------------------------
+    @staticmethod
+    def _stamp(path: str) -> tuple[str, int, int]:
+        st = os.stat(path)
+        return os.path.normcase(os.path.abspath(path)), st.st_mtime_ns, st.st_size
+
+    def _lookup(self, key: tuple) -> Image.Image | None:
+        with self._lock:
+            entry = self._images.get(key)
+            if entry is None:
+                return None
+            self._images.move_to_end(key)
+            return entry[0]
+
+    def _store(self, key: tuple, img: Image.Image) -> None:
+        size = _image_bytes(img)
+        with self._lock:
+            old = self._images.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._images[key] = (img, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and len(self._images) > 1:
+                old_key, (_, old_size) = self._images.popitem(last=False)
+                self._bytes -= old_size
+                self._photos.pop(old_key, None)
+
+    # -- disk variants --------------------------------------------------
+    @staticmethod
+    def _disk_format(img: Image.Image, source_fmt: str) -> str:
+        """JPEG only for opaque variants of JPEG sources; PNG keeps the rest lossless."""
+        if source_fmt == "JPEG" and img.mode in ("RGB", "L") and "transparency" not in img.info:
+            return "JPEG"
+        return "PNG"
+
+    def _disk_path(self, key: tuple, fmt: str) -> str | None:
+        if not self.disk_dir:
+            return None
+        digest = hashlib.sha1(repr((DISK_CACHE_VERSION,) + key).encode("utf-8")).hexdigest()
+        ext = ".jpg" if fmt == "JPEG" else ".png"
+        return os.path.join(self.disk_dir, digest + ext)
+
+    def _load_disk(self, key: tuple, source_fmt: str) -> Image.Image | None:
+        # A JPEG source may still have a PNG variant (alpha or palette modes)
+        fmts = ("JPEG", "PNG") if source_fmt == "JPEG" else ("PNG",)
+        for fmt in fmts:
+            path = self._disk_path(key, fmt)
+            if path and os.path.isfile(path):
+                break
+        else:
+            return None
+        try:
+            with Image.open(path) as img:
+                img.load()
+                img = img.copy()
+        except Exception:
+            return None
+        try:
+            # Refresh the mtime so pruning treats it as recently used
+            os.utime(path)
+        except OSError:
+            pass
+        return img
+
+    def _save_disk(self, key: tuple, source_fmt: str, img: Image.Image) -> None:
+        fmt = self._disk_format(img, source_fmt)
+        path = self._disk_path(key, fmt)
+        if not path:
+            return
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            tmp = path + ".tmp"
+            if fmt == "JPEG":
+                img.save(tmp, "JPEG", quality=92)
+            else:
+                img.save(tmp, "PNG")
+            os.replace(tmp, path)
+        except Exception:
+            return
+        self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        """Drop disk variants older than ``DISK_MAX_AGE`` or beyond ``DISK_MAX_BYTES``."""
+        try:
+            with os.scandir(self.disk_dir) as it:
+                files = [(e.stat().st_mtime, e.stat().st_size, e.path) for e in it if e.is_file()]
+        except OSError:
+            return
+        files.sort(reverse=True)
+        cutoff = time.time() - DISK_MAX_AGE
+        total = 0
+        for mtime, size, path in files:
+            total += size
+            if total > DISK_MAX_BYTES or mtime < cutoff:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    # -- public API -----------------------------------------------------
+    def image(self, path: str, size: tuple[int, int] | None = None, mode: str | None = None) -> Image.Image:
+        """Return *path* decoded (and converted to *mode*) and resized to *size*.
+
+        The returned image is shared; callers must not modify it in place.
+        """
+        stamp = self._stamp(path)
+        src_key = stamp + (None, mode)
+        key = stamp + (tuple(size) if size else None, mode)
+        img = self._lookup(key)
+        if img is not None:
+            self.hits += 1
+            return img
+        self.misses += 1
+
+        src = self._lookup(src_key)
+        source_fmt = ""
+        if size and size[0] * size[1] >= DISK_MIN_PIXELS:
+            source_fmt = "JPEG" if os.path.splitext(path)[1].lower() in (".jpg", ".jpeg") else "PNG"
+            img = self._load_disk(key, source_fmt)
+            if img is not None:
+                self._store(key, img)
+                return img
+        if src is None:
+            with get_profiler().span(f"decode {os.path.basename(path)}", "images"), Image.open(path) as raw:
+                raw.load()
+                src = raw.convert(mode) if mode else raw.copy()
+            if size:
+                # Keep the full-size decode so other sizes skip the decode
+                self._store(src_key, src)
+        if not size:
+            self._store(key, src)
+            return src
+        with get_profiler().span(f"resize {os.path.basename(path)} {size[0]}x{size[1]}", "images"):
+            img = src.resize(tuple(size), _RESAMPLE)
+        self._store(key, img)
+        if source_fmt:
+            self._save_disk(key, source_fmt, img)
+        return img
+
+    def photo(self, path: str, size: tuple[int, int] | None = None, mode: str | None = None) -> ImageTk.PhotoImage:
+        """Return a shared ``PhotoImage`` for *path* at *size*."""
+        img = self.image(path, size, mode)
+        key = self._stamp(path) + (tuple(size) if size else None, mode)
+        with self._lock:
+            ph = self._photos.get(key)
+            if ph is None:
+                ph = ImageTk.PhotoImage(img)
+                self._photos[key] = ph
+            return ph
+
+    def clear(self) -> None:
+        with self._lock:
+            self._images.clear()
+            self._photos.clear()
+            self._bytes = 0
+
+    @property
+    def bytes_used(self) -> int:
+        return self._bytes
+# endregion
+
+# region Shared instance
+_CACHE: ImageCache | None = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_image_cache() -> ImageCache:
+    """Return the process-wide :class:`ImageCache` (disk variants enabled)."""
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = ImageCache(disk_dir=DISK_CACHE_DIR)
+        return _CACHE
+
+
+def cached_photo(path: str, size: tuple[int, int] | None = None, mode: str | None = None) -> ImageTk.PhotoImage:
+    """Shortcut for ``get_image_cache().photo(...)``."""
+    return get_image_cache().photo(path, size, mode)
+# endregion
+
+__all__ = [
+    "ImageCache",
+    "cached_photo",
+    "get_image_cache",
+]
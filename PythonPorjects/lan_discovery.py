@@ -0,0 +1,238 @@
+# =============================================================================
+# Project: VBS4Project
+# File: lan_discovery.py
+# Purpose: Concurrent asyncio sweep of the kit LAN for fuser nodes and agents
+# =============================================================================
+# Table of Contents
+#   1) Imports
+#   2) Constants & Configuration
+#   3) Data Models / Types
+#   4) Sweep
+#   5) fuser_config.json inventory
+#   6) CLI
+# =============================================================================
+
+# region Imports
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import json
+import os
+import socket
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Iterable
+
+from command_server import DEFAULT_PORT as AGENT_PORT
+from unc_probe import SMB_PORT
+# endregion
+
+# region Constants & Configuration
+DEFAULT_SUBNET = "192.168.50.0/24"
+CONNECT_TIMEOUT = 0.6
+NAME_TIMEOUT = 2.0
+# Simultaneous connection attempts; keeps well under Windows' half-open limits
+MAX_CONCURRENCY = 128
+# Reverse lookups run on their own pool so a slow resolver is not waited on
+NAME_WORKERS = 32
+# Refuse to sweep anything bigger than a /22 by accident
+MAX_HOSTS = 1024
+# endregion
+
+# region Data Models / Types
+@dataclass(frozen=True)
+class DiscoveredNode:
+    """A host that answered on SMB and/or the toolkit's command port."""
+
+    ip: str
+    name: str | None
+    smb: bool
+    agent: bool
+    rtt_ms: float
+    is_local: bool = False
+
+    @property
+    def label(self) -> str:
+        return self.name or self.ip
+# endregion
+
+# region Sweep
+def subnet_for(ip: str, prefix: int = 24) -> str:
+    """Return the ``/prefix`` network containing *ip* (``192.168.50.0/24``)."""
+    try:
+        return str(ipaddress.ip_network(f"{ip}/{prefix}", strict=False))
+    except ValueError:
+        return DEFAULT_SUBNET
+
+
+def local_addresses() -> set[str]:
+    addrs = {"127.0.0.1"}
+    try:
+        addrs.update(socket.gethostbyname_ex(socket.gethostname())[2])
+    except OSError:
+        pass
+    return addrs
+
+
+async def _port_open(ip: str, port: int, timeout: float) -> float | None:
+    """Return the connect time in ms, or ``None`` if *port* is closed."""
+    start = time.perf_counter()
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return None
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return (time.perf_counter() - start) * 1000.0
+
+
+async def _resolve(loop: asyncio.AbstractEventLoop, ip: str, timeout: float) -> str | None:
+    try:
+        host, _ = await asyncio.wait_for(
+            loop.getnameinfo((ip, 0), socket.NI_NAMEREQD), timeout
+        )
+    except (OSError, asyncio.TimeoutError):
+        return None
+    return host.split(".")[0] or None
+
+
+async def sweep_async(
+    hosts: Iterable[str],
+    *,
+    ports: tuple[int, int] = (SMB_PORT, AGENT_PORT),
+    timeout: float = CONNECT_TIMEOUT,
+    name_timeout: float = NAME_TIMEOUT,
+    concurrency: int = MAX_CONCURRENCY,
+) -> list[DiscoveredNode]:
+    """Probe *ports* on every host concurrently and resolve the live ones."""
+    loop = asyncio.get_running_loop()
+    sem = asyncio.Semaphore(concurrency)
+    smb_port, agent_port = ports
+    local = local_addresses()
+
+    async def _check(ip: str, port: int) -> float | None:
+        async with sem:
+            return await _port_open(ip, port, timeout)
+
+    async def _node(ip: str) -> DiscoveredNode | None:
+        smb, agent = await asyncio.gather(_check(ip, smb_port), _check(ip, agent_port))
+        if smb is None and agent is None:
+            return None
+        name = await _resolve(loop, ip, name_timeout)
+        rtt = min(v for v in (smb, agent) if v is not None)
+        return DiscoveredNode(ip, name, smb is not None, agent is not None, round(rtt, 1), ip in local)
+
+    found = await asyncio.gather(*(_node(ip) for ip in hosts))
+    return [n for n in found if n is not None]
+
+
+def discover(
+    subnet: str = DEFAULT_SUBNET,
+    *,
+    timeout: float = CONNECT_TIMEOUT,
+    concurrency: int = MAX_CONCURRENCY,
+) -> list[DiscoveredNode]:
+    """Sweep *subnet* and return the nodes found, ordered by address.
+
+    Blocking; run it from a worker thread in the UI.
+    """
+    net = ipaddress.ip_network(subnet, strict=False)
+    if net.num_addresses > MAX_HOSTS:
+        raise ValueError(f"{subnet} is too large to sweep ({net.num_addresses} addresses)")
+    hosts = [str(ip) for ip in (net.hosts() if net.num_addresses > 2 else net)]
+    loop = asyncio.new_event_loop()
+    resolver = ThreadPoolExecutor(NAME_WORKERS, thread_name_prefix="lan-resolve")
+    loop.set_default_executor(resolver)
+    try:
+        nodes = loop.run_until_complete(sweep_async(hosts, timeout=timeout, concurrency=concurrency))
+    finally:
+        # asyncio.run() would wait here for reverse lookups that already timed out
+        resolver.shutdown(wait=False, cancel_futures=True)
+        loop.close()
+    return sorted(nodes, key=lambda n: ipaddress.ip_address(n.ip))
+# endregion
+
+# region fuser_config.json inventory
+def auto_fuser_name(ip: str, machine: str | None) -> str:
+    """Name used for a fuser created from discovery (unique per node)."""
+    return f"{machine or ip.replace('.', '-')}_Fuser"
+
+
+def merge_into_fuser_config(nodes: Iterable[DiscoveredNode], cfg_path: str) -> list[str]:
+    """Record *nodes* in ``fuser_config.json`` and add fuser entries for new ones.
+
+    The inventory is stored under ``"nodes"``.  Remote nodes with an SMB
+    share or a running toolkit agent get a default fuser entry unless the
+    file already configures that IP; hand-written entries are never touched.
+    Returns the IPs that were added to ``"fusers"``.
+    """
+    try:
+        with open(cfg_path, "r") as f:
+            data = json.load(f)
+    except Exception:
+        data = {}
+
+    fusers = data.setdefault("fusers", {"localhost": [{"name": "LocalFuser"}]})
+    added: list[str] = []
+    inventory = {}
+    for node in nodes:
+        inventory[node.ip] = asdict(node)
+        if node.is_local or node.ip in fusers:
+            continue
+        fusers[node.ip] = [{"name": auto_fuser_name(node.ip, node.name), "machine_name": node.name or ""}]
+        added.append(node.ip)
+    data["nodes"] = inventory
+    data["nodes_discovered_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+
+    tmp = cfg_path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, cfg_path)
+    return added
+
+
+def load_node_inventory(cfg_path: str) -> dict[str, dict]:
+    """Return the ``"nodes"`` inventory last written by discovery."""
+    try:
+        with open(cfg_path, "r") as f:
+            return json.load(f).get("nodes", {}) or {}
+    except Exception:
+        return {}
+# endregion
+
+# region CLI
+def main(argv: list[str] | None = None) -> int:
+    """``python lan_discovery.py [subnet]`` prints the nodes found and the sweep time."""
+    args = list(sys.argv[1:] if argv is None else argv)
+    subnet = args[0] if args else DEFAULT_SUBNET
+    t0 = time.perf_counter()
+    nodes = discover(subnet)
+    elapsed = time.perf_counter() - t0
+    for n in nodes:
+        flags = ",".join(f for f, on in (("smb", n.smb), ("agent", n.agent), ("local", n.is_local)) if on)
+        print(f"{n.ip:<16} {n.label:<20} {flags:<16} {n.rtt_ms:6.1f} ms")
+    print(f"{len(nodes)} node(s) on {subnet} in {elapsed:.2f} s")
+    return 0
+# endregion
+
+__all__ = [
+    "AGENT_PORT",
+    "DEFAULT_SUBNET",
+    "DiscoveredNode",
+    "auto_fuser_name",
+    "discover",
+    "load_node_inventory",
+    "merge_into_fuser_config",
+    "subnet_for",
+    "sweep_async",
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
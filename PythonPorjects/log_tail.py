@@ -0,0 +1,135 @@
+# =============================================================================
+# Project: VBS4Project
+# File: log_tail.py
+# Purpose: Incremental log tailing for PhotoMesh render progress
+# =============================================================================
+# Table of Contents
+#   1) Imports
+#   2) Constants & Configuration
+#   3) Tailer
+# =============================================================================
+
+# region Imports
+from __future__ import annotations
+
+import os
+from typing import Any, Callable
+# endregion
+
+# region Constants & Configuration
+BLOCK_SIZE = 64 * 1024
+# More new bytes than this since the last look: search back from EOF instead
+# of reading them all (only the last match matters)
+MAX_FORWARD = 8 * 1024 * 1024
+# endregion
+
+# region Tailer
+class _FileState:
+    __slots__ = ("ident", "offset", "carry", "last")
+
+    def __init__(self, ident: tuple) -> None:
+        self.ident = ident
+        self.offset = 0
+        self.carry = b""
+        self.last: Any = None
+
+
+class LogTail:
+    """Return the last value *extract* finds in growing log files.
+
+    Each file's identity (device, inode/file index) and byte offset are
+    remembered, so a call reads only what was appended since the previous
+    one.  A file seen for the first time, replaced or truncated is searched
+    backwards from EOF in :data:`BLOCK_SIZE` blocks, stopping at the first
+    match.  An unfinished last line is held back until its newline arrives.
+    """
+
+    def __init__(
+        self,
+        extract: Callable[[str], Any],
+        *,
+        block_size: int = BLOCK_SIZE,
+        max_forward: int = MAX_FORWARD,
+    ) -> None:
+        self.extract = extract
+        self.block_size = block_size
+        self.max_forward = max_forward
+        self._files: dict[str, _FileState] = {}
+        self.bytes_read = 0
+
+    def _match(self, raw: bytes) -> Any:
+        return self.extract(raw.decode("utf-8", "ignore"))
+
+    def _search_back(self, f, end: int, floor: int, head: bytes = b"") -> tuple[Any, bytes]:
+        """Last match in ``[floor, end)`` and the unfinished trailing line.
+
+        *head* is the unfinished line that ended just before *floor*.
+        """
+        pos, pending, carry, in_carry = end, b"", b"", True
+        while pos > floor:
+            start = max(floor, pos - self.block_size)
+            f.seek(start)
+            buf = f.read(pos - start) + pending
+            self.bytes_read += pos - start
+            pos = start
+            if pos == floor:
+                buf = head + buf
+            lines = buf.split(b"\n")
+            if in_carry:
+                if len(lines) == 1 and pos > floor:
+                    pending = buf  # still inside the trailing partial line
+                    continue
+                carry, in_carry = lines.pop(), False
+            pending = lines.pop(0) if pos > floor else b""
+            for raw in reversed(lines):
+                value = self._match(raw)
+                if value is not None:
+                    return value, carry
+        return None, carry
+
+    def last_match(self, path: str) -> Any:
+        """Newest value in *path* (the previous one if nothing new matched)."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            self._files.pop(path, None)
+            return None
+        ident = (st.st_dev, st.st_ino)
+        state = self._files.get(path)
+        if state is None or state.ident != ident or st.st_size < state.offset:
+            state = self._files[path] = _FileState(ident)
+        size = st.st_size
+        if size == state.offset:
+            return state.last
+        try:
+            with open(path, "rb") as f:
+                if state.offset == 0 or size - state.offset > self.max_forward:
+                    value, state.carry = self._search_back(f, size, state.offset, state.carry)
+                else:
+                    f.seek(state.offset)
+                    data = state.carry + f.read(size - state.offset)
+                    self.bytes_read += size - state.offset
+                    lines = data.split(b"\n")
+                    state.carry = lines.pop()
+                    value = None
+                    for raw in reversed(lines):
+                        value = self._match(raw)
+                        if value is not None:
+                            break
+        except OSError:
+            return state.last
+        state.offset = size
+        if value is not None:
+            state.last = value
+        return state.last
+
+    def forget(self, path: str | None = None) -> None:
+        if path is None:
+            self._files.clear()
+        else:
+            self._files.pop(path, None)
+# endregion
+
+__all__ = [
+    "LogTail",
+]
@@ -0,0 +1,201 @@
+# =============================================================================
+# Project: VBS4Project
+# File: name_resolver.py
+# Purpose: Batched, deadline-bounded reverse DNS with positive/negative TTLs
+# =============================================================================
+# Table of Contents
+#   1) Imports
+#   2) Constants & Configuration
+#   3) Utilities
+#   4) Resolver
+#   5) Shared instance
+# =============================================================================
+
+# region Imports
+from __future__ import annotations
+
+import ipaddress
+import os
+import socket
+import threading
+import time
+from typing import Callable, Iterable, Mapping
+# endregion
+
+# region Constants & Configuration
+TTL_OK = 600.0
+# Offline LANs rarely gain a DNS server mid-session, but allow recovery
+TTL_FAIL = 60.0
+# Upper bound for one resolve_many() call, however many IPs are asked for
+DEFAULT_DEADLINE = 2.0
+
+if os.name == "nt":
+    HOSTS_PATH = os.path.join(os.environ.get("SystemRoot", r"C:\Windows"), "System32", "drivers", "etc", "hosts")
+else:
+    HOSTS_PATH = "/etc/hosts"
+# endregion
+
+# region Utilities
+def is_ip(value: str) -> bool:
+    try:
+        ipaddress.ip_address((value or "").strip())
+    except ValueError:
+        return False
+    return True
+
+
+def short_name(host: str) -> str:
+    return host.split(".")[0]
+
+
+def _gethostbyaddr(ip: str) -> str | None:
+    try:
+        return short_name(socket.gethostbyaddr(ip)[0]) or None
+    except OSError:
+        return None
+
+
+def parse_hosts_file(path: str = HOSTS_PATH) -> dict[str, str]:
+    """Return ``{ip: first_name}`` from a hosts file (missing file -> ``{}``)."""
+    table: dict[str, str] = {}
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                parts = line.split("#", 1)[0].split()
+                if len(parts) >= 2 and is_ip(parts[0]) and parts[0] not in table:
+                    table[parts[0]] = short_name(parts[1])
+    except OSError:
+        pass
+    return table
+# endregion
+
+# region Resolver
+class NameResolver:
+    """Resolve IPs to short machine names without serial resolver timeouts.
+
+    * :meth:`resolve_many` looks up every uncached IP at once on daemon
+      threads and returns when all answered or *deadline* passed; IPs still
+      pending count as failures for this call but their threads keep
+      running and fill the cache when they finish.
+    * Positive and negative answers are cached with separate TTLs.
+    * :meth:`seed` pins known answers (hosts file, config, LAN discovery) so
+      they never reach the network.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_ok: float = TTL_OK,
+        ttl_fail: float = TTL_FAIL,
+        deadline: float = DEFAULT_DEADLINE,
+        resolve_fn: Callable[[str], str | None] = _gethostbyaddr,
+    ) -> None:
+        self.ttl_ok = ttl_ok
+        self.ttl_fail = ttl_fail
+        self.deadline = deadline
+        self.resolve_fn = resolve_fn
+        self.lookups = 0
+        self._lock = threading.Lock()
+        # ip -> (name or None, expires_at); float("inf") for seeded entries
+        self._cache: dict[str, tuple[str | None, float]] = {}
+        self._inflight: dict[str, threading.Event] = {}
+
+    # -- seeding --------------------------------------------------------
+    def seed(self, ip: str, name: str | None, ttl: float | None = None) -> None:
+        """Record *name* for *ip*; ``ttl=None`` pins it for the session."""
+        ip = (ip or "").strip()
+        if not is_ip(ip) or not name:
+            return
+        expires = float("inf") if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._cache[ip] = (short_name(name.strip()), expires)
+
+    def seed_many(self, names: Mapping[str, str]) -> None:
+        for ip, name in names.items():
+            self.seed(ip, name)
+
+    def seed_hosts_file(self, path: str = HOSTS_PATH) -> int:
+        table = parse_hosts_file(path)
+        table.pop("127.0.0.1", None)
+        table.pop("::1", None)
+        self.seed_many(table)
+        return len(table)
+
+    # -- lookups --------------------------------------------------------
+    def cached(self, ip: str) -> tuple[bool, str | None]:
+        """Return ``(hit, name)`` without touching the network."""
+        with self._lock:
+            hit = self._cache.get(ip)
+            if hit is None or hit[1] < time.monotonic():
+                return False, None
+            return True, hit[0]
+
+    def _lookup(self, ip: str, done: threading.Event) -> None:
+        try:
+            name = self.resolve_fn(ip)
+        except Exception:
+            name = None
+        with self._lock:
+            self.lookups += 1
+            self._cache[ip] = (name, time.monotonic() + (self.ttl_ok if name else self.ttl_fail))
+            self._inflight.pop(ip, None)
+        done.set()
+
+    def resolve_many(self, ips: Iterable[str], deadline: float | None = None) -> dict[str, str | None]:
+        """Return ``{ip: name or None}``, bounded by *deadline* seconds in total."""
+        ips = [ip.strip() for ip in dict.fromkeys(ips) if ip and ip.strip()]
+        result: dict[str, str | None] = {}
+        waits: dict[str, threading.Event] = {}
+        now = time.monotonic()
+        with self._lock:
+            for ip in ips:
+                hit = self._cache.get(ip)
+                if hit is not None and hit[1] >= now:
+                    result[ip] = hit[0]
+                    continue
+                event = self._inflight.get(ip)
+                if event is None:
+                    event = self._inflight[ip] = threading.Event()
+                    threading.Thread(
+                        target=self._lookup, args=(ip, event), name="name-resolve", daemon=True
+                    ).start()
+                waits[ip] = event
+        end = time.monotonic() + (self.deadline if deadline is None else deadline)
+        for ip, event in waits.items():
+            event.wait(max(0.0, end - time.monotonic()))
+            result[ip] = self.cached(ip)[1]
+        return {ip: result.get(ip) for ip in ips}
+
+    def resolve(self, ip: str, deadline: float | None = None) -> str | None:
+        return self.resolve_many([ip], deadline).get(ip.strip())
+
+    def invalidate(self, ip: str | None = None) -> None:
+        """Drop cached lookups (seeded entries for *ip* included)."""
+        with self._lock:
+            if ip is None:
+                self._cache = {k: v for k, v in self._cache.items() if v[1] == float("inf")}
+            else:
+                self._cache.pop(ip.strip(), None)
+# endregion
+
+# region Shared instance
+_RESOLVER: NameResolver | None = None
+_RESOLVER_LOCK = threading.Lock()
+
+
+def get_name_resolver() -> NameResolver:
+    """Return the process-wide :class:`NameResolver`, seeded from the hosts file."""
+    global _RESOLVER
+    with _RESOLVER_LOCK:
+        if _RESOLVER is None:
+            _RESOLVER = NameResolver()
+            _RESOLVER.seed_hosts_file()
+        return _RESOLVER
+# endregion
+
+__all__ = [
+    "NameResolver",
+    "get_name_resolver",
+    "is_ip",
+    "parse_hosts_file",
+]
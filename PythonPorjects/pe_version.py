@@ -0,0 +1,287 @@
+# =============================================================================
+# Project: VBS4Project
+# File: pe_version.py
+# Purpose: Pure-Python PE VS_VERSIONINFO reader with a (path, size, mtime) cache
+# =============================================================================
+# Table of Contents
+#   1) Imports
+#   2) Constants & Configuration
+#   3) PE parsing
+#   4) Version cache
+#   5) Shared instance & helpers
+#   6) CLI
+# =============================================================================
+
+# region Imports
+from __future__ import annotations
+
+import atexit
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+# endregion
+
+# region Constants & Configuration
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.path.join(BASE_DIR, "exe_versions.json")
+CACHE_FORMAT = 1
+
+RT_VERSION = 16
+VS_FIXEDFILEINFO_SIGNATURE = 0xFEEF04BD
+_VS_KEY = "VS_VERSION_INFO\0".encode("utf-16-le")
+
+_PE32_MAGIC = 0x10B
+_PE32_PLUS_MAGIC = 0x20B
+_RESOURCE_DIR_INDEX = 2
+# endregion
+
+# region PE parsing
+class PEFormatError(ValueError):
+    """Raised when a file is not a PE image or its resources are malformed."""
+
+
+def _u16(buf, off: int) -> int:
+    return struct.unpack_from("<H", buf, off)[0]
+
+
+def _u32(buf, off: int) -> int:
+    return struct.unpack_from("<I", buf, off)[0]
+
+
+def _sections(buf) -> tuple[list[tuple[int, int, int, int]], int]:
+    """Return ``([(va, vsize, raw_ptr, raw_size), ...], resource_rva)``."""
+    if len(buf) < 0x40 or buf[:2] != b"MZ":
+        raise PEFormatError("missing MZ header")
+    pe = _u32(buf, 0x3C)
+    if buf[pe:pe + 4] != b"PE\0\0":
+        raise PEFormatError("missing PE signature")
+    coff = pe + 4
+    n_sections = _u16(buf, coff + 2)
+    opt_size = _u16(buf, coff + 16)
+    opt = coff + 20
+    magic = _u16(buf, opt)
+    if magic == _PE32_MAGIC:
+        n_dirs_off, dirs_off = 92, 96
+    elif magic == _PE32_PLUS_MAGIC:
+        n_dirs_off, dirs_off = 108, 112
+    else:
+        raise PEFormatError(f"unknown optional header magic 0x{magic:x}")
+    if _u32(buf, opt + n_dirs_off) <= _RESOURCE_DIR_INDEX:
+        return [], 0
+    res_rva = _u32(buf, opt + dirs_off + 8 * _RESOURCE_DIR_INDEX)
+
+    table = opt + opt_size
+    sections = []
+    for i in range(n_sections):
+        s = table + 40 * i
+        vsize, va, raw_size, raw_ptr = struct.unpack_from("<IIII", buf, s + 8)
+        sections.append((va, vsize, raw_ptr, raw_size))
+    return sections, res_rva
+
+
+def _rva_to_offset(sections, rva: int) -> int:
+    for va, vsize, raw_ptr, raw_size in sections:
+        if va <= rva < va + max(vsize, raw_size):
+            return raw_ptr + (rva - va)
+    raise PEFormatError(f"RVA 0x{rva:x} not in any section")
+
+
+def _first_entry(buf, base: int, directory: int, want_id: int | None = None) -> tuple[int, bool]:
+    """Return ``(offset_from_base, is_subdirectory)`` of a resource entry."""
+    named = _u16(buf, directory + 12)
+    ids = _u16(buf, directory + 14)
+    for i in range(named + ids):
+        entry = directory + 16 + 8 * i
+        name, target = struct.unpack_from("<II", buf, entry)
+        if want_id is not None and (name & 0x80000000 or name != want_id):
+            continue
+        return target & 0x7FFFFFFF, bool(target & 0x80000000)
+    raise PEFormatError("resource entry not found")
+
+
+def _version_blob(buf) -> memoryview:
+    """Return the raw ``VS_VERSIONINFO`` resource bytes of a mapped PE image."""
+    sections, res_rva = _sections(buf)
+    if not res_rva:
+        raise PEFormatError("no resource directory")
+    base = _rva_to_offset(sections, res_rva)
+    # Type (RT_VERSION) -> name (first) -> language (first) -> data entry
+    off, is_dir = _first_entry(buf, base, base, RT_VERSION)
+    for _ in range(2):
+        if not is_dir:
+            break
+        off, is_dir = _first_entry(buf, base, base + off)
+    if is_dir:
+        raise PEFormatError("unexpected resource nesting")
+    data_rva, size = struct.unpack_from("<II", buf, base + off)
+    start = _rva_to_offset(sections, data_rva)
+    return memoryview(buf)[start:start + size]
+
+
+def _fixed_file_version(blob) -> tuple[int, int, int, int]:
+    # VS_VERSIONINFO: wLength, wValueLength, wType, szKey, padding, Value
+    key_end = 6 + len(_VS_KEY)
+    if bytes(blob[6:key_end]) == _VS_KEY:
+        value = (key_end + 3) & ~3
+    else:
+        value = bytes(blob).find(struct.pack("<I", VS_FIXEDFILEINFO_SIGNATURE))
+        if value < 0:
+            raise PEFormatError("VS_FIXEDFILEINFO not found")
+    sig, _struc, ms, ls = struct.unpack_from("<IIII", blob, value)
+    if sig != VS_FIXEDFILEINFO_SIGNATURE:
+        raise PEFormatError("bad VS_FIXEDFILEINFO signature")
+    return ms >> 16, ms & 0xFFFF, ls >> 16, ls & 0xFFFF
+
+
+def read_pe_version(path: str) -> tuple[int, int, int, int] | None:
+    """Return the FileVersion of the PE image at *path* or ``None``.
+
+    Only the headers, section table and version resource are touched; the
+    file is memory-mapped so the rest of the binary is never read.
+    """
+    try:
+        with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            blob = _version_blob(buf)
+            try:
+                return _fixed_file_version(blob)
+            finally:
+                blob.release()
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def format_version(version: tuple[int, ...] | None) -> str:
+    """Format a version tuple the way ``get_exe_file_version`` always has."""
+    return ".".join(str(p) for p in version) if version else "Unknown"
+# endregion
+
+# region Version cache
+class VersionCache:
+    """Remember file versions keyed on ``(path, size, mtime)``.
+
+    A lookup only stats the file; the binary is parsed again only when its
+    size or mtime changed.  Negative results are cached too.  If *cache_path*
+    is given the table is loaded from and saved to that JSON file.
+    """
+
+    def __init__(self, cache_path: str | None = None, reader=read_pe_version) -> None:
+        self.cache_path = cache_path
+        self.reader = reader
+        self._lock = threading.Lock()
+        # normcase(path) -> [size, mtime, version list or None]
+        self._entries: dict[str, list] = {}
+        self._dirty = False
+        self._loaded = cache_path is None
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+            if data.get("format") == CACHE_FORMAT:
+                self._entries = dict(data.get("entries", {}))
+        except (OSError, ValueError, AttributeError):
+            self._entries = {}
+
+    def version(self, path: str) -> tuple[int, ...] | None:
+        """Return the cached or freshly parsed version of *path*."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        key = os.path.normcase(os.path.abspath(path))
+        with self._lock:
+            self._load()
+            hit = self._entries.get(key)
+            if hit and hit[0] == st.st_size and hit[1] == st.st_mtime:
+                return tuple(hit[2]) if hit[2] else None
+        ver = self.reader(path)
+        with self._lock:
+            self._entries[key] = [st.st_size, st.st_mtime, list(ver) if ver else None]
+            self._dirty = True
+        return ver
+
+    def version_string(self, path: str) -> str:
+        return format_version(self.version(path))
+
+    def save(self) -> None:
+        """Write the cache atomically if it has a backing file and changed."""
+        if not self.cache_path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = {"format": CACHE_FORMAT, "entries": self._entries}
+            tmp = self.cache_path + ".tmp"
+            try:
+                with open(tmp, "w", encoding="utf-8") as fh:
+                    json.dump(payload, fh)
+                os.replace(tmp, self.cache_path)
+                self._dirty = False
+            except OSError:
+                pass
+# endregion
+
+# region Shared instance & helpers
+_CACHE: VersionCache | None = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_version_cache() -> VersionCache:
+    """Return the process-wide, disk-backed :class:`VersionCache`."""
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = VersionCache(CACHE_PATH)
+            atexit.register(_CACHE.save)
+        return _CACHE
+
+
+def file_version(path: str) -> tuple[int, ...] | None:
+    """Return the FileVersion tuple of *path* using the shared cache."""
+    return get_version_cache().version(path)
+# endregion
+
+# region CLI
+def main(argv: list[str] | None = None) -> int:
+    """``python pe_version.py [--repeat N] exe...`` prints versions and timings."""
+    args = list(sys.argv[1:] if argv is None else argv)
+    repeat = 1
+    if len(args) >= 2 and args[0] == "--repeat":
+        repeat = max(1, int(args[1]))
+        args = args[2:]
+    if not args:
+        print("Usage: python pe_version.py [--repeat N] <exe> [<exe> ...]")
+        return 1
+    cache = VersionCache()
+    for path in args:
+        t0 = time.perf_counter()
+        ver = read_pe_version(path)
+        cold = time.perf_counter() - t0
+        cache.version(path)
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            cache.version(path)
+        warm = (time.perf_counter() - t0) / repeat
+        print(f"{path}: {format_version(ver)}  parse={cold * 1e3:.3f} ms  cached={warm * 1e6:.1f} us")
+    return 0
+# endregion
+
+__all__ = [
+    "PEFormatError",
+    "VersionCache",
+    "file_version",
+    "format_version",
+    "get_version_cache",
+    "read_pe_version",
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
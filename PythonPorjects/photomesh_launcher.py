@@ -22,21 +22,27 @@
 # region Imports
 from __future__ import annotations
 
-import configparser
 import ctypes
 import json
 import os
 import shutil
 import subprocess
 import sys
-import time
 import re
 import xml.etree.ElementTree as ET
 from pathlib import Path
 from typing import Iterable
-import winreg  # for InstallLocation lookup
 import glob
 
+from exe_index import get_exe_index
+from config_store import get_config_store
+from unc_probe import get_unc_prober
+from share_inventory import ShareInventory
+from drive_mapping import get_drive_mappings
+from queue_batch import BatchItem, ProjectSpec, format_plan, plan_batch
+from queue_client import ProjectQueueClient, QueueError
+from queue_events import QueueMonitor, QueueUpdate
+
 try:  # pragma: no cover - optional dependency
     import requests  # type: ignore
 except Exception:  # pragma: no cover - requests may be absent in minimal environments
@@ -76,38 +82,16 @@ def _cache_wizard_exe(path: str) -> None:
 
 
 def _iter_uninstall_install_locations():
-    """Yield InstallLocation folders from Uninstall registry entries that match Skyline/PhotoMesh."""
-    keys = [
-        r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall",
-        r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall",
-    ]
-    for hive in (winreg.HKEY_LOCAL_MACHINE, winreg.HKEY_CURRENT_USER):
-        for key in keys:
-            try:
-                with winreg.OpenKey(hive, key) as root:
-                    subcount = winreg.QueryInfoKey(root)[0]
-                    for i in range(subcount):
-                        try:
-                            subname = winreg.EnumKey(root, i)
-                            with winreg.OpenKey(root, subname) as sub:
-                                disp = ""
-                                loc = ""
-                                try:
-                                    disp, _ = winreg.QueryValueEx(sub, "DisplayName")
-                                except OSError:
-                                    pass
-                                try:
-                                    loc, _ = winreg.QueryValueEx(sub, "InstallLocation")
-                                except OSError:
-                                    pass
-                                dlow = (disp or "").lower()
-                                if ("photomesh" in dlow) or ("photo mesh" in dlow) or ("wizard" in dlow):
-                                    if loc and os.path.isdir(loc):
-                                        yield loc
-                        except OSError:
-                            continue
-            except OSError:
-                continue
+    """Yield InstallLocation folders from Uninstall registry entries that match Skyline/PhotoMesh.
+
+    The Uninstall keys are enumerated once by the shared executable index and
+    re-read only when their registry last-write time changes.
+    """
+    for disp, loc in get_exe_index().uninstall_entries():
+        dlow = (disp or "").lower()
+        if ("photomesh" in dlow) or ("photo mesh" in dlow) or ("wizard" in dlow):
+            if loc and os.path.isdir(loc):
+                yield loc
 
 
 def _program_files_roots():
@@ -127,7 +111,7 @@ def find_wizard_exe() -> str:
       1) config override (General/photomesh_wizard_exe)
       2) canonical + legacy subpaths in Program Files roots
       3) Uninstall registry InstallLocation
-      4) recursive search under Program Files roots (Skyline only)
+      4) shared executable index under Program Files roots (Skyline only)
       5) last-resort hardcoded constant (WIZARD_EXE)
     """
     # 1) explicit override
@@ -156,24 +140,9 @@ def find_wizard_exe() -> str:
                     _cache_wizard_exe(cand)
                     return cand
 
-    # 4) recursive (Skyline-only) search once
-    best = ""
-    best_mtime = 0.0
-    for pf in _program_files_roots():
-        for root, _dirs, files in os.walk(pf):
-            if "skyline" not in root.lower():
-                continue
-            for name in WIZARD_CANDIDATE_NAMES:
-                if name in files:
-                    cand = os.path.join(root, name)
-                    mtime = 0.0
-                    try:
-                        mtime = os.path.getmtime(cand)
-                    except OSError:
-                        pass
-                    if mtime >= best_mtime:
-                        best_mtime = mtime
-                        best = cand
+    # 4) Skyline-only lookup in the shared executable index
+    skyline_roots = [os.path.join(pf, "Skyline") for pf in _program_files_roots()]
+    best = get_exe_index().newest(*WIZARD_CANDIDATE_NAMES, under=skyline_roots)
     if best:
         _cache_wizard_exe(best)
         return best
@@ -200,6 +169,8 @@ CONFIG_PATH = os.path.join(BASE_DIR, "config.ini")
 QUEUE_API_URL = "http://127.0.0.1:8087/ProjectQueue/"
 QUEUE_SSE_URL = "http://127.0.0.1:8087/ProjectQueue/events"
 WORKING_FOLDER = r"C:\\WorkingFolder"
+# One keep-alive session for every Project Queue call (see queue_client)
+QUEUE_CLIENT = ProjectQueueClient(QUEUE_API_URL)
 
 # Off-line connection hint shown when UNC paths fail
 OFFLINE_ACCESS_HINT = (
@@ -215,11 +186,15 @@ RM_INSTALL_SUBDIRS = ["RealityMeshInstall", "ReailityMeshInstall"]
 # endregion
 
 # region Paths & Environment
-# Shared configuration for network fuser settings
-config = configparser.ConfigParser()
-config.read(CONFIG_PATH)
+# Shared configuration for network fuser settings (same store as STE_Toolkit)
+_config_store = get_config_store(CONFIG_PATH)
+config = _config_store.config
+# (generation, parsed Offline dict) for get_offline_cfg()
+_offline_cfg_cache: tuple[int, dict] | None = None
 
 _DRIVE_RE = re.compile(r"^\s*(\S+)\s+Disk", re.MULTILINE)
+# ``net view`` against an unreachable host can hang for the SMB timeout
+NET_VIEW_TIMEOUT = 8.0
 # endregion
 
 # region Data Models / Types
@@ -270,9 +245,8 @@ def _save_json(path: str, data: dict) -> None:
 
 
 def _save_config() -> None:
-    """Persist the in-memory config.ini to disk."""
-    with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-        config.write(f)
+    """Persist the in-memory config.ini to disk (debounced, atomic)."""
+    _config_store.save()
 
 
 def get_projects_root() -> str:
@@ -456,22 +430,19 @@ def _read_photomesh_host() -> str:
     legacy keys checked here, keeping older config readers compatible.
     """
     try:
-        config.read(CONFIG_PATH)
-        if config.has_section("Offline"):
-            for key in (
-                "working_fuser_host",
-                "host_name",
-                "network_host",
-                "fuser_host",
-            ):
-                if config.has_option("Offline", key):
-                    v = config.get("Offline", key).strip()
-                    if v:
-                        return v
-        if config.has_section("Network") and config.has_option("Network", "host"):
-            v = config.get("Network", "host").strip()
+        snap = _config_store.snapshot()
+        for key in (
+            "working_fuser_host",
+            "host_name",
+            "network_host",
+            "fuser_host",
+        ):
+            v = snap.get("Offline", key).strip()
             if v:
                 return v
+        v = snap.get("Network", "host").strip()
+        if v:
+            return v
     except Exception:
         pass
     return "KIT1-1"
@@ -490,8 +461,7 @@ def working_fuser_unc() -> str:
 def _is_offline_enabled() -> bool:
     """Return True if offline mode is enabled in config.ini."""
     try:
-        config.read(CONFIG_PATH)
-        return config.getboolean("Offline", "enabled", fallback=False)
+        return _config_store.snapshot().getboolean("Offline", "enabled", False)
     except Exception:
         return False
 
@@ -501,25 +471,26 @@ def get_offline_cfg() -> dict:
 
     The ``host_name`` value is maintained by ``STE_Toolkit.set_host`` so that
     older tools reading this config continue to work without changes.
+    The parsed dict is cached per config generation; callers get a copy.
     """
-    try:
-        config.read(CONFIG_PATH)
-    except Exception:
-        pass
-    if "Offline" not in config:
-        config["Offline"] = {}
-    o = config["Offline"]
-    return {
-        "enabled": o.getboolean("enabled", False),
-        "host_name": o.get("host_name", "KIT-HOST").strip(),
-        "host_ip": o.get("host_ip", "192.168.50.10").strip(),
-        "share_name": o.get("share_name", "SharedMeshDrive").strip(),
+    global _offline_cfg_cache
+    snap = _config_store.snapshot()
+    cached = _offline_cfg_cache
+    if cached is not None and cached[0] == snap.generation:
+        return dict(cached[1])
+    cfg = {
+        "enabled": snap.getboolean("Offline", "enabled", False),
+        "host_name": snap.get("Offline", "host_name", "KIT-HOST").strip(),
+        "host_ip": snap.get("Offline", "host_ip", "192.168.50.10").strip(),
+        "share_name": snap.get("Offline", "share_name", "SharedMeshDrive").strip(),
         "local_data_root": os.path.normpath(
-            o.get("local_data_root", r"D:\\SharedMeshDrive")
+            snap.get("Offline", "local_data_root", r"D:\\SharedMeshDrive")
         ),
-        "working_fuser_subdir": o.get("working_fuser_subdir", "WorkingFuser").strip(),
-        "use_ip_unc": o.getboolean("use_ip_unc", False),
+        "working_fuser_subdir": snap.get("Offline", "working_fuser_subdir", "WorkingFuser").strip(),
+        "use_ip_unc": snap.getboolean("Offline", "use_ip_unc", False),
     }
+    _offline_cfg_cache = (snap.generation, cfg)
+    return dict(cfg)
 
 
 def build_unc_from_cfg(o: dict) -> str:
@@ -579,12 +550,15 @@ Get-NetFirewallRule -DisplayGroup 'File and Printer Sharing' | Where-Object {{$_
         )
 
 
-def can_access_unc(path: str) -> bool:
-    """Return True if *path* is an accessible directory."""
-    try:
-        return os.path.isdir(path) and os.listdir(path) is not None
-    except Exception:
-        return False
+def can_access_unc(path: str, timeout: float | None = None) -> bool:
+    """Return True if *path* is an accessible directory.
+
+    Goes through the shared :class:`unc_probe.UncProber`, so a dead host costs
+    at most the probe deadline (not the SMB timeout) and is remembered for a
+    short while.  Use ``get_unc_prober().probe(path, callback)`` to avoid
+    blocking a UI thread at all.
+    """
+    return get_unc_prober().check(path, timeout)
 
 
 def replace_share_in_unc_path(p: str, old_share: str, new_share: str) -> str:
@@ -600,30 +574,22 @@ def replace_share_in_unc_path(p: str, old_share: str, new_share: str) -> str:
 
 def propagate_share_rename_in_config(old_share: str, new_share: str) -> None:
     """Update config.ini entries to replace *old_share* with *new_share*."""
-    changed = False
-    try:
-        config.read(CONFIG_PATH)
-    except Exception:
-        pass
-    for sect in config.sections():
-        for key, val in list(config[sect].items()):
-            if isinstance(val, str) and val.startswith("\\\\"):
+    snap = _config_store.snapshot()
+    updates = []
+    for sect in snap.sections():
+        for key, val in snap.section(sect).items():
+            if val.startswith("\\\\"):
                 new_val = replace_share_in_unc_path(val, old_share, new_share)
                 if new_val != val:
-                    config[sect][key] = new_val
-                    changed = True
-    if changed:
-        with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-            config.write(f)
+                    updates.append((sect, key, new_val))
+    if updates:
+        with _config_store.transaction():
+            for sect, key, new_val in updates:
+                config[sect][key] = new_val
 
 
-def list_remote_shares(host: str) -> list[str]:
-    r"""Return SMB share names exposed by *host*.
-
-    Prefer ``win32net.NetShareEnum``; if unavailable, fall back to parsing
-    ``net view \\HOST /all`` output. Returned names exclude administrative
-    shares such as ``C$``.
-    """
+def _list_remote_shares(host: str) -> list[str]:
+    """:func:`list_remote_shares`, raising ``OSError`` if *host* cannot be listed."""
     shares: list[str] = []
     try:  # pragma: no cover - optional dependency
         import win32net  # type: ignore
@@ -642,97 +608,136 @@ def list_remote_shares(host: str) -> list[str]:
         pass
 
     try:
-        out = subprocess.run(
+        proc = subprocess.run(
             ["net", "view", rf"\\\{host}", "/all"],
             capture_output=True,
             text=True,
             check=False,
-        ).stdout
-        return [m.group(1) for m in _DRIVE_RE.finditer(out)]
-    except Exception:
+            timeout=NET_VIEW_TIMEOUT,
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        raise OSError(f"net view \\\\{host}: {e}") from e
+    if proc.returncode != 0:
+        raise OSError(f"net view \\\\{host} failed: {(proc.stderr or proc.stdout).strip()[:200]}")
+    return [m.group(1) for m in _DRIVE_RE.finditer(proc.stdout)]
+
+
+def list_remote_shares(host: str) -> list[str]:
+    r"""Return SMB share names exposed by *host*.
+
+    Prefer ``win32net.NetShareEnum``; if unavailable, fall back to parsing
+    ``net view \\HOST /all`` output. Returned names exclude administrative
+    shares such as ``C$``.  A host that cannot be listed gives ``[]``.
+    """
+    try:
+        return _list_remote_shares(host)
+    except OSError:
         return []
 
 
+# Shared host -> shares -> sentinel cache used by Settings and fuser launch.
+# The strict lister makes a host that cannot be listed "unreachable".
+SHARE_INVENTORY = ShareInventory(_list_remote_shares)
+DEFAULT_MESH_SHARES = ["SharedMeshDrive", "SharedMesh", "PhotoMesh", "Mesh"]
+
+
+def _is_local_host(host: str) -> bool:
+    import socket
+
+    return host.lower() in (socket.gethostname().lower(), os.environ.get("COMPUTERNAME", "").lower())
+
+
+def _pick_mesh_share(inv, prefer: list[str]) -> tuple[str, str] | None:
+    for name in prefer:
+        info = inv.share(name)
+        if info:
+            if info.has_sentinel is False:
+                sent = os.path.join(info.unc, "Datatarget.txt")
+                try:
+                    if os.access(info.unc, os.W_OK):
+                        with open(sent, "a", encoding="utf-8"):
+                            pass
+                except Exception:
+                    pass
+            return info.name, info.unc
+    for info in inv.shares:
+        if info.has_sentinel:
+            return info.name, info.unc
+    return None
+
+
+def probe_mesh_shares(
+    hosts: Iterable[str], prefer: list[str] | None = None, refresh: bool = False
+) -> dict[str, tuple[str, str] | None]:
+    r"""Return ``{host: (share_name, unc_root) | None}`` for several hosts.
+
+    Hosts and their shares are probed in parallel with per-probe timeouts and
+    the results are cached in :data:`SHARE_INVENTORY`, so repeated calls do
+    not spawn ``net view`` again until the cache expires.
+    """
+    prefer = prefer or DEFAULT_MESH_SHARES
+    result: dict[str, tuple[str, str] | None] = {}
+    for host, inv in SHARE_INVENTORY.get_many(hosts, refresh).items():
+        best = _pick_mesh_share(inv, prefer) if inv.reachable else None
+        if best is None and _is_local_host(host):
+            try:
+                ensure_offline_share_exists()
+                SHARE_INVENTORY.invalidate(host)
+                inv = SHARE_INVENTORY.get(host)
+                best = next(
+                    ((i.name, i.unc) for i in map(inv.share, prefer) if i), None
+                )
+            except Exception:
+                best = None
+        result[host] = best
+    return result
+
+
 def probe_best_mesh_share(
-    host: str, prefer: list[str] | None = None
+    host: str, prefer: list[str] | None = None, refresh: bool = False
 ) -> tuple[str, str] | None:
     r"""Return ``(share_name, unc_root)`` for the most suitable mesh share.
 
     The search prefers names in ``prefer`` (case-insensitive) and falls back to
     any share containing a ``Datatarget.txt`` sentinel at its root. If running
     on *host* and no preferred share exists, ``ensure_offline_share_exists`` is
-    invoked to create it.
+    invoked to create it.  Results come from the cached share inventory unless
+    *refresh* is set.
     """
+    return probe_mesh_shares([host], prefer, refresh).get(host.strip())
 
-    prefer = prefer or ["SharedMeshDrive", "SharedMesh", "PhotoMesh", "Mesh"]
-    shares = list_remote_shares(host)
-    if not shares:
-        return None
-
-    shares_lower = {s.lower(): s for s in shares}
-    for name in prefer:
-        s = shares_lower.get(name.lower())
-        if s:
-            unc = rf"\\\{host}\{s}"
-            sent = os.path.join(unc, "Datatarget.txt")
-            try:
-                if not os.path.isfile(sent) and os.access(unc, os.W_OK):
-                    with open(sent, "a", encoding="utf-8"):
-                        pass
-            except Exception:
-                pass
-            return s, unc
-
-    for s in shares:
-        unc = rf"\\\{host}\{s}"
-        if os.path.isfile(os.path.join(unc, "Datatarget.txt")):
-            return s, unc
 
-    try:
-        import socket
-
-        if host.lower() in (socket.gethostname().lower(), os.environ.get("COMPUTERNAME", "").lower()):
-            ensure_offline_share_exists()
-            shares = list_remote_shares(host)
-            for name in prefer:
-                s = next((x for x in shares if x.lower() == name.lower()), None)
-                if s:
-                    unc = rf"\\\{host}\{s}"
-                    return s, unc
-    except Exception:
-        pass
+def share_available(unc: str, refresh: bool = False) -> bool:
+    r"""Whether the share of *unc* (``\\host\share[\...]``) is listed by its host.
 
-    return None
+    Answered from :data:`SHARE_INVENTORY`; blocks while a stale host is
+    probed, so call it off the Tk thread.
+    """
+    parts = [p for p in unc.replace("/", "\\").split("\\") if p]
+    if len(parts) < 2:
+        return False
+    inv = SHARE_INVENTORY.get(parts[0], refresh)
+    return inv.reachable and inv.share(parts[1]) is not None
 
 
 def current_mapping(letter: str = "M:") -> str | None:
-    r"""Return the UNC path mapped to *letter*, if any."""
+    r"""Return the UNC path mapped to *letter*, if any (served from memory)."""
     try:
-        out = subprocess.run(
-            ["net", "use"], capture_output=True, text=True, check=False
-        ).stdout
-        pattern = re.compile(rf"^\s*{re.escape(letter)}\s+(\\\\\\S+)", re.MULTILINE | re.IGNORECASE)
-        m = pattern.search(out)
-        return m.group(1) if m else None
+        return get_drive_mappings().get(letter)
     except Exception:
         return None
 
 
 def unmap_drive(letter: str = "M:") -> None:
-    r"""Unmap drive *letter* using ``net use``."""
-    subprocess.run(["net", "use", letter, "/delete", "/yes"], check=False)
+    r"""Remove the mapping of drive *letter*."""
+    get_drive_mappings().unmap(letter)
 
 
 def map_drive(unc: str, letter: str = "M:") -> bool:
-    r"""Map *unc* to drive *letter* via ``net use`` and return success."""
-    mapped = current_mapping(letter)
-    if mapped and mapped.lower() != unc.lower():
-        unmap_drive(letter)
-    subprocess.run(
-        ["net", "use", letter, unc, "/persistent:yes"],
-        check=False,
-    )
+    r"""Map *unc* to drive *letter* persistently and return success."""
+    get_drive_mappings().map(letter, unc)
     target = os.path.join(letter, "")
+    get_unc_prober().invalidate(unc)
     return os.path.isdir(target) and can_access_unc(unc)
 
 
@@ -742,13 +747,9 @@ def resolve_shared_access_path() -> str:
     share_unc = build_unc_from_cfg(o)
     working_unc = resolve_network_working_folder_from_cfg(o)
 
-    try:
-        config.read(CONFIG_PATH)
-    except Exception:
-        pass
-    sd = config.setdefault("SharedDrive", {})
-    mode = sd.get("preferred_mode", "UNC").upper()
-    letter = sd.get("drive_letter", "M:")
+    snap = _config_store.snapshot()
+    mode = snap.get("SharedDrive", "preferred_mode", "UNC").upper()
+    letter = snap.get("SharedDrive", "drive_letter", "M:")
 
     if mode == "DRIVE":
         mapped = current_mapping(letter)
@@ -897,11 +898,7 @@ def queue_alive(timeout: float = 2.0) -> bool:
     """Return True if the Project Queue endpoint responds within *timeout*."""
     if not requests:
         return False
-    try:
-        r = requests.get(QUEUE_API_URL, timeout=timeout)
-        return r.status_code == 200
-    except Exception:
-        return False
+    return QUEUE_CLIENT.alive(deadline=timeout)
 
 
 def ensure_photomesh_queue_running(log=print, wait_seconds: int = 45) -> None:
@@ -917,19 +914,22 @@ def ensure_photomesh_queue_running(log=print, wait_seconds: int = 45) -> None:
     except Exception as e:
         raise RuntimeError(f"Failed to start PhotoMesh as admin: {e}")
 
-    start = time.time()
-    while time.time() - start < wait_seconds:
-        if queue_alive():
-            log("[Queue] Project Queue is up.")
-            return
-        time.sleep(1.5)
+    # Probes back off from 0.5 s to 5 s while PhotoMesh boots
+    if QUEUE_CLIENT.wait_alive(wait_seconds):
+        log("[Queue] Project Queue is up.")
+        return
     raise TimeoutError(
         "Project Queue did not come up within the wait window. Open PhotoMesh and ensure the Queue service is enabled."
     )
 
 
 def queue_payload(
-    project_name: str, project_dir: str, image_folders: Iterable[str]
+    project_name: str,
+    project_dir: str,
+    image_folders: Iterable[str],
+    *,
+    max_local_fusers: int = 8,
+    working_folder: str = WORKING_FOLDER,
 ) -> list[dict]:
     """Build a Project Queue payload for *project_name* in *project_dir*."""
     project_xml = os.path.join(project_dir, f"{project_name}.PhotoMeshXML")
@@ -946,8 +946,8 @@ def queue_payload(
             "buildFrom": 1,
             "buildUntil": 6,
             "inheritBuild": "",
-            "workingFolder": WORKING_FOLDER,
-            "MaxLocalFusers": 8,
+            "workingFolder": working_folder,
+            "MaxLocalFusers": max_local_fusers,
             "MaxAWSFusers": 0,
             "AWSFuserStartupScript": "",
             "AWSBuildConfigurationName": "",
@@ -962,38 +962,85 @@ def submit_queue_build(payload: list[dict], log=print) -> None:
     """Submit *payload* to the Project Queue and start the build."""
     if not requests:
         raise RuntimeError("requests library is required for queue submission")
-    r = requests.post(f"{QUEUE_API_URL}project/add", json=payload, timeout=60)
-    if r.status_code != 200:
-        raise RuntimeError(f"[Queue] Add failed: {r.status_code} {r.text[:300]}")
+    try:
+        QUEUE_CLIENT.add(payload)
+    except QueueError as e:
+        raise RuntimeError(f"[Queue] Add failed: {e}")
     log("[Queue] Project submitted.")
 
-    r = requests.get(f"{QUEUE_API_URL}Build/Start", timeout=60)
-    if r.status_code != 200:
-        raise RuntimeError(f"[Queue] Build/Start failed: {r.status_code} {r.text[:300]}")
+    try:
+        QUEUE_CLIENT.start()
+    except QueueError as e:
+        raise RuntimeError(f"[Queue] Build/Start failed: {e}")
     log("[Queue] Build started.")
 
 
+def submit_queue_batch(
+    specs: Iterable[ProjectSpec],
+    capacity: int,
+    log=print,
+    working_folder: str = WORKING_FOLDER,
+) -> list[BatchItem]:
+    """Submit several projects in one ``project/add`` call, then start.
+
+    Projects are ordered by priority, then smallest imagery set first, and
+    each gets a fuser cap from *capacity* (see :mod:`queue_batch`).
+    Returns the plan in submission order.
+    """
+    items = plan_batch(specs, capacity)
+    if not items:
+        log("[Queue] Batch is empty; nothing submitted.")
+        return items
+    payload: list[dict] = []
+    for it in items:
+        payload += queue_payload(
+            it.spec.name,
+            it.spec.project_dir,
+            it.spec.image_folders,
+            max_local_fusers=it.max_fusers,
+            working_folder=working_folder,
+        )
+    log("[Queue] Batch plan:\n" + format_plan(items, capacity))
+    submit_queue_build(payload, log=log)
+    return items
+
+
+def make_queue_monitor(on_update, poll_every: float = 2.0, projects=None) -> QueueMonitor:
+    """Return a :class:`QueueMonitor` on the Project Queue event stream.
+
+    Polling of :data:`QUEUE_API_URL` (starting every *poll_every* seconds)
+    is only used while the event stream is unavailable.  Pass a batch's
+    project names as *projects* to follow it until all of them finish.
+    """
+    poll = QUEUE_CLIENT.status if requests else None
+    return QueueMonitor(QUEUE_SSE_URL, QUEUE_API_URL, on_update, poll=poll, poll_min=poll_every, projects=projects)
+
+
 def poll_queue_until_done(
-    poll_every: int = 5, max_minutes: int = 120, log=print
-) -> None:
-    """Poll the Project Queue until completion or *max_minutes* expires."""
-    if not requests:
-        log("[Queue] requests module missing; cannot monitor queue.")
-        return
-    end = time.time() + max_minutes * 60
-    last = 0
-    while time.time() < end:
-        try:
-            r = requests.get(f"{QUEUE_API_URL}", timeout=5)
-            if r.status_code == 200:
-                now = int(time.time())
-                if now // 30 != last // 30:
-                    log("[Queue] …still building")
-                    last = now
-        except Exception:
-            pass
-        time.sleep(poll_every)
-    log("[Queue] Monitor window expired.")
+    poll_every: int = 5, max_minutes: int = 120, log=print, on_update=None
+) -> QueueUpdate | None:
+    """Follow the Project Queue until the build ends or *max_minutes* expires.
+
+    Stage changes and terminal states are logged; every structured update
+    is also passed to *on_update*.  Returns the last update seen.
+    """
+    last_stage = [""]
+
+    def _update(u: QueueUpdate) -> None:
+        if u.kind == "connection":
+            log(f"[Queue] {u.message}")
+        elif u.stage and u.stage != last_stage[0]:
+            last_stage[0] = u.stage
+            log(f"[Queue] Stage: {u.describe()}")
+        if on_update:
+            on_update(u)
+
+    final = make_queue_monitor(_update, poll_every).run(timeout=max_minutes * 60)
+    if final is not None and final.finished:
+        log(f"[Queue] Build {final.state}.")
+    else:
+        log("[Queue] Monitor window expired.")
+    return final
 # endregion
 
 # region GUI / Tkinter handlers
@@ -1028,6 +1075,9 @@ __all__ = [
     "open_in_explorer",
     "list_remote_shares",
     "probe_best_mesh_share",
+    "probe_mesh_shares",
+    "share_available",
+    "SHARE_INVENTORY",
     "map_drive",
     "unmap_drive",
     "current_mapping",
@@ -1040,7 +1090,11 @@ __all__ = [
     "assert_preset_settings_name",
     "find_wizard_exe",
     "submit_queue_build",
+    "submit_queue_batch",
+    "queue_payload",
     "poll_queue_until_done",
+    "make_queue_monitor",
+    "QUEUE_CLIENT",
     "RM_LNK_NAME",
     "RM_INSTALL_SUBDIRS",
     "is_valid_rm_local_root",
@@ -0,0 +1,398 @@
+# =============================================================================
+# Project: VBS4Project
+# File: process_watch.py
+# Purpose: One shared process scanner with a live name -> PIDs index and
+#          started/exited events for TerraExplorer, fusers and simulators
+# =============================================================================
+# Table of Contents
+#   1) Imports
+#   2) Constants & Configuration
+#   3) Data Models / Types
+#   4) Scanners
+#   5) Service
+#   6) Shared instance
+# =============================================================================
+
+# region Imports
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import itertools
+import os
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+try:
+    import psutil
+except Exception:  # pragma: no cover - psutil may not be installed
+    psutil = None
+# endregion
+
+# region Constants & Configuration
+SCAN_INTERVAL = 2.0
+# With WMI process events driving rescans, the timed scan only catches drift
+EVENT_SCAN_INTERVAL = 15.0
+
+STARTED = "started"
+EXITED = "exited"
+# endregion
+
+# region Data Models / Types
+@dataclass(frozen=True)
+class ProcessInfo:
+    pid: int
+    name: str
+    create_time: float | None = None
+    # None when the scanner cannot tell (tasklist)
+    ppid: int | None = None
+
+
+@dataclass(frozen=True)
+class ProcessEvent:
+    kind: str
+    process: ProcessInfo
+
+
+ProcessCallback = Callable[[ProcessEvent], None]
+# endregion
+
+# region Scanners
+def _scan_psutil() -> dict[int, ProcessInfo]:
+    out = {}
+    for p in psutil.process_iter(["name", "create_time", "ppid"]):
+        name = p.info.get("name")
+        if name:
+            out[p.pid] = ProcessInfo(p.pid, name, p.info.get("create_time"), p.info.get("ppid"))
+    return out
+
+
+def _scan_tasklist() -> dict[int, ProcessInfo]:
+    text = subprocess.check_output(
+        ["tasklist", "/FO", "CSV", "/NH"], text=True, stderr=subprocess.DEVNULL,
+        creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+    )
+    out = {}
+    for row in csv.reader(io.StringIO(text)):
+        if len(row) >= 2 and row[1].isdigit():
+            out[int(row[1])] = ProcessInfo(int(row[1]), row[0])
+    return out
+
+
+def _scan_proc() -> dict[int, ProcessInfo]:
+    out = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # "pid (comm) state ppid ..."; comm may itself contain ")"
+        head, _, rest = stat.rpartition(")")
+        fields = rest.split()
+        ppid = int(fields[1]) if len(fields) > 1 else None
+        out[int(entry)] = ProcessInfo(int(entry), head.partition("(")[2], None, ppid)
+    return out
+
+
+def default_scanner() -> Callable[[], dict[int, ProcessInfo]]:
+    if psutil is not None:
+        return _scan_psutil
+    if os.name == "nt":
+        return _scan_tasklist
+    return _scan_proc
+# endregion
+
+# region Service
+class ProcessWatch:
+    """Keep a live ``name -> {pid: ProcessInfo}`` index for the whole box.
+
+    One scan (``psutil.process_iter``, else ``tasklist``/``/proc``) serves
+    every caller; nobody else needs to walk the process table.  Scanning is
+    driven by demand: while anyone is subscribed, a background thread
+    rescans every *interval* seconds; otherwise a query rescans only when
+    the index is older than *interval*.  On Windows, WMI process creation /
+    deletion events (pywin32) trigger an immediate rescan while there are
+    subscribers, and the timed scan slows to :data:`EVENT_SCAN_INTERVAL`.
+
+    Subscribers get :class:`ProcessEvent` objects on the watch thread;
+    :meth:`wait_started` / :meth:`wait_exited` block and
+    :meth:`until_started` / :meth:`until_exited` can be awaited.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval: float = SCAN_INTERVAL,
+        scanner: Callable[[], dict[int, ProcessInfo]] | None = None,
+        use_wmi: bool = True,
+    ) -> None:
+        self.interval = interval
+        self._scanner = scanner or default_scanner()
+        self._use_wmi = use_wmi and os.name == "nt"
+        self._lock = threading.Lock()
+        self._scan_lock = threading.RLock()
+        self._procs: dict[int, ProcessInfo] = {}
+        self._by_name: dict[str, dict[int, ProcessInfo]] = {}
+        self._subs: dict[int, tuple[ProcessCallback, frozenset[str] | None]] = {}
+        self._ids = itertools.count(1)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._scanned_at = float("-inf")
+        # The next scan only rebuilds the table (it is too old to diff)
+        self._baseline = True
+        self.events_source = "scan"
+        self.scans = 0
+        self.scan_ms = 0.0
+
+    # -- scanning ---------------------------------------------------------
+    def scan(self) -> None:
+        """Rescan now and publish started/exited events."""
+        with self._scan_lock:
+            t0 = time.perf_counter()
+            try:
+                new = self._scanner()
+            except Exception:
+                return
+            with self._lock:
+                old = self._procs
+                started = [p for pid, p in new.items() if pid not in old or old[pid].name != p.name]
+                exited = [p for pid, p in old.items() if pid not in new or new[pid].name != p.name]
+                self._procs = new
+                by_name: dict[str, dict[int, ProcessInfo]] = {}
+                for pid, p in new.items():
+                    by_name.setdefault(p.name.lower(), {})[pid] = p
+                self._by_name = by_name
+                subs = list(self._subs.values())
+                baseline, self._baseline = self._baseline, False
+                self._scanned_at = time.monotonic()
+                self.scans += 1
+                self.scan_ms = (time.perf_counter() - t0) * 1000.0
+        if baseline:
+            return  # a table rebuilt after a gap is state, not news
+        for kind, procs in ((EXITED, exited), (STARTED, started)):
+            for p in procs:
+                ev = ProcessEvent(kind, p)
+                for cb, names in subs:
+                    if names is None or p.name.lower() in names:
+                        try:
+                            cb(ev)
+                        except Exception:
+                            pass
+
+    def _fresh(self) -> None:
+        if time.monotonic() - self._scanned_at > self.interval:
+            with self._scan_lock:
+                # Another caller may have rescanned while we waited
+                if time.monotonic() - self._scanned_at > self.interval:
+                    self.scan()
+
+    def poke(self) -> None:
+        """Ask for a rescan as soon as possible (e.g. right after a spawn)."""
+        self._scanned_at = float("-inf")
+        self._wake.set()
+
+    def _active(self) -> bool:
+        with self._lock:
+            return bool(self._subs)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if self._active():
+                self.scan()
+                interval = EVENT_SCAN_INTERVAL if self.events_source == "wmi" else self.interval
+                self._wake.wait(interval)
+            else:
+                # Nobody is listening: queries scan on demand instead
+                self._wake.wait()
+            self._wake.clear()
+
+    def _run_wmi(self) -> None:
+        try:
+            import pythoncom  # type: ignore
+            import win32com.client  # type: ignore
+
+            pythoncom.CoInitialize()
+            svc = win32com.client.GetObject("winmgmts:")
+        except Exception:
+            return
+        queries = None
+        try:
+            while not self._stop.is_set():
+                if not self._active():
+                    # WMI polls the process table for us every second; only
+                    # keep the subscription while someone is listening
+                    queries, self.events_source = None, "scan"
+                    self._stop.wait(1.0)
+                    continue
+                if queries is None:
+                    try:
+                        queries = [
+                            svc.ExecNotificationQuery(
+                                f"SELECT * FROM {cls} WITHIN 1 WHERE TargetInstance ISA 'Win32_Process'"
+                            )
+                            for cls in ("__InstanceCreationEvent", "__InstanceDeletionEvent")
+                        ]
+                    except Exception:
+                        return
+                    self.events_source = "wmi"
+                for q in queries:
+                    try:
+                        q.NextEvent(250)
+                    except Exception:
+                        continue  # wbemErrTimedout
+                    self.poke()
+        finally:
+            self.events_source = "scan"
+            self.poke()
+
+    def start(self) -> "ProcessWatch":
+        if self._thread and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="process-watch", daemon=True)
+        self._thread.start()
+        if self._use_wmi:
+            threading.Thread(target=self._run_wmi, name="process-watch-wmi", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    # -- queries ----------------------------------------------------------
+    def processes(self, name: str) -> list[ProcessInfo]:
+        self._fresh()
+        with self._lock:
+            return list(self._by_name.get(name.lower(), {}).values())
+
+    def pids(self, name: str) -> list[int]:
+        return [p.pid for p in self.processes(name)]
+
+    def count(self, name: str) -> int:
+        return len(self.processes(name))
+
+    def running(self, name: str) -> bool:
+        return bool(self.processes(name))
+
+    def first_running(self, names: Iterable[str]) -> ProcessInfo | None:
+        """First process found among *names* (e.g. any simulator)."""
+        self._fresh()
+        with self._lock:
+            for n in names:
+                procs = self._by_name.get(n.lower())
+                if procs:
+                    return next(iter(procs.values()))
+        return None
+
+    def alive(self, pid: int) -> bool:
+        self._fresh()
+        with self._lock:
+            return pid in self._procs
+
+    def ancestors(self, pid: int) -> list[int] | None:
+        """Parent PIDs of *pid*, nearest first; None if the scanner has no parentage."""
+        self._fresh()
+        with self._lock:
+            info = self._procs.get(pid)
+            if info is None:
+                return []
+            if info.ppid is None:
+                return None
+            chain: list[int] = []
+            while info is not None and info.ppid and info.ppid != pid and info.ppid not in chain:
+                parent = self._procs.get(info.ppid)
+                # A parent newer than its child is a reused PID, not the parent
+                if parent and parent.create_time and info.create_time and parent.create_time > info.create_time:
+                    break
+                chain.append(info.ppid)
+                info = parent
+            return chain
+
+    # -- subscriptions ----------------------------------------------------
+    def subscribe(self, callback: ProcessCallback, names: Iterable[str] | None = None) -> int:
+        """Call *callback* for start/exit of *names* (all when None); returns a token."""
+        key = frozenset(n.lower() for n in names) if names is not None else None
+        with self._lock:
+            token = next(self._ids)
+            stale = not self._subs and time.monotonic() - self._scanned_at > self.interval
+            if stale:
+                self._baseline = True
+            self._subs[token] = (callback, key)
+        if stale:
+            # Rebuild the table now so whatever happens next is news
+            self.scan()
+        self._wake.set()
+        return token
+
+    def unsubscribe(self, token: int) -> None:
+        with self._lock:
+            self._subs.pop(token, None)
+
+    def _wait(self, name: str, kind: str, timeout: float | None) -> ProcessInfo | None:
+        hit: list[ProcessInfo] = []
+        done = threading.Event()
+
+        def _cb(ev: ProcessEvent) -> None:
+            if ev.kind == kind:
+                if kind == EXITED and self.running(name):
+                    return  # another instance still runs
+                hit.append(ev.process)
+                done.set()
+
+        token = self.subscribe(_cb, [name])
+        try:
+            current = self.processes(name)
+            if kind == STARTED and current:
+                return current[0]
+            if kind == EXITED and not current:
+                return ProcessInfo(0, name)
+            done.wait(timeout)
+            return hit[0] if hit else None
+        finally:
+            self.unsubscribe(token)
+
+    def wait_started(self, name: str, timeout: float | None = None) -> ProcessInfo | None:
+        """Block until *name* runs (returns at once if it already does)."""
+        return self._wait(name, STARTED, timeout)
+
+    def wait_exited(self, name: str, timeout: float | None = None) -> ProcessInfo | None:
+        """Block until no process called *name* is left."""
+        return self._wait(name, EXITED, timeout)
+
+    async def until_started(self, name: str, timeout: float | None = None) -> ProcessInfo | None:
+        return await asyncio.get_running_loop().run_in_executor(None, self.wait_started, name, timeout)
+
+    async def until_exited(self, name: str, timeout: float | None = None) -> ProcessInfo | None:
+        return await asyncio.get_running_loop().run_in_executor(None, self.wait_exited, name, timeout)
+# endregion
+
+# region Shared instance
+_WATCH: ProcessWatch | None = None
+_WATCH_LOCK = threading.Lock()
+
+
+def get_process_watch() -> ProcessWatch:
+    """Return the process-wide :class:`ProcessWatch` (started on first use)."""
+    global _WATCH
+    with _WATCH_LOCK:
+        if _WATCH is None:
+            _WATCH = ProcessWatch().start()
+        return _WATCH
+# endregion
+
+__all__ = [
+    "EXITED",
+    "STARTED",
+    "ProcessEvent",
+    "ProcessInfo",
+    "ProcessWatch",
+    "get_process_watch",
+]
@@ -0,0 +1,295 @@
+# =============================================================================
+# Project: VBS4Project
+# File: progress_agg.py
+# Purpose: Combine every render log / fuser output into one progress and ETA
+# =============================================================================
+# Table of Contents
+#   1) Imports
+#   2) Constants & Configuration
+#   3) Data Models / Types
+#   4) Line parsing
+#   5) Aggregator
+#   6) Follower (background thread)
+# =============================================================================
+
+# region Imports
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Mapping
+
+from log_tail import LogTail
+# endregion
+
+# region Constants & Configuration
+_PROGRESS_RE = re.compile(r"Progress:\s*(\d+)%")
+_TILE_RE = re.compile(r"Tile\s+(\d+)\s+of\s+(\d+)")
+_STAGE_RE = re.compile(r"\b(?:Stage|Step)\s*[:#]?\s*([A-Za-z][\w\- ]{2,40}?)\s*(?:[,;|(\[]|$)")
+
+# Throughput is measured over this many seconds of history ...
+ETA_WINDOW = 300.0
+# ... and only once at least this much of it exists
+ETA_MIN_SPAN = 20.0
+# Logs untouched for longer than this are not picked up as new sources
+ACTIVE_SECS = 600.0
+FOLLOW_INTERVAL = 2.0
+# endregion
+
+# region Data Models / Types
+@dataclass(frozen=True)
+class ProgressSample:
+    """Latest progress line of one source."""
+
+    done: int | None = None
+    total: int | None = None
+    percent: int | None = None
+    stage: str = ""
+
+    @property
+    def fraction(self) -> float:
+        if self.total:
+            return min(1.0, (self.done or 0) / self.total)
+        return min(1.0, (self.percent or 0) / 100.0)
+
+
+@dataclass(frozen=True)
+class ProgressSnapshot:
+    percent: int
+    eta: float | None
+    sources: int
+    # stage -> (tiles done, tiles total) over every tiled source, in order
+    stages: dict[str, tuple[int, int]] = field(default_factory=dict)
+
+    def eta_text(self) -> str:
+        if self.percent >= 100:
+            return "done"
+        if self.eta is None:
+            return "ETA --"
+        secs = int(self.eta)
+        if secs >= 3600:
+            return f"ETA {secs // 3600}h {secs % 3600 // 60:02d}m"
+        if secs >= 600:
+            return f"ETA {secs // 60}m"
+        return f"ETA {secs // 60}m {secs % 60 // 10 * 10:02d}s"
+# endregion
+
+# region Line parsing
+def parse_progress_line(line: str) -> ProgressSample | None:
+    """Parse ``Progress: N%`` / ``Tile X of Y`` (plus an optional stage name)."""
+    percent = done = total = None
+    if "Progress:" in line:
+        m = _PROGRESS_RE.search(line)
+        if m:
+            percent = int(m.group(1))
+    m = _TILE_RE.search(line)
+    if m:
+        done, total = map(int, m.groups())
+        if total and percent is None:
+            percent = int(done / total * 100)
+    if percent is None:
+        return None
+    m = _STAGE_RE.search(line)
+    return ProgressSample(done, total, percent, m.group(1).strip() if m else "")
+# endregion
+
+# region Aggregator
+class _SourceStages:
+    """Stages one source has finished, plus its latest sample."""
+
+    __slots__ = ("finished", "current")
+
+    def __init__(self) -> None:
+        # (stage name, tile total or None) of every finished stage
+        self.finished: list[tuple[str, int | None]] = []
+        self.current: ProgressSample | None = None
+
+    def advance(self, sample: ProgressSample) -> bool:
+        """Record *sample*; return True if it started a new stage.
+
+        PhotoMesh restarts its tile count per stage, so a different tile
+        total, a falling count or a new stage name ends the current stage.
+        """
+        prev, self.current = self.current, sample
+        if prev is None:
+            return False
+        if sample.stage and prev.stage and sample.stage != prev.stage:
+            changed = True
+        elif sample.total or prev.total:
+            changed = sample.total != prev.total or (sample.done or 0) < (prev.done or 0)
+        else:
+            changed = (sample.percent or 0) < (prev.percent or 0)
+        if changed:
+            self.finished.append((prev.stage or f"Stage {len(self.finished) + 1}", prev.total))
+        return changed
+
+    def weights(self, unit: float) -> tuple[float, float]:
+        """``(done, total)`` across every stage seen; untiled stages weigh *unit*."""
+        done = sum(float(t) if t else unit for _, t in self.finished)
+        cur = self.current
+        w = float(cur.total) if cur.total else unit
+        return done + w * cur.fraction, done + w
+
+
+class ProgressAggregator:
+    """Fold per-source samples into one stable percentage and an ETA.
+
+    Sources with tile counts weigh by their tile total; percent-only sources
+    weigh as much as an average tiled source.  Each source's stages are
+    tracked (see :meth:`_SourceStages.advance`): finished stages count as
+    done and keep their weight, so a stage restarting at "Tile 1 of N" pulls
+    the figure to its true share instead of reading as 100 %.  Within a
+    stage the percentage never moves backwards, so a lagging fuser cannot
+    drag the bar down.  The ETA comes from the progress rate over the last
+    :data:`ETA_WINDOW` seconds of the current stage.
+
+    Nothing here knows whether another stage follows, so the percentage
+    stops at 99 until the caller sees the build's real completion.
+    """
+
+    def __init__(self, window: float = ETA_WINDOW) -> None:
+        self.window = window
+        self._sources: dict[str, _SourceStages] = {}
+        self._history: deque[tuple[float, float]] = deque()
+        self._shown = 0.0
+
+    def reset(self) -> None:
+        self._sources.clear()
+        self._history.clear()
+        self._shown = 0.0
+
+    def _stages(self) -> dict[str, tuple[int, int]]:
+        stages: dict[str, tuple[int, int]] = {}
+        for src in self._sources.values():
+            for name, total in src.finished:
+                if total:
+                    d, t = stages.get(name, (0, 0))
+                    stages[name] = (d + total, t + total)
+            cur = src.current
+            if cur is not None and cur.total:
+                name = cur.stage or f"Stage {len(src.finished) + 1}"
+                d, t = stages.get(name, (0, 0))
+                stages[name] = (d + (cur.done or 0), t + cur.total)
+        return stages
+
+    def update(self, samples: Mapping[str, ProgressSample], now: float | None = None) -> ProgressSnapshot:
+        """Fold the latest sample of each source (keyed by path) into a snapshot."""
+        now = time.monotonic() if now is None else now
+        new_stage = False
+        for key, sample in samples.items():
+            new_stage |= self._sources.setdefault(key, _SourceStages()).advance(sample)
+        active = [self._sources[k] for k in samples]
+        tiled = [s.current for s in active if s.current.total]
+        unit = sum(s.total for s in tiled) / len(tiled) if tiled else 1.0
+        weight = done = 0.0
+        for src in active:
+            d, w = src.weights(unit)
+            done += d
+            weight += w
+        raw = done / weight if weight else 0.0
+        if new_stage:
+            # The whole changed; earlier rates and the clamp no longer apply
+            self._history.clear()
+            self._shown = raw
+        else:
+            self._shown = max(self._shown, raw)
+
+        self._history.append((now, self._shown))
+        while len(self._history) > 2 and now - self._history[0][0] > self.window:
+            self._history.popleft()
+        eta = None
+        t0, f0 = self._history[0]
+        if now - t0 >= ETA_MIN_SPAN and f0 < self._shown < 1.0:
+            rate = (self._shown - f0) / (now - t0)
+            eta = (1.0 - self._shown) / rate
+        return ProgressSnapshot(min(99, int(self._shown * 100)), eta, len(samples), self._stages())
+# endregion
+
+# region Follower (background thread)
+class ProgressFollower:
+    """Follow every active source from *sources()* and report snapshots.
+
+    Each source is tailed incrementally (see :class:`log_tail.LogTail`).
+    *on_change* runs on the follower thread, only when the percentage, the
+    displayed ETA or the set of stages seen changes.  The follower runs until
+    :meth:`stop`: only the caller knows when the build has really finished.
+    """
+
+    def __init__(
+        self,
+        sources: Callable[[], Iterable[str]],
+        on_change: Callable[[ProgressSnapshot], None],
+        *,
+        interval: float = FOLLOW_INTERVAL,
+        parse: Callable[[str], ProgressSample | None] = parse_progress_line,
+    ) -> None:
+        self.sources = sources
+        self.on_change = on_change
+        self.interval = interval
+        self.tail = LogTail(parse)
+        self.aggregator = ProgressAggregator()
+        self.last: ProgressSnapshot | None = None
+        self._tracked: set[str] = set()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _active(self) -> list[str]:
+        now = time.time()
+        for p in self.sources():
+            if p in self._tracked:
+                continue
+            try:
+                if now - os.stat(p).st_mtime <= ACTIVE_SECS:
+                    self._tracked.add(p)
+            except OSError:
+                pass
+        return sorted(self._tracked)
+
+    def tick(self) -> ProgressSnapshot | None:
+        try:
+            paths = self._active()
+        except Exception:
+            paths = sorted(self._tracked)
+        samples = {p: s for p in paths if (s := self.tail.last_match(p)) is not None}
+        if not samples:
+            return self.last
+        snap = self.aggregator.update(samples)
+        if self.last is None or (snap.percent, snap.eta_text(), list(snap.stages)) != (
+            self.last.percent, self.last.eta_text(), list(self.last.stages)
+        ):
+            self.last = snap
+            try:
+                self.on_change(snap)
+            except Exception:
+                pass
+        return snap
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.tick()
+
+    def start(self) -> "ProgressFollower":
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="render-progress", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+# endregion
+
+__all__ = [
+    "ProgressAggregator",
+    "ProgressFollower",
+    "ProgressSample",
+    "ProgressSnapshot",
+    "parse_progress_line",
+]
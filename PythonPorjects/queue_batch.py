@@ -0,0 +1,138 @@
+# =============================================================================
+# Project: VBS4Project
+# File: queue_batch.py
+# Purpose: Plan multi-project Project Queue batches (order and fuser caps)
+# =============================================================================
+# Table of Contents
+#   1) Imports
+#   2) Constants & Configuration
+#   3) Data Models / Types
+#   4) Imagery sizing
+#   5) Cluster capacity
+#   6) Planning & reporting
+# =============================================================================
+
+# region Imports
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Iterable
+# endregion
+
+# region Constants & Configuration
+IMAGE_EXTS = frozenset({".jpg", ".jpeg", ".tif", ".tiff", ".png", ".dng", ".cr2", ".nef", ".arw"})
+# Used when the fuser config lists no fusers at all (the old constant)
+DEFAULT_CAPACITY = 8
+# endregion
+
+# region Data Models / Types
+@dataclass(frozen=True)
+class ProjectSpec:
+    """One imagery set to build as its own PhotoMesh project."""
+
+    name: str
+    project_dir: str
+    image_folders: tuple[str, ...]
+    # Higher builds first; equal priorities build smallest first
+    priority: int = 0
+
+
+@dataclass(frozen=True)
+class BatchItem:
+    spec: ProjectSpec
+    images: int
+    size_bytes: int
+    max_fusers: int
+
+    @property
+    def sort_key(self) -> tuple:
+        return (-self.spec.priority, self.images, self.size_bytes, self.spec.name.lower())
+# endregion
+
+# region Imagery sizing
+def count_imagery(folders: Iterable[str]) -> tuple[int, int]:
+    """Return ``(image_count, total_bytes)`` under *folders* (recursive)."""
+    count = size = 0
+    stack = list(folders)
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif os.path.splitext(entry.name)[1].lower() in IMAGE_EXTS:
+                            count += 1
+                            size += entry.stat().st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return count, size
+# endregion
+
+# region Cluster capacity
+def cluster_capacity(cfg_path: str, local_fusers: int | None = None) -> int:
+    """Count the fusers configured across the cluster in ``fuser_config.json``.
+
+    *local_fusers* replaces the ``localhost`` entry count (e.g. with the
+    autoscaler's current target).  Falls back to :data:`DEFAULT_CAPACITY`.
+    """
+    try:
+        with open(cfg_path, "r") as f:
+            fusers = json.load(f).get("fusers", {}) or {}
+    except Exception:
+        fusers = {}
+    total = 0
+    for host, entries in fusers.items():
+        if host.lower() == "localhost" and local_fusers is not None:
+            total += max(0, local_fusers)
+        elif isinstance(entries, list):
+            total += len(entries)
+    if "localhost" not in {h.lower() for h in fusers} and local_fusers:
+        total += local_fusers
+    return total or DEFAULT_CAPACITY
+# endregion
+
+# region Planning & reporting
+def plan_batch(specs: Iterable[ProjectSpec], capacity: int) -> list[BatchItem]:
+    """Size every project and order them: priority, then shortest first.
+
+    Back-to-back short builds keep the fuser pool busy instead of queuing
+    several small sets behind one long one.  Projects without images are
+    left out.
+    """
+    items = []
+    for spec in specs:
+        images, size = count_imagery(spec.image_folders)
+        if images:
+            # The queue builds one project at a time, so each gets the whole
+            # pool; fusers withheld from a small set would just sit idle
+            items.append(BatchItem(spec, images, size, max(1, capacity)))
+    items.sort(key=lambda it: it.sort_key)
+    return items
+
+
+def format_plan(items: list[BatchItem], capacity: int) -> str:
+    """Aligned table of the submission order for the log."""
+    header = ("#", "Project", "Priority", "Images", "GB", "Fusers")
+    body = [
+        (str(i), it.spec.name, str(it.spec.priority), str(it.images), f"{it.size_bytes / 1024 ** 3:.1f}", str(it.max_fusers))
+        for i, it in enumerate(items, 1)
+    ]
+    widths = [max(len(row[i]) for row in [header] + body) for i in range(len(header))]
+    lines = ["  ".join(cell.ljust(widths[i]) for i, cell in enumerate(row)).rstrip() for row in [header] + body]
+    lines.append(f"{len(items)} project(s), cluster capacity {capacity} fuser(s)")
+    return "\n".join(lines)
+# endregion
+
+__all__ = [
+    "BatchItem",
+    "ProjectSpec",
+    "cluster_capacity",
+    "count_imagery",
+    "format_plan",
+    "plan_batch",
+]
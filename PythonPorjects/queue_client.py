@@ -0,0 +1,233 @@
+# =============================================================================
+# Project: VBS4Project
+# File: queue_client.py
+# Purpose: Keep-alive, retrying client for the PhotoMesh Project Queue REST API
+# =============================================================================
+# Table of Contents
+#   1) Imports
+#   2) Constants & Configuration
+#   3) Errors & Metrics
+#   4) Client
+# =============================================================================
+
+# region Imports
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+
+from queue_events import QueueUpdate, to_updates
+
+try:  # pragma: no cover - optional dependency
+    import requests  # type: ignore
+    from requests.adapters import HTTPAdapter  # type: ignore
+    from urllib3.exceptions import NewConnectionError  # type: ignore
+except Exception:  # pragma: no cover - requests may be absent in minimal environments
+    requests = None  # type: ignore
+    HTTPAdapter = None  # type: ignore
+    NewConnectionError = None  # type: ignore
+# endregion
+
+# region Constants & Configuration
+RETRIES = 3
+BACKOFF_BASE = 0.25
+BACKOFF_MAX = 4.0
+# Gateway-ish answers PhotoMesh gives while the queue service starts up
+RETRY_STATUS = frozenset({429, 502, 503, 504})
+
+ALIVE_DEADLINE = 2.0
+STATUS_DEADLINE = 5.0
+SUBMIT_DEADLINE = 60.0
+# endregion
+
+# region Errors & Metrics
+class QueueError(RuntimeError):
+    """The Project Queue answered with an error (or not at all)."""
+
+    def __init__(self, message: str, status: int | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class EndpointStats:
+    calls: int = 0
+    errors: int = 0
+    retries: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_ms: float = 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+# endregion
+
+# region Client
+class ProjectQueueClient:
+    """Typed calls to ``/ProjectQueue/`` over one pooled keep-alive session.
+
+    Every call has a *deadline* covering all of its attempts.  Failed
+    attempts are retried with full-jitter exponential backoff: GETs on
+    connection errors, timeouts and :data:`RETRY_STATUS`; the ``project/add``
+    POST only when no connection was ever made (connect timeout or refused
+    connection), so a request whose body may have reached the server is
+    never sent twice.  Per-endpoint timings are kept in :meth:`metrics`.
+    """
+
+    def __init__(self, base_url: str, *, retries: int = RETRIES, session=None) -> None:
+        if not base_url.endswith("/"):
+            base_url += "/"
+        self.base_url = base_url
+        self.retries = retries
+        self._session = session
+        self._session_lock = threading.Lock()
+        self._stats: dict[str, EndpointStats] = {}
+        self._stats_lock = threading.Lock()
+
+    # -- plumbing ---------------------------------------------------------
+    @property
+    def session(self):
+        if self._session is None:
+            if requests is None:
+                raise QueueError("requests library is required for the Project Queue")
+            with self._session_lock:
+                if self._session is None:
+                    s = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0)
+                    s.mount("http://", adapter)
+                    s.mount("https://", adapter)
+                    self._session = s
+        return self._session
+
+    def _record(self, endpoint: str, ms: float, ok: bool, retries: int) -> None:
+        with self._stats_lock:
+            st = self._stats.setdefault(endpoint, EndpointStats())
+            st.calls += 1
+            st.errors += 0 if ok else 1
+            st.retries += retries
+            st.total_ms += ms
+            st.max_ms = max(st.max_ms, ms)
+            st.last_ms = ms
+
+    @staticmethod
+    def _never_connected(exc: BaseException) -> bool:
+        """Whether *exc* wraps a failure to open the connection at all."""
+        seen: set[int] = set()
+        todo: list = [exc]
+        while todo:
+            e = todo.pop()
+            if e is None or id(e) in seen:
+                continue
+            seen.add(id(e))
+            if NewConnectionError is not None and isinstance(e, NewConnectionError):
+                return True
+            # requests -> urllib3 MaxRetryError(reason=...) -> NewConnectionError
+            todo += [getattr(e, "reason", None), e.__cause__, e.__context__]
+            todo += [a for a in getattr(e, "args", ()) if isinstance(a, BaseException)]
+        return False
+
+    @classmethod
+    def _retryable(cls, exc: Exception, idempotent: bool) -> bool:
+        if isinstance(exc, requests.exceptions.ConnectTimeout):
+            return True
+        if not isinstance(exc, requests.exceptions.ConnectionError):
+            return False
+        # "Connection aborted"/reset may come after the body was sent
+        return idempotent or cls._never_connected(exc)
+
+    def _call(self, method: str, endpoint: str, deadline: float, *, idempotent: bool = True, **kwargs):
+        session = self.session
+        url = self.base_url + endpoint
+        start = time.monotonic()
+        end = start + deadline
+        attempt = 0
+        while True:
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                self._record(endpoint, (time.monotonic() - start) * 1000.0, False, attempt)
+                raise QueueError(f"{method} {endpoint or '/'}: deadline of {deadline:g} s exceeded")
+            try:
+                resp = session.request(method, url, timeout=remaining, **kwargs)
+            except Exception as exc:
+                if attempt >= self.retries or not self._retryable(exc, idempotent):
+                    self._record(endpoint, (time.monotonic() - start) * 1000.0, False, attempt)
+                    raise QueueError(f"{method} {endpoint or '/'}: {exc}") from exc
+            else:
+                if not (idempotent and resp.status_code in RETRY_STATUS and attempt < self.retries):
+                    ok = resp.status_code == 200
+                    self._record(endpoint, (time.monotonic() - start) * 1000.0, ok, attempt)
+                    if not ok:
+                        raise QueueError(
+                            f"{method} {endpoint or '/'} failed: {resp.status_code} {resp.text[:300]}",
+                            resp.status_code,
+                        )
+                    return resp
+            attempt += 1
+            delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+            time.sleep(max(0.0, min(delay, end - time.monotonic())))
+
+    # -- endpoints --------------------------------------------------------
+    def alive(self, deadline: float = ALIVE_DEADLINE) -> bool:
+        """True if the queue answers 200 within *deadline*."""
+        try:
+            self._call("GET", "", deadline)
+            return True
+        except QueueError:
+            return False
+
+    def wait_alive(self, timeout: float, interval: float = 0.5, max_interval: float = 5.0) -> bool:
+        """Wait up to *timeout* for the queue, probing less often as time passes."""
+        end = time.monotonic() + timeout
+        while True:
+            if self.alive(min(ALIVE_DEADLINE, max(0.1, end - time.monotonic()))):
+                return True
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(interval, remaining))
+            interval = min(max_interval, interval * 1.5)
+
+    def status(self, deadline: float = STATUS_DEADLINE) -> list[QueueUpdate]:
+        """Current queue state, one :class:`QueueUpdate` per project (``source="poll"``)."""
+        resp = self._call("GET", "", deadline)
+        try:
+            body = resp.json()
+        except ValueError:
+            body = resp.text
+        return to_updates("status", body)
+
+    def add(self, payload: list[dict], deadline: float = SUBMIT_DEADLINE) -> None:
+        """``POST project/add`` with a queue payload (see ``queue_payload``)."""
+        self._call("POST", "project/add", deadline, idempotent=False, json=payload)
+
+    def start(self, deadline: float = SUBMIT_DEADLINE) -> None:
+        """``GET Build/Start``."""
+        self._call("GET", "Build/Start", deadline)
+
+    # -- metrics ----------------------------------------------------------
+    def metrics(self) -> dict[str, EndpointStats]:
+        with self._stats_lock:
+            return {k or "/": EndpointStats(**vars(v)) for k, v in self._stats.items()}
+
+    def summary(self) -> str:
+        rows = [
+            f"{ep}: {st.calls} calls, {st.errors} errors, {st.retries} retries, "
+            f"mean {st.mean_ms:.1f} ms, max {st.max_ms:.1f} ms"
+            for ep, st in sorted(self.metrics().items())
+        ]
+        return "\n".join(rows) or "no Project Queue calls yet"
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+# endregion
+
+__all__ = [
+    "EndpointStats",
+    "ProjectQueueClient",
+    "QueueError",
+]
@@ -0,0 +1,395 @@
+# =============================================================================
+# Project: VBS4Project
+# File: queue_events.py
+# Purpose: Project Queue event-stream monitor with a polling fallback
+# =============================================================================
+# Table of Contents
+#   1) Imports
+#   2) Constants & Configuration
+#   3) Data Models / Types
+#   4) SSE parsing
+#   5) Monitor
+# =============================================================================
+
+# region Imports
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+import urllib.request
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator
+# endregion
+
+# region Constants & Configuration
+# The server sends keep-alive comments; this much silence means a dead stream
+STREAM_READ_TIMEOUT = 45.0
+CONNECT_TIMEOUT = 5.0
+# Reconnect backoff (the server's "retry:" field replaces the base)
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+# After this many failed stream attempts in a row, poll for a while instead
+STREAM_FAILURES_BEFORE_POLL = 3
+POLL_WINDOW = 60.0
+# Adaptive polling: fast while things change, slower while they don't
+POLL_MIN = 2.0
+POLL_MAX = 30.0
+POLL_GROWTH = 1.5
+
+TERMINAL_STATES = frozenset(
+    {"done", "complete", "completed", "finished", "succeeded", "success",
+     "failed", "error", "aborted", "cancelled", "canceled"}
+)
+_STATE_KEYS = ("state", "status", "buildstatus")
+_STAGE_KEYS = ("stage", "step", "buildstep", "task")
+_PERCENT_KEYS = ("percent", "progress", "percentage")
+_PROJECT_KEYS = ("project", "projectname", "name")
+_MESSAGE_KEYS = ("message", "text", "comment")
+# endregion
+
+# region Data Models / Types
+@dataclass(frozen=True)
+class SSEEvent:
+    event: str
+    data: str
+    id: str = ""
+    retry: int | None = None
+
+
+@dataclass(frozen=True)
+class QueueUpdate:
+    """One structured Project Queue update for the UI."""
+
+    kind: str
+    state: str = ""
+    stage: str = ""
+    percent: int | None = None
+    project: str = ""
+    message: str = ""
+    event_id: str = ""
+    source: str = "stream"
+
+    @property
+    def finished(self) -> bool:
+        return self.state.lower() in TERMINAL_STATES
+
+    @property
+    def failed(self) -> bool:
+        return self.finished and self.state.lower() in ("failed", "error", "aborted", "cancelled", "canceled")
+
+    def key(self) -> tuple:
+        """What counts as "changed" between two polls."""
+        return (self.state, self.stage, self.percent, self.project)
+
+    def describe(self) -> str:
+        parts = [p for p in (self.project, self.stage, self.state) if p]
+        if self.percent is not None:
+            parts.append(f"{self.percent}%")
+        if self.message:
+            parts.append(self.message)
+        return " | ".join(parts) or self.kind
+# endregion
+
+# region SSE parsing
+class SSEParser:
+    """Incremental ``text/event-stream`` parser (one line at a time)."""
+
+    def __init__(self) -> None:
+        self._event = ""
+        self._data: list[str] = []
+        self._id = ""
+        self._retry: int | None = None
+        self.last_id = ""
+
+    def feed(self, line: str) -> SSEEvent | None:
+        line = line.rstrip("\r\n")
+        if not line:
+            return self._dispatch()
+        if line.startswith(":"):
+            return None  # comment / keep-alive
+        name, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if name == "event":
+            self._event = value
+        elif name == "data":
+            self._data.append(value)
+        elif name == "id" and "\0" not in value:
+            self._id = value
+        elif name == "retry" and value.isdigit():
+            self._retry = int(value)
+        return None
+
+    def _dispatch(self) -> SSEEvent | None:
+        if self._id:
+            self.last_id = self._id
+        retry, self._retry = self._retry, None
+        if not self._data:
+            self._event = ""
+            return SSEEvent("", "", self.last_id, retry) if retry is not None else None
+        ev = SSEEvent(self._event or "message", "\n".join(self._data), self.last_id, retry)
+        self._event, self._data = "", []
+        return ev
+
+
+def _pick(data: dict, keys: tuple[str, ...]):
+    lowered = {str(k).lower(): v for k, v in data.items()}
+    for k in keys:
+        if lowered.get(k) not in (None, ""):
+            return lowered[k]
+    return None
+
+
+def _percent(value) -> int | None:
+    try:
+        v = float(str(value).rstrip("%"))
+    except (TypeError, ValueError):
+        return None
+    if isinstance(value, float) and 0.0 <= v <= 1.0:
+        v *= 100.0  # fraction
+    return max(0, min(100, int(round(v))))
+
+
+def _decode(payload):
+    if isinstance(payload, str):
+        try:
+            return json.loads(payload)
+        except ValueError:
+            return None
+    return payload
+
+
+def to_update(kind: str, payload: str | dict, event_id: str = "", source: str = "stream") -> QueueUpdate:
+    """Map a build/stage/progress event (JSON or plain text) to an update.
+
+    A queue list maps to its first entry; use :func:`to_updates` for status
+    answers that list several projects.
+    """
+    data = _decode(payload)
+    if isinstance(data, list) and data and isinstance(data[0], dict):
+        data = data[0]
+    if not isinstance(data, dict):
+        return QueueUpdate(kind, message=str(payload).strip(), event_id=event_id, source=source)
+    state = _pick(data, _STATE_KEYS)
+    stage = _pick(data, _STAGE_KEYS)
+    project = _pick(data, _PROJECT_KEYS)
+    message = _pick(data, _MESSAGE_KEYS)
+    return QueueUpdate(
+        kind,
+        str(state or ""),
+        str(stage or ""),
+        _percent(_pick(data, _PERCENT_KEYS)),
+        str(project or ""),
+        str(message or ""),
+        event_id,
+        source,
+    )
+
+
+def to_updates(kind: str, payload: str | list | dict, source: str = "poll") -> list[QueueUpdate]:
+    """Map a status answer to one update per queued project."""
+    data = _decode(payload)
+    if isinstance(data, list) and data and all(isinstance(d, dict) for d in data):
+        return [to_update(kind, d, source=source) for d in data]
+    return [to_update(kind, payload, source=source)]
+# endregion
+
+# region Monitor
+def _open_stream(url: str, last_event_id: str, timeout: float):
+    req = urllib.request.Request(url, headers={"Accept": "text/event-stream", "Cache-Control": "no-cache"})
+    if last_event_id:
+        req.add_header("Last-Event-ID", last_event_id)
+    resp = urllib.request.urlopen(req, timeout=timeout)
+    ctype = resp.headers.get("Content-Type", "")
+    if "text/event-stream" not in ctype:
+        resp.close()
+        raise ConnectionError(f"not an event stream ({ctype or 'no content type'})")
+    return resp
+
+
+def _http_status(url: str, timeout: float = CONNECT_TIMEOUT) -> list[QueueUpdate]:
+    with urllib.request.urlopen(url, timeout=timeout) as resp:
+        body = resp.read().decode("utf-8", "replace")
+    return to_updates("status", body)
+
+
+class QueueMonitor:
+    """Follow the Project Queue and publish :class:`QueueUpdate` objects.
+
+    The event stream at *events_url* is preferred: events arrive as they
+    happen, and a dropped connection is resumed with ``Last-Event-ID`` after
+    a jittered exponential backoff.  Only when the stream keeps failing does
+    the monitor poll *status_url* (via *poll*), at an interval that shortens
+    while the status changes and stretches while it does not, and it goes
+    back to the stream after :data:`POLL_WINDOW` seconds.
+
+    With *projects* (a batch), monitoring ends only once every named project
+    has reached a terminal state; otherwise the first terminal state ends it
+    (while polling, that of the queue's first entry).  *poll* returns one
+    update per queued project.  *on_update* runs on the monitor thread;
+    marshal to Tk yourself.
+    """
+
+    def __init__(
+        self,
+        events_url: str,
+        status_url: str,
+        on_update: Callable[[QueueUpdate], None],
+        *,
+        poll: Callable[[], list[QueueUpdate]] | None = None,
+        open_stream: Callable[[str, str, float], object] = _open_stream,
+        read_timeout: float = STREAM_READ_TIMEOUT,
+        poll_min: float = POLL_MIN,
+        projects: Iterable[str] | None = None,
+    ) -> None:
+        self.events_url = events_url
+        self.status_url = status_url
+        self.on_update = on_update
+        self._poll = poll or (lambda: _http_status(status_url))
+        self._open_stream = open_stream
+        self.read_timeout = read_timeout
+        self.poll_min = poll_min
+        self.last_event_id = ""
+        self.mode = "stream"
+        self.last: QueueUpdate | None = None
+        self.pending: set[str] | None = {p.lower() for p in projects} if projects is not None else None
+        # project -> (key, message) last published while polling
+        self._polled: dict[str, tuple] = {}
+        self._backoff_base = BACKOFF_BASE
+        self._stop = threading.Event()
+        self._resp = None
+        self._thread: threading.Thread | None = None
+
+    # -- plumbing ---------------------------------------------------------
+    def _emit(self, update: QueueUpdate) -> None:
+        if update.kind != "connection":
+            self.last = update
+        try:
+            self.on_update(update)
+        except Exception:
+            pass
+
+    def _ends_run(self, update: QueueUpdate) -> bool:
+        if not update.finished:
+            return False
+        if self.pending is None:
+            return True
+        self.pending.discard(update.project.lower())
+        return not self.pending
+
+    def _set_mode(self, mode: str, message: str) -> None:
+        if mode != self.mode:
+            self.mode = mode
+            self._emit(QueueUpdate("connection", message=message, source=mode))
+
+    def _backoff(self, failures: int) -> float:
+        delay = min(BACKOFF_MAX, self._backoff_base * (2 ** max(0, failures - 1)))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _events(self) -> Iterator[QueueUpdate]:
+        resp = self._open_stream(self.events_url, self.last_event_id, self.read_timeout)
+        self._resp = resp
+        self._set_mode("stream", "event stream connected")
+        parser = SSEParser()
+        parser.last_id = self.last_event_id
+        try:
+            for raw in resp:
+                if self._stop.is_set():
+                    return
+                ev = parser.feed(raw.decode("utf-8", "replace") if isinstance(raw, bytes) else raw)
+                if ev is None:
+                    continue
+                if ev.retry is not None:
+                    self._backoff_base = max(0.1, ev.retry / 1000.0)
+                self.last_event_id = ev.id or self.last_event_id
+                if ev.data:
+                    yield to_update(ev.event, ev.data, ev.id)
+        finally:
+            self._resp = None
+            try:
+                resp.close()
+            except Exception:
+                pass
+
+    def _poll_window(self, until: float, deadline: float) -> bool:
+        """Poll until *until*; return True once a terminal state is seen."""
+        interval = self.poll_min
+        while not self._stop.is_set() and time.monotonic() < min(until, deadline):
+            try:
+                updates = self._poll()
+            except Exception as exc:
+                updates = [QueueUpdate("status", message=f"queue unreachable: {exc}", source="poll")]
+            if isinstance(updates, QueueUpdate):
+                updates = [updates]
+            changed = False
+            for update in updates:
+                seen = (update.key(), update.message)
+                if self._polled.get(update.project.lower()) != seen:
+                    self._polled[update.project.lower()] = seen
+                    self._emit(update)
+                    changed = True
+            interval = self.poll_min if changed else min(max(POLL_MAX, self.poll_min), interval * POLL_GROWTH)
+            ended = [u for u in (updates if self.pending is not None else updates[:1]) if self._ends_run(u)]
+            if ended:
+                self.last = ended[-1]
+                return True
+            self._stop.wait(interval)
+        return False
+
+    # -- public -----------------------------------------------------------
+    def run(self, timeout: float | None = None) -> QueueUpdate | None:
+        """Monitor until the build (or every batch project) ends, :meth:`stop` or *timeout*."""
+        deadline = time.monotonic() + timeout if timeout else float("inf")
+        failures = 0
+        while not self._stop.is_set() and time.monotonic() < deadline:
+            try:
+                for update in self._events():
+                    failures = 0
+                    self._emit(update)
+                    if self._ends_run(update):
+                        return update
+            except Exception:
+                failures += 1
+            if self._stop.is_set():
+                break
+            if failures >= STREAM_FAILURES_BEFORE_POLL:
+                self._set_mode("poll", f"event stream unavailable; polling for {POLL_WINDOW:.0f} s")
+                if self._poll_window(time.monotonic() + POLL_WINDOW, deadline):
+                    return self.last
+                failures = 0
+                continue
+            # A clean end of stream also reconnects, just without growth
+            self._stop.wait(self._backoff(max(1, failures)))
+        return self.last
+
+    def start(self, timeout: float | None = None) -> "QueueMonitor":
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, args=(timeout,), name="queue-monitor", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        resp = self._resp
+        if resp is not None:
+            try:
+                resp.close()
+            except Exception:
+                pass
+
+    @property
+    def running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+# endregion
+
+__all__ = [
+    "QueueMonitor",
+    "QueueUpdate",
+    "SSEEvent",
+    "SSEParser",
+    "TERMINAL_STATES",
+    "to_update",
+    "to_updates",
+]
@@ -0,0 +1,224 @@
+# =============================================================================
+# Project: VBS4Project
+# File: queue_standin.py
+# Purpose: Local stand-in for the PhotoMesh Project Queue (REST + event stream)
+# =============================================================================
+# Table of Contents
+#   1) Imports
+#   2) Constants & Configuration
+#   3) Stand-in server
+#   4) CLI
+# =============================================================================
+#
+# Usage:
+#   python queue_standin.py                        # demo: monitor a scripted build
+#   python queue_standin.py --drop-after 4         # exercise Last-Event-ID resume
+#   python queue_standin.py --no-sse               # exercise the polling fallback
+#   python queue_standin.py --serve --port 8087    # serve until Ctrl+C
+
+# region Imports
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from queue_events import QueueMonitor
+# endregion
+
+# region Constants & Configuration
+BASE_PATH = "/ProjectQueue/"
+STAGES = ("Data Preparation", "Aerotriangulation", "Point Cloud", "Model", "Texture", "Output")
+# endregion
+
+# region Stand-in server
+def default_script(project: str = "StandIn", steps: int = 4) -> list[tuple[str, dict]]:
+    """A build: start, each stage with *steps* progress events, done."""
+    script: list[tuple[str, dict]] = [("build", {"project": project, "state": "running"})]
+    for i, stage in enumerate(STAGES):
+        script.append(("stage", {"project": project, "stage": stage, "state": "running"}))
+        for k in range(1, steps + 1):
+            pct = int(100 * (i + k / steps) / len(STAGES))
+            script.append(("progress", {"project": project, "stage": stage, "progress": pct}))
+    script.append(("build", {"project": project, "state": "completed", "progress": 100}))
+    return script
+
+
+class StandInQueue:
+    """Serve ``/ProjectQueue/`` status, ``project/add``, ``Build/Start`` and
+    ``events`` on 127.0.0.1 so queue code can run without PhotoMesh.
+
+    The scripted build advances one event every *interval* seconds once
+    started.  *drop_after* closes each event stream after that many events
+    (clients must resume with ``Last-Event-ID``); *sse* False answers the
+    events URL with 404 to force the polling fallback.
+    """
+
+    def __init__(
+        self,
+        script: list[tuple[str, dict]] | None = None,
+        *,
+        interval: float = 0.05,
+        drop_after: int = 0,
+        sse: bool = True,
+        autostart: bool = True,
+    ) -> None:
+        self.script = script or default_script()
+        self.interval = interval
+        self.drop_after = drop_after
+        self.sse = sse
+        self.requests: list[tuple[str, str]] = []
+        self.projects: list[dict] = []
+        self._started_at: float | None = time.monotonic() if autostart else None
+        self._lock = threading.Lock()
+        self._httpd: ThreadingHTTPServer | None = None
+
+    # -- script position --------------------------------------------------
+    def _position(self) -> int:
+        if self._started_at is None:
+            return 0
+        return min(len(self.script), int((time.monotonic() - self._started_at) / self.interval) + 1)
+
+    def status(self) -> dict:
+        state = {"state": "idle"}
+        for _, data in self.script[: self._position()]:
+            state.update(data)
+        return state
+
+    # -- HTTP -------------------------------------------------------------
+    def _handler(self):
+        queue = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args) -> None:  # keep test output quiet
+                pass
+
+            def _json(self, code: int, obj) -> None:
+                body = json.dumps(obj).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                with queue._lock:
+                    queue.requests.append(("GET", self.path))
+                path = self.path.split("?")[0]
+                if path in (BASE_PATH, BASE_PATH.rstrip("/")):
+                    self._json(200, [queue.status()])
+                elif path == BASE_PATH + "Build/Start":
+                    if queue._started_at is None:
+                        queue._started_at = time.monotonic()
+                    self._json(200, {"ok": True})
+                elif path == BASE_PATH + "events" and queue.sse:
+                    self._events()
+                else:
+                    self._json(404, {"error": "not found"})
+
+            def do_POST(self) -> None:
+                with queue._lock:
+                    queue.requests.append(("POST", self.path))
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                if self.path.split("?")[0] == BASE_PATH + "project/add":
+                    try:
+                        queue.projects.extend(json.loads(body or b"[]"))
+                    except ValueError:
+                        self._json(400, {"error": "bad json"})
+                        return
+                    self._json(200, {"ok": True})
+                else:
+                    self._json(404, {"error": "not found"})
+
+            def _events(self) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                last = self.headers.get("Last-Event-ID", "")
+                idx = int(last) if last.isdigit() else 0
+                sent = 0
+                try:
+                    self.wfile.write(b"retry: 200\n: stand-in queue\n\n")
+                    while idx < len(queue.script):
+                        if queue.drop_after and sent >= queue.drop_after:
+                            return
+                        while queue._position() <= idx:
+                            time.sleep(queue.interval / 4)
+                        event, data = queue.script[idx]
+                        idx += 1
+                        self.wfile.write(f"id: {idx}\nevent: {event}\ndata: {json.dumps(data)}\n\n".encode())
+                        self.wfile.flush()
+                        sent += 1
+                except OSError:
+                    pass
+
+        return Handler
+
+    def start(self, port: int = 0) -> "StandInQueue":
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._httpd.daemon_threads = True
+        threading.Thread(target=self._httpd.serve_forever, name="queue-standin", daemon=True).start()
+        return self
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}{BASE_PATH}"
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+# endregion
+
+# region CLI
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Project Queue stand-in server")
+    ap.add_argument("--port", type=int, default=0)
+    ap.add_argument("--interval", type=float, default=0.05, help="seconds per scripted event")
+    ap.add_argument("--drop-after", type=int, default=0, help="close each stream after N events")
+    ap.add_argument("--no-sse", action="store_true", help="404 the events URL (polling fallback)")
+    ap.add_argument("--serve", action="store_true", help="serve until interrupted instead of the demo")
+    args = ap.parse_args(argv)
+
+    queue = StandInQueue(interval=args.interval, drop_after=args.drop_after, sse=not args.no_sse).start(args.port)
+    print(f"Stand-in Project Queue at {queue.base_url}")
+    if args.serve:
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        queue.stop()
+        return 0
+
+    seen = []
+    t0 = time.monotonic()
+
+    def _print(update) -> None:
+        seen.append(update)
+        print(f"{time.monotonic() - t0:7.2f}s  [{update.source}] {update.kind:<10} {update.describe()}")
+
+    final = QueueMonitor(queue.base_url + "events", queue.base_url, _print).run(timeout=120)
+    queue.stop()
+    print(f"{len(seen)} updates; final: {final.describe() if final else 'none'}")
+    return 0 if final and final.finished and not final.failed else 1
+# endregion
+
+__all__ = [
+    "StandInQueue",
+    "default_script",
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+# =============================================================================
+# Project: VBS4Project
+# File: share_inventory.py
+# Purpose: Cached host -> shares -> sentinel inventory built by parallel probes
+# =============================================================================
+# Table of Contents
+#   1) Imports
+#   2) Constants & Configuration
+#   3) Data Models / Types
+#   4) Utilities
+#   5) Inventory
+# =============================================================================
+
+# region Imports
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+from unc_probe import get_unc_prober
+# endregion
+
+# region Constants & Configuration
+SENTINEL_NAME = "Datatarget.txt"
+# How long a host's share list is trusted (unreachable hosts expire sooner)
+INVENTORY_TTL = 120.0
+INVENTORY_FAIL_TTL = 20.0
+# Per-probe deadlines; a share that does not answer in time is "unknown"
+LIST_TIMEOUT = 10.0
+SENTINEL_TIMEOUT = 3.0
+# endregion
+
+# region Data Models / Types
+@dataclass(frozen=True)
+class ShareInfo:
+    """One share on a host; ``has_sentinel`` is ``None`` if the probe timed out."""
+
+    name: str
+    unc: str
+    has_sentinel: bool | None
+
+
+@dataclass
+class HostInventory:
+    host: str
+    reachable: bool
+    shares: tuple[ShareInfo, ...] = ()
+    probed_at: float = field(default_factory=time.monotonic)
+
+    def share(self, name: str) -> ShareInfo | None:
+        low = name.lower()
+        return next((s for s in self.shares if s.name.lower() == low), None)
+# endregion
+
+# region Utilities
+def run_parallel(calls: dict, timeout: float) -> dict:
+    """Run ``{key: fn}`` on daemon threads and collect results until *timeout*.
+
+    Keys whose call has not finished (or raised) map to ``None``.  Daemon
+    threads are used so a hung SMB call can neither block the caller past the
+    deadline nor delay interpreter exit.
+    """
+    results: dict = {}
+    lock = threading.Lock()
+
+    def _run(key, fn):
+        try:
+            value = fn()
+        except Exception:
+            value = None
+        with lock:
+            results[key] = value
+
+    threads = [
+        threading.Thread(target=_run, args=(k, fn), name="share-probe", daemon=True)
+        for k, fn in calls.items()
+    ]
+    for t in threads:
+        t.start()
+    deadline = time.monotonic() + timeout
+    for t in threads:
+        t.join(max(0.0, deadline - time.monotonic()))
+    with lock:
+        return {k: results.get(k) for k in calls}
+# endregion
+
+# region Inventory
+class ShareInventory:
+    """TTL cache of which shares each host exposes and which carry the
+    ``Datatarget.txt`` sentinel.
+
+    Hosts are listed in parallel (dead hosts are skipped by the UNC prober's
+    TCP pre-check) and every share's sentinel is probed in parallel with its
+    own deadline.  *lister* is ``list_remote_shares`` from
+    ``photomesh_launcher``; it is injected to keep this module import-free of
+    the launcher and easy to exercise with a stand-in.
+    """
+
+    def __init__(
+        self,
+        lister: Callable[[str], list[str]],
+        *,
+        ttl: float = INVENTORY_TTL,
+        fail_ttl: float = INVENTORY_FAIL_TTL,
+        list_timeout: float = LIST_TIMEOUT,
+        sentinel_timeout: float = SENTINEL_TIMEOUT,
+        host_check: Callable[[str], bool] | None = None,
+    ) -> None:
+        self.lister = lister
+        self.ttl = ttl
+        self.fail_ttl = fail_ttl
+        self.list_timeout = list_timeout
+        self.sentinel_timeout = sentinel_timeout
+        self.host_check = host_check or (lambda h: get_unc_prober().host_up(h))
+        self._lock = threading.Lock()
+        self._hosts: dict[str, HostInventory] = {}
+
+    def _fresh(self, inv: HostInventory | None) -> bool:
+        if inv is None:
+            return False
+        ttl = self.ttl if inv.reachable else self.fail_ttl
+        return time.monotonic() - inv.probed_at < ttl
+
+    def _probe_host(self, host: str) -> HostInventory:
+        if not self.host_check(host):
+            return HostInventory(host, reachable=False)
+        listed = run_parallel({host: lambda: self.lister(host)}, self.list_timeout)[host]
+        if listed is None:
+            return HostInventory(host, reachable=False)
+        uncs = {name: rf"\\{host}\{name}" for name in listed}
+        sentinels = run_parallel(
+            {name: (lambda u=unc: os.path.isfile(os.path.join(u, SENTINEL_NAME))) for name, unc in uncs.items()},
+            self.sentinel_timeout,
+        )
+        shares = tuple(ShareInfo(name, uncs[name], sentinels[name]) for name in listed)
+        return HostInventory(host, reachable=True, shares=shares)
+
+    def get(self, host: str, refresh: bool = False) -> HostInventory:
+        """Return the (cached) inventory of one host."""
+        return self.get_many([host], refresh)[host]
+
+    def get_many(self, hosts: Iterable[str], refresh: bool = False) -> dict[str, HostInventory]:
+        """Return inventories for *hosts*, probing stale ones in parallel."""
+        hosts = [h for h in dict.fromkeys(h.strip() for h in hosts) if h]
+        with self._lock:
+            out = {h: self._hosts.get(h.lower()) for h in hosts}
+        stale = [h for h, inv in out.items() if refresh or not self._fresh(inv)]
+        if stale:
+            # Each host probe is itself bounded; allow for list + sentinel deadlines
+            probed = run_parallel(
+                {h: (lambda h=h: self._probe_host(h)) for h in stale},
+                self.list_timeout + self.sentinel_timeout + 1.0,
+            )
+            with self._lock:
+                for h in stale:
+                    inv = probed[h] or HostInventory(h, reachable=False)
+                    self._hosts[h.lower()] = inv
+                    out[h] = inv
+        return out
+
+    def invalidate(self, host: str | None = None) -> None:
+        with self._lock:
+            if host is None:
+                self._hosts.clear()
+            else:
+                self._hosts.pop(host.strip().lower(), None)
+
+    def snapshot(self) -> dict[str, HostInventory]:
+        """Return every cached inventory (fresh or not) without probing."""
+        with self._lock:
+            return dict(self._hosts)
+# endregion
+
+__all__ = [
+    "HostInventory",
+    "ShareInfo",
+    "ShareInventory",
+    "SENTINEL_NAME",
+    "run_parallel",
+]
@@ -0,0 +1,237 @@
+# =============================================================================
+# Project: VBS4Project
+# File: startup_profiler.py
+# Purpose: Opt-in startup timing (--profile-startup) with Chrome-trace output
+# =============================================================================
+# Table of Contents
+#   1) Imports
+#   2) Constants & Configuration
+#   3) Profiler
+#   4) Import timing hook
+#   5) Shared instance
+# =============================================================================
+#
+# Usage:
+#   python STE_Toolkit.py --profile-startup[=report.json]
+#
+# The report is a Chrome trace (open in chrome://tracing or ui.perfetto.dev);
+# a summary table is printed and logged when startup settles.
+
+# region Imports
+from __future__ import annotations
+
+import builtins
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Iterator
+# endregion
+
+# region Constants & Configuration
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FLAG = "--profile-startup"
+DEFAULT_REPORT_PATH = os.path.join(BASE_DIR, "startup_profile.json")
+
+# Nested imports deeper than this are folded into their parent's span
+IMPORT_MAX_DEPTH = 2
+# Spans shorter than this are dropped from the summary table (not the trace)
+SUMMARY_MIN_MS = 1.0
+# endregion
+
+# region Profiler
+class StartupProfiler:
+    """Record named, nested timing spans relative to process start.
+
+    When disabled every method is a cheap no-op, so instrumentation can stay
+    in the code permanently.
+    """
+
+    def __init__(self, enabled: bool, report_path: str = DEFAULT_REPORT_PATH) -> None:
+        self.enabled = enabled
+        self.report_path = report_path
+        self.t0 = time.perf_counter()
+        self.events: list[dict] = []
+        self.finished = False
+        self._lock = threading.Lock()
+
+    def _now_us(self) -> float:
+        return (time.perf_counter() - self.t0) * 1e6
+
+    def _record(self, name: str, cat: str, start_us: float, dur_us: float, args: dict | None) -> None:
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": round(start_us, 1),
+            "dur": round(dur_us, 1),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self.events.append(event)
+
+    @contextmanager
+    def _span(self, name: str, cat: str, args: dict | None) -> Iterator[None]:
+        start = self._now_us()
+        try:
+            yield
+        finally:
+            self._record(name, cat, start, self._now_us() - start, args)
+
+    def span(self, name: str, cat: str = "startup", **args):
+        """Context manager timing the enclosed block as *name*."""
+        if not self.enabled or self.finished:
+            return nullcontext()
+        return self._span(name, cat, args or None)
+
+    def mark(self, name: str, cat: str = "startup") -> None:
+        """Record an instant event (e.g. "window interactive")."""
+        if not self.enabled or self.finished:
+            return
+        with self._lock:
+            self.events.append({
+                "name": name, "cat": cat, "ph": "i", "s": "p",
+                "ts": round(self._now_us(), 1), "pid": os.getpid(), "tid": threading.get_ident(),
+            })
+
+    def wrap(self, fn: Callable, name: str | None = None, cat: str = "scheduled") -> Callable:
+        """Return *fn* wrapped in a span (for callbacks handed to ``after``)."""
+        if not self.enabled:
+            return fn
+        label = name or getattr(fn, "__qualname__", repr(fn))
+
+        def _wrapped(*a, **kw):
+            with self.span(label, cat):
+                return fn(*a, **kw)
+
+        return _wrapped
+
+    def summary(self) -> str:
+        """Return a plain-text table of spans, slowest first."""
+        with self._lock:
+            spans = [e for e in self.events if e["ph"] == "X"]
+            marks = [e for e in self.events if e["ph"] == "i"]
+        rows = sorted(spans, key=lambda e: e["dur"], reverse=True)
+        lines = [f"{'ms':>9}  {'start':>9}  {'category':<10} name", "-" * 60]
+        for e in rows:
+            if e["dur"] / 1000.0 < SUMMARY_MIN_MS:
+                continue
+            lines.append(
+                f"{e['dur'] / 1000.0:9.1f}  {e['ts'] / 1000.0:9.1f}  {e['cat']:<10} {e['name']}"
+            )
+        totals: dict[str, float] = {}
+        for e in spans:
+            if e.get("args", {}).get("depth", 0) == 0:
+                totals[e["cat"]] = totals.get(e["cat"], 0.0) + e["dur"] / 1000.0
+        lines.append("-" * 60)
+        for cat, ms in sorted(totals.items(), key=lambda kv: kv[1], reverse=True):
+            lines.append(f"{ms:9.1f}  {'':>9}  {cat:<10} (top-level total)")
+        for e in marks:
+            lines.append(f"{'':>9}  {e['ts'] / 1000.0:9.1f}  {'mark':<10} {e['name']}")
+        return "\n".join(lines)
+
+    def write_report(self, path: str | None = None) -> str:
+        """Write the Chrome trace JSON and return its path."""
+        path = path or self.report_path
+        with self._lock:
+            payload = {
+                "traceEvents": list(self.events),
+                "displayTimeUnit": "ms",
+                "otherData": {"argv": sys.argv, "python": sys.version.split()[0]},
+            }
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=1)
+        os.replace(tmp, path)
+        return path
+
+    def finish(self) -> None:
+        """Stop recording, write the report and print/log the summary once."""
+        if not self.enabled or self.finished:
+            return
+        self.mark("profile finished")
+        self.finished = True
+        uninstall_import_hook()
+        table = self.summary()
+        try:
+            path = self.write_report()
+        except OSError as exc:
+            path = f"<not written: {exc}>"
+        text = f"Startup profile ({path}):\n{table}"
+        print(text)
+        logging.info(text)
+# endregion
+
+# region Import timing hook
+_orig_import = builtins.__import__
+_import_state = threading.local()
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    prof = _PROFILER
+    if (
+        prof is None
+        or prof.finished
+        or level != 0
+        or name in sys.modules
+        or threading.current_thread() is not threading.main_thread()
+    ):
+        return _orig_import(name, globals, locals, fromlist, level)
+    depth = getattr(_import_state, "depth", 0)
+    if depth > IMPORT_MAX_DEPTH:
+        return _orig_import(name, globals, locals, fromlist, level)
+    _import_state.depth = depth + 1
+    start = prof._now_us()
+    try:
+        return _orig_import(name, globals, locals, fromlist, level)
+    finally:
+        _import_state.depth = depth
+        prof._record(f"import {name}", "import", start, prof._now_us() - start, {"depth": depth})
+
+
+def install_import_hook() -> None:
+    builtins.__import__ = _timed_import
+
+
+def uninstall_import_hook() -> None:
+    if builtins.__import__ is _timed_import:
+        builtins.__import__ = _orig_import
+# endregion
+
+# region Shared instance
+def _parse_argv(argv: list[str]) -> tuple[bool, str]:
+    for arg in argv[1:]:
+        if arg == FLAG:
+            return True, DEFAULT_REPORT_PATH
+        if arg.startswith(FLAG + "="):
+            value = arg.split("=", 1)[1].strip()
+            return True, os.path.abspath(value) if value else DEFAULT_REPORT_PATH
+    return False, DEFAULT_REPORT_PATH
+
+
+_PROFILER: StartupProfiler | None = None
+
+
+def get_profiler() -> StartupProfiler:
+    """Return the process-wide profiler (enabled by ``--profile-startup``)."""
+    global _PROFILER
+    if _PROFILER is None:
+        enabled, path = _parse_argv(sys.argv)
+        _PROFILER = StartupProfiler(enabled, path)
+        if enabled:
+            install_import_hook()
+    return _PROFILER
+# endregion
+
+__all__ = [
+    "StartupProfiler",
+    "get_profiler",
+    "install_import_hook",
+    "uninstall_import_hook",
+]
@@ -1,9 +1,19 @@
+import os
 import sys
-import win32api
+
+# Prefer the toolkit's pure-Python reader (no pywin32, works headless)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    from pe_version import file_version, format_version
+except Exception:  # pragma: no cover - script copied without the toolkit
+    file_version = None
+    import win32api
 
 
 def get_exe_file_version(exe_path: str) -> str:
     """Return the FileVersion field from an executable."""
+    if file_version is not None:
+        return format_version(file_version(exe_path))
     try:
         info = win32api.GetFileVersionInfo(exe_path, '\\')
         ms = info['FileVersionMS']
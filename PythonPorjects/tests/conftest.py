@@ -0,0 +1,10 @@
+# =============================================================================
+# Project: VBS4Project
+# File: tests/conftest.py
+# Purpose: Make the flat toolkit modules importable from the test suite
+# =============================================================================
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,55 @@
+# =============================================================================
+# Project: VBS4Project
+# File: tests/test_config_store.py
+# Purpose: ConfigStore reload and transaction semantics
+# =============================================================================
+
+import os
+
+import pytest
+
+from config_store import ConfigStore
+
+
+def _store(tmp_path, text):
+    path = tmp_path / "config.ini"
+    path.write_text(text, encoding="utf-8")
+    return path, ConfigStore(str(path), debounce=0)
+
+
+def _touch_later(path, text):
+    st = os.stat(path)
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_reload_drops_keys_deleted_on_disk(tmp_path):
+    path, store = _store(tmp_path, "[General]\na = 1\nb = 2\n[Old]\nx = 1\n")
+    _touch_later(path, "[General]\na = 3\n")
+    assert store.reload()
+    assert store.config.sections() == ["General"]
+    assert dict(store.config["General"]) == {"a": "3"}
+    assert not store.snapshot().has_option("General", "b")
+
+
+def test_transaction_writes_once_on_success(tmp_path):
+    path, store = _store(tmp_path, "[General]\na = 1\n")
+    with store.transaction() as cfg:
+        cfg["General"]["a"] = "2"
+        cfg["General"]["b"] = "3"
+    assert store.writes == 1
+    assert "b = 3" in path.read_text(encoding="utf-8")
+
+
+def test_failed_transaction_is_rolled_back(tmp_path):
+    path, store = _store(tmp_path, "[General]\na = 1\n")
+    before = path.read_text(encoding="utf-8")
+    with pytest.raises(RuntimeError):
+        with store.transaction() as cfg:
+            cfg["General"]["a"] = "2"
+            cfg.add_section("Extra")
+            raise RuntimeError("boom")
+    assert store.writes == 0
+    assert path.read_text(encoding="utf-8") == before
+    assert store.config.sections() == ["General"]
+    assert store.snapshot().get("General", "a") == "1"
@@ -0,0 +1,133 @@
+# =============================================================================
+# Project: VBS4Project
+# File: tests/test_fuser_registry.py
+# Purpose: FuserRegistry with a fake Popen and a fake process index
+# =============================================================================
+
+import itertools
+
+import pytest
+
+import fuser_registry
+from fuser_registry import FuserRegistry
+from process_watch import ProcessInfo
+
+
+class FakeProc:
+    _pids = itertools.count(1000)
+
+    def __init__(self, argv, **kwargs):
+        self.pid = next(self._pids)
+        self.argv = argv
+        self.kwargs = kwargs
+
+
+class FakeWatch:
+    """Process index stand-in: ``procs`` maps pid -> (name, ppid)."""
+
+    def __init__(self, parentage=True):
+        self.procs = {}
+        self.parentage = parentage
+        self.pokes = 0
+
+    def processes(self, name):
+        return [
+            ProcessInfo(pid, n, None, ppid if self.parentage else None)
+            for pid, (n, ppid) in self.procs.items()
+            if n.lower() == name.lower()
+        ]
+
+    def ancestors(self, pid):
+        if not self.parentage:
+            return None
+        chain = []
+        ppid = self.procs.get(pid, ("", None))[1]
+        while ppid is not None:
+            chain.append(ppid)
+            ppid = self.procs.get(ppid, ("", None))[1]
+        return chain
+
+    def poke(self):
+        self.pokes += 1
+
+
+@pytest.fixture
+def alive(monkeypatch):
+    """PIDs considered running; terminate_tree removes them."""
+    pids = set()
+    monkeypatch.setattr(fuser_registry, "pid_alive", lambda pid, create_time=None: pid in pids)
+    monkeypatch.setattr(fuser_registry, "_create_time", lambda pid: None)
+    monkeypatch.setattr(fuser_registry, "psutil", None)
+
+    def _terminate(pid, timeout=0):
+        pids.discard(pid)
+        return True
+
+    monkeypatch.setattr(fuser_registry, "terminate_tree", _terminate)
+    return pids
+
+
+def _registry(tmp_path, watch, alive):
+    def _spawn(argv, **kwargs):
+        proc = FakeProc(argv, **kwargs)
+        alive.add(proc.pid)
+        return proc
+
+    return FuserRegistry(str(tmp_path / "reg.json"), spawn=_spawn, watch=watch)
+
+
+def test_spawn_records_persists_and_pokes(tmp_path, alive):
+    watch = FakeWatch()
+    reg = _registry(tmp_path, watch, alive)
+    rec = reg.spawn("LocalFuser1", ["fuser.exe", "LocalFuser1"])
+    assert [r.pid for r in reg.reconcile()] == [rec.pid]
+    assert watch.pokes == 1
+    reloaded = FuserRegistry(str(tmp_path / "reg.json"), watch=watch)
+    assert [(r.pid, r.name) for r in reloaded.live()] == [(rec.pid, "LocalFuser1")]
+
+
+def test_reconcile_drops_dead_entries(tmp_path, alive):
+    reg = _registry(tmp_path, FakeWatch(), alive)
+    a = reg.spawn("LocalFuser1", ["f"])
+    b = reg.spawn("LocalFuser2", ["f"])
+    alive.discard(a.pid)
+    assert [r.pid for r in reg.reconcile()] == [b.pid]
+    assert reg.free_indices(2) == [1, 3]
+
+
+def test_scale_down_stops_newest_first(tmp_path, alive):
+    reg = _registry(tmp_path, FakeWatch(), alive)
+    recs = [reg.spawn(f"LocalFuser{i}", ["f"]) for i in (1, 2, 3)]
+    for i, rec in enumerate(recs):
+        rec.started = 100.0 + i
+    stopped = reg.scale_down(1)
+    assert [r.pid for r in stopped] == [recs[2].pid, recs[1].pid]
+    assert [r.pid for r in reg.live()] == [recs[0].pid]
+
+
+def test_adopts_unregistered_fusers(tmp_path, alive):
+    watch = FakeWatch()
+    watch.procs[42] = ("PhotoMeshFuser.exe", 1)
+    alive.add(42)
+    reg = _registry(tmp_path, watch, alive)
+    live = reg.reconcile(full=True)
+    assert [(r.pid, r.adopted) for r in live] == [(42, True)]
+
+
+def test_script_launch_child_is_not_counted_twice(tmp_path, alive):
+    watch = FakeWatch()
+    reg = _registry(tmp_path, watch, alive)
+    launcher = reg.spawn("LocalFuser1", ["LocalFuser1.bat"])
+    watch.procs[launcher.pid] = ("cmd.exe", 1)
+    watch.procs[77] = ("PhotoMeshFuser.exe", launcher.pid)
+    alive.add(77)
+    assert [r.pid for r in reg.reconcile(full=True)] == [launcher.pid]
+
+
+def test_without_parentage_script_launch_blocks_adoption(tmp_path, alive):
+    watch = FakeWatch(parentage=False)
+    reg = _registry(tmp_path, watch, alive)
+    reg.spawn("LocalFuser1", ["LocalFuser1.cmd"])
+    watch.procs[77] = ("PhotoMeshFuser.exe", None)
+    alive.add(77)
+    assert len(reg.reconcile(full=True)) == 1
@@ -0,0 +1,64 @@
+# =============================================================================
+# Project: VBS4Project
+# File: tests/test_fuser_telemetry.py
+# Purpose: Ring buffer reads and the live IO rate in the sampler summary
+# =============================================================================
+
+import fuser_telemetry
+from fuser_telemetry import FuserSampler, RingBuffer
+
+MB = 1024 * 1024
+
+
+class FakeProc:
+    def __init__(self, pid):
+        self.pid = pid
+
+    def create_time(self):
+        return 1.0
+
+    def cmdline(self):
+        return ["PhotoMeshFuser.exe", f"Fuser{self.pid}"]
+
+    def cpu_percent(self, interval):
+        return 0.0
+
+
+def _sampler(histories):
+    """A sampler tracking one fake fuser per list of (t, read, write) rows."""
+    sampler = FuserSampler()
+    sampler.available = True
+    for pid, rows in enumerate(histories, start=1):
+        t = fuser_telemetry._Tracked(FakeProc(pid), 8)
+        for ts, rd, wr in rows:
+            t.history.append((ts, 10.0, 100 * MB, rd, wr, 50))
+        sampler._tracked[pid] = t
+    return sampler
+
+
+def test_ring_buffer_reads_back_from_newest():
+    ring = RingBuffer(3, width=1)
+    assert ring.latest() is None
+    for v in range(5):
+        ring.append((v,))
+    assert ring.latest() == (4.0,)
+    assert ring.latest(2) == (2.0,)
+    assert ring.latest(3) is None
+    assert ring.rows() == [(2.0,), (3.0,), (4.0,)]
+
+
+def test_summary_reports_io_rate_not_lifetime_total():
+    sampler = _sampler([
+        # 6 MB moved over the last 2 s on top of 5 GB already transferred
+        [(0.0, 4096 * MB, 1024 * MB), (2.0, 4100 * MB, 1026 * MB)],
+        [(0.0, 0, 0), (1.0, MB, 0), (2.0, 2 * MB, 0)],
+    ])
+    rates = sorted(r["io_rate"] for r in sampler.latest())
+    assert rates == [MB, 3 * MB]
+    assert "IO 4.0 MB/s" in sampler.summary()
+
+
+def test_io_rate_needs_two_samples():
+    sampler = _sampler([[(0.0, 512 * MB, 0)]])
+    assert sampler.latest()[0]["io_rate"] == 0.0
+    assert "IO 0.0 MB/s" in sampler.summary()
@@ -0,0 +1,56 @@
+# =============================================================================
+# Project: VBS4Project
+# File: tests/test_image_cache.py
+# Purpose: Disk variants keep transparency and pick a matching format
+# =============================================================================
+
+import os
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+image_cache = pytest.importorskip("image_cache")
+
+SIZE = (300, 300)
+
+
+def _variants(disk_dir):
+    return sorted(os.path.splitext(name)[1] for name in os.listdir(disk_dir))
+
+
+def _cold(disk_dir, path, mode=None):
+    """Look *path* up through a fresh cache sharing *disk_dir*."""
+    return image_cache.ImageCache(disk_dir=str(disk_dir)).image(str(path), SIZE, mode)
+
+
+def test_png_alpha_survives_the_disk_cache(tmp_path):
+    src = tmp_path / "logo.png"
+    img = Image.new("RGBA", (400, 400), (255, 0, 0, 0))
+    img.paste((0, 0, 255, 128), (100, 100, 300, 300))
+    img.save(src)
+    disk = tmp_path / "cache"
+    warm = _cold(disk, src)
+    assert _variants(disk) == [".png"]
+    cold = _cold(disk, src)
+    assert cold.mode == "RGBA"
+    assert list(cold.getdata()) == list(warm.getdata())
+
+
+def test_jpeg_source_with_alpha_mode_is_stored_as_png(tmp_path):
+    src = tmp_path / "wall.jpg"
+    Image.new("RGB", (400, 400), (10, 120, 200)).save(src, "JPEG")
+    disk = tmp_path / "cache"
+    warm = _cold(disk, src, mode="RGBA")
+    assert _variants(disk) == [".png"]
+    cold = _cold(disk, src, mode="RGBA")
+    assert cold.mode == "RGBA"
+    assert list(cold.getdata()) == list(warm.getdata())
+
+
+def test_opaque_jpeg_source_stays_jpeg(tmp_path):
+    src = tmp_path / "wall.jpg"
+    Image.new("RGB", (400, 400), (10, 120, 200)).save(src, "JPEG")
+    disk = tmp_path / "cache"
+    _cold(disk, src)
+    assert _variants(disk) == [".jpg"]
+    assert _cold(disk, src).mode == "RGB"
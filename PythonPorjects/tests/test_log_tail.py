@@ -0,0 +1,77 @@
+# =============================================================================
+# Project: VBS4Project
+# File: tests/test_log_tail.py
+# Purpose: Incremental log tailing (append, partial lines, truncation)
+# =============================================================================
+
+import os
+import re
+
+from log_tail import LogTail
+
+_NUM = re.compile(r"step (\d+)")
+
+
+def _extract(line):
+    m = _NUM.search(line)
+    return int(m.group(1)) if m else None
+
+
+def _append(path, text):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_first_look_searches_back_from_eof(tmp_path):
+    log = tmp_path / "a.log"
+    log.write_text("".join(f"step {i}\nnoise\n" for i in range(2000)))
+    tail = LogTail(_extract, block_size=256)
+    assert tail.last_match(str(log)) == 1999
+    # Only the tail end had to be read
+    assert tail.bytes_read < 1024
+
+
+def test_reads_only_appended_bytes(tmp_path):
+    log = tmp_path / "a.log"
+    log.write_text("step 1\n")
+    tail = LogTail(_extract)
+    assert tail.last_match(str(log)) == 1
+    before = tail.bytes_read
+    _append(log, "noise\nstep 2\n")
+    assert tail.last_match(str(log)) == 2
+    assert tail.bytes_read - before == len("noise\nstep 2\n")
+
+
+def test_keeps_previous_value_when_nothing_new_matches(tmp_path):
+    log = tmp_path / "a.log"
+    log.write_text("step 5\n")
+    tail = LogTail(_extract)
+    tail.last_match(str(log))
+    _append(log, "noise\n")
+    assert tail.last_match(str(log)) == 5
+
+
+def test_partial_line_waits_for_newline(tmp_path):
+    log = tmp_path / "a.log"
+    log.write_text("step 1\nstep 2")
+    tail = LogTail(_extract)
+    assert tail.last_match(str(log)) == 1
+    _append(log, "3\n")
+    assert tail.last_match(str(log)) == 23
+
+
+def test_truncated_or_replaced_file_is_rescanned(tmp_path):
+    log = tmp_path / "a.log"
+    log.write_text("step 1\nstep 2\nstep 3\n")
+    tail = LogTail(_extract)
+    assert tail.last_match(str(log)) == 3
+    log.write_text("step 9\n")
+    assert tail.last_match(str(log)) == 9
+    repl = tmp_path / "b.log"
+    repl.write_text("step 4\nstep 10\n")
+    os.replace(repl, log)
+    assert tail.last_match(str(log)) == 10
+
+
+def test_missing_file(tmp_path):
+    assert LogTail(_extract).last_match(str(tmp_path / "none.log")) is None
@@ -0,0 +1,100 @@
+# =============================================================================
+# Project: VBS4Project
+# File: tests/test_progress_agg.py
+# Purpose: Progress line parsing and multi-source aggregation
+# =============================================================================
+
+import time
+
+import pytest
+
+from progress_agg import ETA_MIN_SPAN, ProgressAggregator, ProgressFollower, ProgressSample, parse_progress_line
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        ("Progress: 42%", ProgressSample(None, None, 42)),
+        ("Tile 3 of 12", ProgressSample(3, 12, 25)),
+        ("Progress: 50% Tile 3 of 12", ProgressSample(3, 12, 50)),
+        ("Stage: Model, Tile 1 of 4", ProgressSample(1, 4, 25, "Model")),
+        ("nothing here", None),
+    ],
+)
+def test_parse_progress_line(line, expected):
+    assert parse_progress_line(line) == expected
+
+
+def test_tiled_sources_weigh_by_tile_total():
+    agg = ProgressAggregator()
+    snap = agg.update({"a": ProgressSample(10, 10, 100), "b": ProgressSample(0, 30, 0)}, now=0.0)
+    assert snap.percent == 25
+    assert snap.sources == 2
+
+
+def test_percent_only_source_weighs_as_average_tiled_source():
+    agg = ProgressAggregator()
+    snap = agg.update({"a": ProgressSample(20, 20, 100), "b": ProgressSample(None, None, 0)}, now=0.0)
+    assert snap.percent == 50
+
+
+def test_percentage_never_moves_backwards():
+    agg = ProgressAggregator()
+    assert agg.update({"a": ProgressSample(None, None, 60)}, now=0.0).percent == 60
+    snap = agg.update({"a": ProgressSample(None, None, 60), "b": ProgressSample(None, None, 0)}, now=1.0)
+    assert snap.percent == 60
+    agg.reset()
+    assert agg.update({"a": ProgressSample(None, None, 10)}, now=2.0).percent == 10
+
+
+def test_eta_from_recent_rate():
+    agg = ProgressAggregator()
+    assert agg.update({"a": ProgressSample(None, None, 0)}, now=0.0).eta is None
+    assert agg.update({"a": ProgressSample(None, None, 10)}, now=ETA_MIN_SPAN / 2).eta is None
+    snap = agg.update({"a": ProgressSample(None, None, 20)}, now=100.0)
+    # 20 % in 100 s -> 80 % left takes 400 s
+    assert snap.eta == pytest.approx(400.0)
+    assert snap.eta_text() == "ETA 6m 40s"
+
+
+def test_finished_stage_is_not_reported_as_done():
+    agg = ProgressAggregator()
+    snap = agg.update({"a": ProgressSample(100, 100, 100)}, now=0.0)
+    assert snap.percent == 99
+    assert snap.eta_text() != "done"
+
+
+def test_two_stage_log(tmp_path):
+    log = tmp_path / "Run1.log"
+    log.write_text("Tile 50 of 100\n")
+    seen = []
+    follower = ProgressFollower(lambda: [str(log)], seen.append)
+    assert follower.tick().percent == 50
+
+    def _append(text):
+        with open(log, "a") as f:
+            f.write(text)
+
+    _append("Tile 100 of 100\n")
+    assert follower.tick().percent == 99
+    # Stage 2 restarts the tile count: stage 1 counts as done, not as 100 %
+    _append("Tile 1 of 400\n")
+    snap = follower.tick()
+    assert snap.percent == 20
+    assert snap.stages == {"Stage 1": (100, 100), "Stage 2": (1, 400)}
+    _append("Tile 200 of 400\n")
+    snap = follower.tick()
+    assert snap.percent == 60
+    assert snap.eta_text() != "done"
+    assert [s.percent for s in seen] == [50, 99, 20, 60]
+
+
+def test_follower_runs_until_stopped(tmp_path):
+    log = tmp_path / "Run1.log"
+    log.write_text("Tile 10 of 10\n")
+    follower = ProgressFollower(lambda: [str(log)], lambda snap: None, interval=0.01).start()
+    try:
+        time.sleep(0.1)
+        assert follower.running
+    finally:
+        follower.stop()
@@ -0,0 +1,52 @@
+# =============================================================================
+# Project: VBS4Project
+# File: tests/test_queue_batch.py
+# Purpose: Batch sizing and submission order
+# =============================================================================
+
+import json
+
+from queue_batch import DEFAULT_CAPACITY, ProjectSpec, cluster_capacity, format_plan, plan_batch
+
+
+def _imagery(root, name, count, size=10):
+    folder = root / name
+    folder.mkdir()
+    for i in range(count):
+        (folder / f"img{i}.jpg").write_bytes(b"x" * size)
+    (folder / "notes.txt").write_text("ignored")
+    return str(folder)
+
+
+def test_plan_orders_by_priority_then_size(tmp_path):
+    specs = [
+        ProjectSpec("big", "d", (_imagery(tmp_path, "big", 5),)),
+        ProjectSpec("small", "d", (_imagery(tmp_path, "small", 2),)),
+        ProjectSpec("urgent", "d", (_imagery(tmp_path, "urgent", 9),), priority=1),
+        ProjectSpec("empty", "d", (_imagery(tmp_path, "empty", 0),)),
+    ]
+    items = plan_batch(specs, capacity=6)
+    assert [it.spec.name for it in items] == ["urgent", "small", "big"]
+    assert [it.images for it in items] == [9, 2, 5]
+    # Each project builds alone and gets the whole pool
+    assert {it.max_fusers for it in items} == {6}
+
+
+def test_plan_never_assigns_zero_fusers(tmp_path):
+    items = plan_batch([ProjectSpec("a", "d", (_imagery(tmp_path, "a", 1),))], capacity=0)
+    assert items[0].max_fusers == 1
+
+
+def test_format_plan_lists_every_project(tmp_path):
+    items = plan_batch([ProjectSpec("alpha", "d", (_imagery(tmp_path, "a", 3),))], capacity=4)
+    text = format_plan(items, 4)
+    assert "alpha" in text
+    assert text.splitlines()[-1] == "1 project(s), cluster capacity 4 fuser(s)"
+
+
+def test_cluster_capacity(tmp_path):
+    cfg = tmp_path / "fuser_config.json"
+    cfg.write_text(json.dumps({"fusers": {"localhost": [{}, {}], "10.0.0.2": [{}, {}, {}]}}))
+    assert cluster_capacity(str(cfg)) == 5
+    assert cluster_capacity(str(cfg), local_fusers=4) == 7
+    assert cluster_capacity(str(tmp_path / "missing.json")) == DEFAULT_CAPACITY
@@ -0,0 +1,174 @@
+# =============================================================================
+# Project: VBS4Project
+# File: tests/test_queue_events.py
+# Purpose: SSE parsing, update mapping and QueueMonitor against the stand-in
+# =============================================================================
+
+import pytest
+
+import queue_events
+from queue_events import QueueMonitor, SSEParser, to_update, to_updates
+from queue_standin import StandInQueue, default_script
+
+
+def _feed(parser, text):
+    return [ev for ev in (parser.feed(line) for line in text.splitlines(keepends=True)) if ev is not None]
+
+
+# region SSE parsing
+def test_parser_joins_data_lines_and_tracks_id():
+    events = _feed(SSEParser(), "event: stage\ndata: {\"a\":\ndata: 1}\nid: 7\n\n")
+    assert len(events) == 1
+    assert events[0].event == "stage"
+    assert events[0].data == "{\"a\":\n1}"
+    assert events[0].id == "7"
+
+
+def test_parser_skips_comments_and_defaults_event_name():
+    parser = SSEParser()
+    events = _feed(parser, ": keep-alive\n\ndata: hello\n\n")
+    assert [(e.event, e.data) for e in events] == [("message", "hello")]
+    assert parser.last_id == ""
+
+
+def test_parser_reports_retry_without_data():
+    events = _feed(SSEParser(), "retry: 200\n\n")
+    assert len(events) == 1
+    assert events[0].retry == 200 and events[0].data == ""
+
+
+def test_parser_keeps_last_id_across_events():
+    parser = SSEParser()
+    events = _feed(parser, "id: 3\ndata: a\n\ndata: b\n\n")
+    assert [e.id for e in events] == ["3", "3"]
+    assert parser.last_id == "3"
+# endregion
+
+
+# region Update mapping
+def test_to_update_reads_json_fields_case_insensitively():
+    up = to_update("progress", '{"Project": "P1", "Stage": "Model", "Progress": 42}', "9")
+    assert (up.project, up.stage, up.percent, up.event_id) == ("P1", "Model", 42, "9")
+    assert not up.finished
+
+
+def test_to_update_status_list_and_terminal_state():
+    up = to_update("status", '[{"name": "P1", "status": "Failed"}]', source="poll")
+    assert up.project == "P1"
+    assert up.finished and up.failed
+    assert up.source == "poll"
+
+
+@pytest.mark.parametrize("value, expected", [(0.5, 50), ("75%", 75), (150, 100), ("n/a", None)])
+def test_to_update_percent(value, expected):
+    assert to_update("progress", {"percent": value}).percent == expected
+
+
+def test_to_update_plain_text():
+    up = to_update("build", "started by operator")
+    assert up.message == "started by operator"
+    assert up.describe() == "started by operator"
+# endregion
+
+
+# region Monitor against the stand-in queue
+@pytest.fixture
+def standin():
+    queues = []
+
+    def _make(**kwargs):
+        q = StandInQueue(default_script(steps=1), interval=0.01, **kwargs).start()
+        queues.append(q)
+        return q
+
+    yield _make
+    for q in queues:
+        q.stop()
+
+
+def _monitor(queue, seen, **kwargs):
+    return QueueMonitor(queue.base_url + "events", queue.base_url, seen.append, **kwargs)
+
+
+def test_stream_delivers_every_event_in_order(standin):
+    queue = standin()
+    seen = []
+    final = _monitor(queue, seen).run(timeout=20)
+    assert final is not None and final.finished and not final.failed
+    ids = [u.event_id for u in seen if u.kind != "connection"]
+    assert ids == [str(i) for i in range(1, len(queue.script) + 1)]
+
+
+def test_dropped_stream_resumes_from_last_event_id(standin):
+    queue = standin(drop_after=4)
+    seen = []
+    final = _monitor(queue, seen).run(timeout=20)
+    assert final is not None and final.finished
+    ids = [u.event_id for u in seen if u.kind != "connection"]
+    # Nothing repeated, nothing skipped across the reconnects
+    assert ids == [str(i) for i in range(1, len(queue.script) + 1)]
+    streams = [p for m, p in queue.requests if m == "GET" and p.endswith("/events")]
+    assert len(streams) >= len(queue.script) // 4
+
+
+def test_missing_stream_falls_back_to_polling(standin, monkeypatch):
+    monkeypatch.setattr(queue_events, "BACKOFF_BASE", 0.01)
+    queue = standin(sse=False)
+    seen = []
+    monitor = _monitor(queue, seen, poll_min=0.02)
+    final = monitor.run(timeout=20)
+    assert monitor.mode == "poll"
+    assert final is not None and final.finished and final.source == "poll"
+    assert any(u.kind == "connection" and u.source == "poll" for u in seen)
+
+
+def _poll_monitor(bodies, seen, **kwargs):
+    """A monitor polling successive raw status bodies (queue lists)."""
+    bodies = iter(bodies)
+    monitor = QueueMonitor(
+        "unused", "unused", seen.append,
+        open_stream=lambda *a: (_ for _ in ()).throw(ConnectionError("no stream")),
+        poll=lambda: to_updates("status", next(bodies)),
+        poll_min=0.0,
+        **kwargs,
+    )
+    monitor._set_mode("poll", "test")
+    return monitor
+
+
+def test_to_updates_maps_every_list_entry():
+    ups = to_updates("status", '[{"name": "A", "status": "Done"}, {"name": "B", "status": "Queued"}]')
+    assert [(u.project, u.finished, u.source) for u in ups] == [("A", True, "poll"), ("B", False, "poll")]
+    assert [u.message for u in to_updates("status", "idle")] == ["idle"]
+
+
+def test_batch_waits_for_every_project():
+    bodies = [
+        '[{"name": "A", "status": "Running"}, {"name": "B", "status": "Queued"}]',
+        '[{"name": "A", "status": "Completed"}, {"name": "B", "status": "Running"}]',
+        '[{"name": "A", "status": "Completed"}, {"name": "B", "status": "Running"}]',
+        '[{"name": "A", "status": "Completed"}, {"name": "B", "status": "Completed"}]',
+    ]
+    seen = []
+    monitor = _poll_monitor(bodies, seen, projects=["A", "B"])
+    assert monitor._poll_window(float("inf"), float("inf"))
+    assert monitor.last.project == "B" and monitor.pending == set()
+    # Every project is reported, each change once
+    states = [(u.project, u.state) for u in seen if u.kind != "connection"]
+    assert states == [
+        ("A", "Running"), ("B", "Queued"),
+        ("A", "Completed"), ("B", "Running"),
+        ("B", "Completed"),
+    ]
+
+
+def test_single_build_poll_ends_on_queue_head():
+    bodies = [
+        '[{"name": "A", "status": "Running"}, {"name": "B", "status": "Completed"}]',
+        '[{"name": "A", "status": "Completed"}, {"name": "B", "status": "Completed"}]',
+    ]
+    seen = []
+    monitor = _poll_monitor(bodies, seen)
+    assert monitor._poll_window(float("inf"), float("inf"))
+    assert monitor.last.project == "A" and monitor.last.finished
+# endregion
@@ -0,0 +1,22 @@
+# =============================================================================
+# Project: VBS4Project
+# File: tests/test_startup_profiler.py
+# Purpose: --profile-startup command-line parsing
+# =============================================================================
+
+import os
+
+import pytest
+
+from startup_profiler import DEFAULT_REPORT_PATH, _parse_argv
+
+
+@pytest.mark.parametrize("argv, expected", [
+    (["app"], (False, DEFAULT_REPORT_PATH)),
+    (["app", "--profile-startup"], (True, DEFAULT_REPORT_PATH)),
+    (["app", "--profile-startup="], (True, DEFAULT_REPORT_PATH)),
+    (["app", "--profile-startup=  "], (True, DEFAULT_REPORT_PATH)),
+    (["app", "--profile-startup=out.json"], (True, os.path.abspath("out.json"))),
+])
+def test_parse_argv(argv, expected):
+    assert _parse_argv(argv) == expected
@@ -0,0 +1,228 @@
+# =============================================================================
+# Project: VBS4Project
+# File: unc_probe.py
+# Purpose: Off-thread UNC reachability probing with deadlines and TTL caching
+# =============================================================================
+# Table of Contents
+#   1) Imports
+#   2) Constants & Configuration
+#   3) Utilities
+#   4) Prober
+#   5) Shared instance
+# =============================================================================
+
+# region Imports
+from __future__ import annotations
+
+import os
+import socket
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Callable
+# endregion
+
+# region Constants & Configuration
+SMB_PORT = 445
+# Hard upper bound for one probe (TCP pre-check + directory listing)
+DEFAULT_DEADLINE = 3.0
+TCP_TIMEOUT = 0.75
+# How long results are trusted; failures expire sooner so recovery is noticed
+TTL_OK = 30.0
+TTL_FAIL = 10.0
+# endregion
+
+# region Utilities
+def unc_host(path: str) -> str:
+    r"""Return the host of ``\\host\share\...`` (or ``""`` for non-UNC paths)."""
+    p = (path or "").replace("/", "\\")
+    if not p.startswith("\\\\"):
+        return ""
+    return p[2:].split("\\", 1)[0].strip()
+
+
+def _norm(path: str) -> str:
+    return os.path.normcase(os.path.normpath(path or ""))
+
+
+def _listable(path: str) -> bool:
+    try:
+        return os.path.isdir(path) and os.listdir(path) is not None
+    except Exception:
+        return False
+
+
+def _resolved(value: bool) -> Future:
+    fut: Future = Future()
+    fut.set_result(value)
+    return fut
+# endregion
+
+# region Prober
+class UncProber:
+    """Check whether UNC folders are reachable without ever blocking for the
+    Windows SMB timeout.
+
+    * A TCP connect to port 445 rules out dead hosts in well under a second.
+    * The directory check runs on a daemon thread and is abandoned after
+      ``deadline`` seconds (a hung SMB call cannot be cancelled, but nobody
+      waits for it and it cannot delay interpreter exit).
+    * Results are cached per host and per path, negatives included, so
+      repeated clicks on a dead share return immediately.
+    * Concurrent probes of the same path share one in-flight future.
+    """
+
+    def __init__(
+        self,
+        *,
+        deadline: float = DEFAULT_DEADLINE,
+        tcp_timeout: float = TCP_TIMEOUT,
+        ttl_ok: float = TTL_OK,
+        ttl_fail: float = TTL_FAIL,
+        port: int = SMB_PORT,
+        check_fn: Callable[[str], bool] = _listable,
+    ) -> None:
+        self.deadline = deadline
+        self.tcp_timeout = tcp_timeout
+        self.ttl_ok = ttl_ok
+        self.ttl_fail = ttl_fail
+        self.port = port
+        self.check_fn = check_fn
+        self._lock = threading.Lock()
+        # key -> (ok, expires_at)
+        self._hosts: dict[str, tuple[bool, float]] = {}
+        self._paths: dict[str, tuple[bool, float]] = {}
+        self._inflight: dict[str, Future] = {}
+
+    # -- cache helpers --------------------------------------------------
+    def _ttl(self, ok: bool) -> float:
+        return self.ttl_ok if ok else self.ttl_fail
+
+    @staticmethod
+    def _get(table: dict, key: str) -> bool | None:
+        hit = table.get(key)
+        if hit is None:
+            return None
+        if hit[1] < time.monotonic():
+            table.pop(key, None)
+            return None
+        return hit[0]
+
+    def cached(self, path: str) -> bool | None:
+        """Return the cached verdict for *path* or ``None`` if unknown."""
+        with self._lock:
+            return self._get(self._paths, _norm(path))
+
+    def invalidate(self, path_or_host: str | None = None) -> None:
+        """Forget cached results: all, one path, or every path on a host.
+
+        A UNC path drops only that path's verdict (and its host's SMB
+        pre-check); other paths on the same host stay cached.
+        """
+        with self._lock:
+            if not path_or_host:
+                self._hosts.clear()
+                self._paths.clear()
+                return
+            host = unc_host(path_or_host)
+            if host:
+                self._hosts.pop(host.lower(), None)
+                self._paths.pop(_norm(path_or_host), None)
+                return
+            host = path_or_host.lower()
+            self._hosts.pop(host, None)
+            for key in [k for k in self._paths if unc_host(k).lower() == host]:
+                self._paths.pop(key, None)
+
+    # -- probing --------------------------------------------------------
+    def host_up(self, host: str) -> bool:
+        """TCP pre-check of *host*'s SMB port (cached)."""
+        key = host.lower()
+        with self._lock:
+            hit = self._get(self._hosts, key)
+        if hit is not None:
+            return hit
+        try:
+            with socket.create_connection((host, self.port), timeout=self.tcp_timeout):
+                ok = True
+        except OSError:
+            ok = False
+        with self._lock:
+            self._hosts[key] = (ok, time.monotonic() + self._ttl(ok))
+        return ok
+
+    def _run(self, path: str, key: str, fut: Future) -> None:
+        ok = False
+        started = time.monotonic()
+        try:
+            host = unc_host(path)
+            if not host or self.host_up(host):
+                box: list[bool] = []
+                worker = threading.Thread(
+                    target=lambda: box.append(self.check_fn(path)),
+                    name="unc-probe-fs",
+                    daemon=True,
+                )
+                worker.start()
+                worker.join(max(0.0, self.deadline - (time.monotonic() - started)))
+                ok = bool(box and box[0])
+        finally:
+            with self._lock:
+                self._paths[key] = (ok, time.monotonic() + self._ttl(ok))
+                self._inflight.pop(key, None)
+            fut.set_result(ok)
+
+    def probe(self, path: str, callback: Callable[[bool], None] | None = None) -> Future:
+        """Start (or join) a probe of *path* and return a ``Future[bool]``.
+
+        *callback(ok)* runs on the probing thread (or immediately on a cache
+        hit); UI callers should marshal it with ``post_ui``.
+        """
+        key = _norm(path)
+        with self._lock:
+            hit = self._get(self._paths, key)
+            if hit is not None:
+                fut = _resolved(hit)
+            else:
+                fut = self._inflight.get(key)
+                if fut is None:
+                    fut = Future()
+                    self._inflight[key] = fut
+                    threading.Thread(
+                        target=self._run, args=(path, key, fut), name="unc-probe", daemon=True
+                    ).start()
+        if callback is not None:
+            fut.add_done_callback(lambda f: callback(f.result()))
+        return fut
+
+    def check(self, path: str, timeout: float | None = None) -> bool:
+        """Blocking probe bounded by *timeout* (default: the prober deadline)."""
+        if not path:
+            return False
+        fut = self.probe(path)
+        try:
+            return fut.result(timeout=self.deadline + 0.5 if timeout is None else timeout)
+        except FutureTimeout:
+            return False
+# endregion
+
+# region Shared instance
+_PROBER: UncProber | None = None
+_PROBER_LOCK = threading.Lock()
+
+
+def get_unc_prober() -> UncProber:
+    """Return the process-wide :class:`UncProber`."""
+    global _PROBER
+    with _PROBER_LOCK:
+        if _PROBER is None:
+            _PROBER = UncProber()
+        return _PROBER
+# endregion
+
+__all__ = [
+    "UncProber",
+    "get_unc_prober",
+    "unc_host",
+]